@@ -0,0 +1,202 @@
+"""Compare concurrent purchases on the async create route with the old thread-per-purchase route.
+
+The facilitator (pooled HTTP client) and the tg_manager session call are
+served by in-memory transports that sleep for ``--latency`` seconds, so the
+numbers show how many purchases can be in flight at once rather than how
+fast the chain is. The "threaded" variant is the previous sync route's call
+chain in a ``def`` route, holding an AnyIO worker thread for the whole
+purchase.
+
+Usage: python -m benchmarks.bench_async_create [--purchases N] [--latency S]
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import httpx
+from eth_account import Account
+from fastapi import APIRouter, Depends, FastAPI, Request
+
+from contextswap import evm
+from contextswap.facilitator.client import AsyncHTTPFacilitatorClient, EventLoopFacilitatorClient
+from contextswap.platform.api.deps import get_db, get_facilitator, get_tg_manager
+from contextswap.platform.api.routes import transactions
+from contextswap.platform.db import models
+from contextswap.platform.db.engine import init_db, open_database
+from contextswap.platform.services import transaction_service
+from contextswap.platform.services.tg_manager_client import TgManagerClient
+from contextswap.x402 import CHAIN_ID, b64decode_json, b64encode_json
+
+
+def _latency_transport(latency: float, respond) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, json=respond(json.loads(request.content or b"{}")))
+
+    return httpx.MockTransport(handler)
+
+
+def _blocking_transport(latency: float, respond) -> httpx.MockTransport:
+    def handler(request: httpx.Request) -> httpx.Response:
+        time.sleep(latency)
+        return httpx.Response(200, json=respond(json.loads(request.content or b"{}")))
+
+    return httpx.MockTransport(handler)
+
+
+def _settle(body: dict) -> dict:
+    raw_tx = body["payment"]["rawTransaction"]
+    return {"verified": True, "txHash": transaction_service.compute_tx_hash(raw_tx)}
+
+
+def _session(body: dict) -> dict:
+    return {"transaction_id": body["transaction_id"], "status": "running", "chat_id": "-100", "message_thread_id": 1}
+
+
+def _sign_payments(seller: models.Seller, count: int) -> list[str]:
+    requirements = transaction_service.build_requirements(seller)
+    accepts = requirements["accepts"][0]
+    buyer = Account.create()
+    headers = []
+    for nonce in range(count):
+        signed = Account.sign_transaction(
+            {
+                "to": accepts["payTo"],
+                "value": int(accepts["amountWei"]),
+                "gas": 21000,
+                "gasPrice": 1,
+                "nonce": nonce,
+                "chainId": CHAIN_ID,
+            },
+            buyer.key,
+        )
+        raw_tx = signed.raw_transaction.hex()
+        # 预先解码写入共享缓存：两种路由都不计签名恢复的 CPU 时间，只比较 I/O 并发
+        evm.decode_raw_transaction(raw_tx)
+        headers.append(b64encode_json({"rawTransaction": raw_tx}))
+    return headers
+
+
+def _threaded_router() -> APIRouter:
+    router = APIRouter()
+
+    @router.post("/threaded/create")
+    def create_threaded(
+        payload: transactions.TransactionCreateRequest,
+        request: Request,
+        conn=Depends(get_db),
+        facilitator=Depends(get_facilitator),
+        tg_manager=Depends(get_tg_manager),
+    ) -> dict:
+        # 旧的同步路径：整笔购买占用一个 worker thread，facilitator 经 from_thread 回到事件循环，会话创建同步阻塞
+        seller = models.get_seller_by_id(conn, seller_id=payload.seller_id)
+        requirements = transaction_service.build_requirements(seller)
+        payment = b64decode_json(request.headers["PAYMENT-SIGNATURE"])
+        transaction_service.compute_payment_id(payment)
+        tx_hash = transaction_service.verify_and_settle_payment(facilitator["conflux"], payment, requirements)
+        metadata = {
+            "buyer_bot_username": payload.buyer_bot_username,
+            "seller_bot_username": payload.seller_bot_username,
+            "initial_prompt": payload.initial_prompt,
+        }
+        transaction_service.create_transaction(
+            conn,
+            transaction_id=tx_hash,
+            seller=seller,
+            buyer_address=payload.buyer_address,
+            payment_payload=payment,
+            requirements=requirements,
+            tx_hash=tx_hash,
+            price_wei=int(requirements["accepts"][0]["amountWei"]),
+            metadata=metadata,
+        )
+        transaction, _ = transaction_service.open_session(conn, tg_manager, transaction_id=tx_hash, metadata=metadata)
+        return transaction_service.transaction_to_dict(transaction)
+
+    return router
+
+
+async def _run(app: FastAPI, path: str, headers: list[str], body: dict) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *[client.post(path, json=body, headers={"PAYMENT-SIGNATURE": h}) for h in headers]
+        )
+        elapsed = time.perf_counter() - start
+    failed = [r for r in responses if r.status_code != 200]
+    if failed:
+        raise RuntimeError(f"{len(failed)} purchases failed: {failed[0].text}")
+    return elapsed
+
+
+async def _bench(purchases: int, latency: float, workdir: str) -> tuple[float, float]:
+    db = open_database(os.path.join(workdir, "bench.sqlite3"))
+    init_db(db)
+    seller = models.create_seller(
+        db,
+        seller_id="bench-seller",
+        evm_address=Account.create().address,
+        price_wei=1000,
+        price_conflux_wei=1000,
+        price_tron_sun=None,
+        description="bench",
+        keywords="bench",
+        status="active",
+    )
+    facilitator = AsyncHTTPFacilitatorClient(
+        "http://facilitator",
+        client=httpx.AsyncClient(transport=_latency_transport(latency, _settle)),
+    )
+    tg_manager = TgManagerClient(
+        "http://tg-manager",
+        "token",
+        client=httpx.Client(transport=_blocking_transport(latency, _session)),
+        async_client=httpx.AsyncClient(transport=_latency_transport(latency, _session)),
+    )
+
+    app = FastAPI()
+    app.include_router(transactions.router)
+    app.include_router(_threaded_router())
+    app.state.db = db
+    app.state.facilitator = EventLoopFacilitatorClient(facilitator)
+    app.state.facilitators = {"conflux": app.state.facilitator}
+    app.state.tg_manager = tg_manager
+
+    body = {
+        "seller_id": seller.seller_id,
+        "buyer_address": "0x0000000000000000000000000000000000000001",
+        "buyer_bot_username": "buyer_bot",
+        "seller_bot_username": "seller_bot",
+        "initial_prompt": "bench",
+    }
+    headers = _sign_payments(seller, purchases * 2)
+    try:
+        threaded = await _run(app, "/threaded/create", headers[:purchases], body)
+        native = await _run(app, "/v1/transactions/create", headers[purchases:], body)
+    finally:
+        await facilitator.aclose()
+        await tg_manager.aclose()
+        db.close()
+    return threaded, native
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--purchases", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per facilitator / tg_manager call")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        threaded, native = asyncio.run(_bench(args.purchases, args.latency, workdir))
+
+    print(f"purchases={args.purchases} latency={args.latency}s per call (2 calls per purchase)")
+    print(f"threaded route : {threaded:.2f}s  {args.purchases / threaded:,.0f} purchases/s")
+    print(f"async route    : {native:.2f}s  {args.purchases / native:,.0f} purchases/s  ({threaded / native:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Compare FTS5 seller search with the old LIKE scan as the sellers table grows.
+
+Usage: python -m benchmarks.bench_seller_search [--sellers 100000 20000 ...] [--queries N]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from contextswap.platform.db import models
+from contextswap.platform.db.engine import connect_sqlite, init_db, utc_now_iso
+
+WORDS = [
+    "weather", "forecast", "sports", "finance", "crypto", "news", "travel", "music", "movies", "health",
+    "recipes", "science", "history", "gaming", "markets", "elections", "climate", "energy", "fashion", "art",
+]
+
+
+def _seed(conn, count: int) -> None:
+    rng = random.Random(count)
+    now = utc_now_iso()
+    rows = []
+    for i in range(count):
+        keywords = ",".join(rng.sample(WORDS, 3)) + f",tag{i}"
+        description = " ".join(rng.choices(WORDS, k=12))
+        rows.append((f"seller-{i}", f"0x{i:040x}", 1000, 1000, description, keywords, "active", now, now))
+    conn.executemany(
+        """
+        INSERT INTO sellers (seller_id, evm_address, price_wei, price_conflux_wei, description, keywords, status, created_at, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        rows,
+    )
+    conn.commit()
+
+
+def _like_search(conn, keyword: str, limit: int = 20) -> list:
+    like = f"%{keyword}%"
+    return conn.execute(
+        """
+        SELECT * FROM sellers
+        WHERE status = 'active' AND (lower(keywords) LIKE ? OR lower(description) LIKE ?)
+        ORDER BY updated_at DESC LIMIT ?
+        """,
+        (like, like, limit),
+    ).fetchall()
+
+
+def _time(fn, queries: list[str]) -> float:
+    start = time.perf_counter()
+    for q in queries:
+        fn(q)
+    return (time.perf_counter() - start) / len(queries) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sellers", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    # 选择性强的查询（单个 tag）才体现索引收益；常见词在任何实现下都要给大量结果打分
+    for count in args.sellers:
+        queries = [f"tag{rng.randrange(count)}" for _ in range(args.queries)]
+        with tempfile.TemporaryDirectory() as tmp:
+            conn = connect_sqlite(os.path.join(tmp, "bench.sqlite3"))
+            init_db(conn)
+            _seed(conn, count)
+            fts = _time(lambda q: models.search_sellers(conn, keyword=q, limit=20), queries)
+            like = _time(lambda q: _like_search(conn, q), queries)
+            conn.close()
+        print(f"sellers={count:>7}  fts5={fts:7.3f} ms/query  like={like:8.3f} ms/query")
+
+
+if __name__ == "__main__":
+    main()
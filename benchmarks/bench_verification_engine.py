@@ -0,0 +1,82 @@
+"""Compare inline BaseFacilitator.verify_payment with the process-pool VerificationEngine.
+
+Usage: python -m benchmarks.bench_verification_engine [--payments N] [--workers W]
+"""
+import argparse
+import asyncio
+import time
+
+from eth_account import Account
+
+from contextswap import evm
+from contextswap.facilitator.base import BaseFacilitator
+from contextswap.facilitator.engine import VerificationEngine, default_worker_count
+from contextswap.x402 import CHAIN_ID, NETWORK_ID, make_requirements
+
+
+class _BenchFacilitator(BaseFacilitator):
+    def __init__(self) -> None:
+        super().__init__(CHAIN_ID, NETWORK_ID)
+
+    def send_raw_transaction(self, raw_hex: str) -> str:
+        raise NotImplementedError
+
+
+def _build_items(count: int) -> list[tuple[dict, dict]]:
+    seller = Account.create().address
+    requirements = make_requirements(seller, 1000)
+    buyer = Account.create()
+    items = []
+    for nonce in range(count):
+        signed = Account.sign_transaction(
+            {"to": seller, "value": 1000, "gas": 21000, "gasPrice": 1, "nonce": nonce, "chainId": CHAIN_ID},
+            buyer.key,
+        )
+        items.append(({"rawTransaction": signed.raw_transaction.hex()}, requirements))
+    return items
+
+
+def _bench_inline(facilitator: BaseFacilitator, items: list[tuple[dict, dict]]) -> float:
+    evm.clear_decode_cache()
+    start = time.perf_counter()
+    for payment, requirements in items:
+        facilitator.verify_payment(payment, requirements)
+    return time.perf_counter() - start
+
+
+def _bench_engine(engine: VerificationEngine, items: list[tuple[dict, dict]]) -> float:
+    evm.clear_decode_cache()
+    start = time.perf_counter()
+    results = asyncio.run(engine.verify_payments(items))
+    elapsed = time.perf_counter() - start
+    failed = [r for r in results if not r["verified"]]
+    if failed:
+        raise RuntimeError(f"unexpected verification failures: {failed[:3]}")
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--payments", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=default_worker_count())
+    args = parser.parse_args()
+
+    items = _build_items(args.payments)
+    facilitator = _BenchFacilitator()
+    engine = VerificationEngine(facilitator, max_workers=args.workers)
+    try:
+        # 预热：拉起全部 worker 进程，避免把进程启动时间算进结果
+        _bench_engine(engine, items[: args.workers * 2])
+
+        inline = _bench_inline(facilitator, items)
+        pooled = _bench_engine(engine, items)
+    finally:
+        engine.close()
+
+    print(f"payments={args.payments} workers={args.workers}")
+    print(f"inline : {inline:.3f}s  {args.payments / inline:,.0f} verify/s")
+    print(f"engine : {pooled:.3f}s  {args.payments / pooled:,.0f} verify/s  ({inline / pooled:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import heapq
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from web3 import Web3
+
+from contextswap.x402 import sign_payment
+
+DEFAULT_GAS_PRICE_TTL = 15.0
+
+
+class NonceManager:
+    """Hands out buyer nonces locally so concurrent payments never collide.
+
+    The first reservation for an address reads the pending transaction count
+    from the chain; after that nonces are allocated in memory. A nonce whose
+    payment was never broadcast is returned with ``release`` and reused before
+    a fresh one, so a rejected payment does not leave a gap that would stall
+    every later transaction from the same account. ``resync`` re-reads the
+    chain after the node reports a nonce error and drops released nonces the
+    chain has already used.
+    """
+
+    def __init__(self, fetch_count: Callable[[str], int]) -> None:
+        self._fetch_count = fetch_count
+        self._lock = threading.Lock()
+        self._next: Dict[str, int] = {}
+        self._released: Dict[str, List[int]] = {}
+
+    @classmethod
+    def for_web3(cls, w3: Web3) -> "NonceManager":
+        return cls(lambda address: int(w3.eth.get_transaction_count(address, "pending")))
+
+    def reserve(self, address: str) -> int:
+        key = address.lower()
+        with self._lock:
+            released = self._released.get(key)
+            if released:
+                return heapq.heappop(released)
+            if key not in self._next:
+                self._next[key] = self._fetch_count(address)
+            nonce = self._next[key]
+            self._next[key] = nonce + 1
+            return nonce
+
+    def release(self, address: str, nonce: int) -> None:
+        """Return a nonce whose transaction was never broadcast."""
+        key = address.lower()
+        with self._lock:
+            next_nonce = self._next.get(key)
+            if next_nonce is None or nonce >= next_nonce:
+                return
+            released = self._released.setdefault(key, [])
+            if nonce not in released:
+                heapq.heappush(released, nonce)
+
+    def resync(self, address: str) -> int:
+        """Re-read the chain nonce, discarding released nonces it has passed."""
+        key = address.lower()
+        chain_nonce = self._fetch_count(address)
+        with self._lock:
+            self._next[key] = max(chain_nonce, self._next.get(key, chain_nonce))
+            released = [n for n in self._released.get(key, []) if n >= chain_nonce]
+            heapq.heapify(released)
+            self._released[key] = released
+            return self._next[key]
+
+
+class GasPriceCache:
+    """Caches ``eth_gasPrice`` for ``ttl`` seconds; falls back to 1 gwei on RPC errors."""
+
+    def __init__(
+        self,
+        fetch_gas_price: Callable[[], int],
+        *,
+        ttl: float = DEFAULT_GAS_PRICE_TTL,
+        fallback: int = Web3.to_wei(1, "gwei"),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._fetch = fetch_gas_price
+        self.ttl = ttl
+        self.fallback = fallback
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._value: int | None = None
+        self._expires_at = 0.0
+
+    @classmethod
+    def for_web3(cls, w3: Web3, *, ttl: float = DEFAULT_GAS_PRICE_TTL) -> "GasPriceCache":
+        return cls(lambda: int(w3.eth.gas_price), ttl=ttl)
+
+    def get(self) -> int:
+        with self._lock:
+            now = self._clock()
+            if self._value is not None and now < self._expires_at:
+                return self._value
+            try:
+                self._value = self._fetch()
+            except Exception:  # noqa: BLE001
+                # 保留上一次的值；从未成功过时用 fallback，短暂的 RPC 抖动不应阻塞付款
+                if self._value is None:
+                    return self.fallback
+            self._expires_at = now + self.ttl
+            return self._value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._expires_at = 0.0
+
+
+@dataclass(frozen=True)
+class BuyerWallet:
+    address: str
+    private_key: str
+
+
+class BuyerPaymentBuilder:
+    """Builds x402 payments for a pool of buyer wallets.
+
+    Each payment goes to the wallet with the fewest payments in flight, so an
+    agent holding several keys can keep many purchases pending at once.
+    Callers report the outcome with ``complete`` (broadcast, nonce consumed)
+    or ``abandon`` (never broadcast, nonce returned to the pool).
+    """
+
+    def __init__(
+        self,
+        w3: Web3,
+        wallets: Sequence[BuyerWallet],
+        *,
+        nonce_manager: NonceManager | None = None,
+        gas_price_cache: GasPriceCache | None = None,
+    ) -> None:
+        if not wallets:
+            raise ValueError("at least one buyer wallet is required")
+        self.w3 = w3
+        self.wallets = [BuyerWallet(Web3.to_checksum_address(w.address), w.private_key) for w in wallets]
+        self.nonces = nonce_manager or NonceManager.for_web3(w3)
+        self.gas_price = gas_price_cache or GasPriceCache.for_web3(w3)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, int] = {w.address: 0 for w in self.wallets}
+        self._pending: Dict[str, Tuple[str, int]] = {}
+        self._cursor = 0
+
+    def _acquire_wallet(self) -> BuyerWallet:
+        with self._lock:
+            count = len(self.wallets)
+            # 从轮转游标开始找在途最少的钱包，负载相同时依次轮换
+            order = [self.wallets[(self._cursor + i) % count] for i in range(count)]
+            wallet = min(order, key=lambda w: self._in_flight[w.address])
+            self._cursor = (self.wallets.index(wallet) + 1) % count
+            self._in_flight[wallet.address] += 1
+            return wallet
+
+    def _finish(self, address: str) -> None:
+        with self._lock:
+            if self._in_flight.get(address, 0) > 0:
+                self._in_flight[address] -= 1
+
+    def build(self, requirements: Dict[str, Any]) -> Dict[str, Any]:
+        wallet = self._acquire_wallet()
+        try:
+            nonce = self.nonces.reserve(wallet.address)
+        except Exception:
+            self._finish(wallet.address)
+            raise
+        try:
+            payment = sign_payment(
+                requirements,
+                self.w3,
+                buyer_address=wallet.address,
+                buyer_private_key=wallet.private_key,
+                nonce=nonce,
+                gas_price=self.gas_price.get(),
+            )
+        except Exception:
+            self.nonces.release(wallet.address, nonce)
+            self._finish(wallet.address)
+            raise
+        with self._lock:
+            self._pending[payment["rawTransaction"]] = (wallet.address, nonce)
+        return payment
+
+    def _pop_pending(self, payment: Dict[str, Any]) -> Tuple[str, int] | None:
+        with self._lock:
+            return self._pending.pop(payment["rawTransaction"], None)
+
+    def complete(self, payment: Dict[str, Any]) -> None:
+        pending = self._pop_pending(payment)
+        if pending is not None:
+            self._finish(pending[0])
+
+    def abandon(self, payment: Dict[str, Any], *, nonce_error: bool = False) -> None:
+        """Release a payment that was not broadcast; ``nonce_error`` resyncs with the chain."""
+        pending = self._pop_pending(payment)
+        if pending is None:
+            return
+        address, nonce = pending
+        # 先归还再对齐链上：若节点已用掉该 nonce，resync 会把它丢弃；否则下一笔复用它，不留空洞
+        self.nonces.release(address, nonce)
+        if nonce_error:
+            self.nonces.resync(address)
+        self._finish(address)
+
+    def in_flight(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._in_flight)
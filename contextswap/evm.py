@@ -1,16 +1,108 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Any, Dict, Optional
 
 from eth_account import Account
 from eth_account._utils import legacy_transactions
-from eth_utils import to_checksum_address
+from eth_utils import keccak, to_checksum_address
 
+DEFAULT_DECODE_CACHE_SIZE = 4096
 
-def decode_raw_transaction(raw_hex: str) -> Dict[str, Any]:
+
+@dataclass(frozen=True)
+class DecodeCacheInfo:
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _DecodeCache:
+    """Thread-safe LRU of decoded transactions keyed by keccak(raw bytes)."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: bytes) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._items.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: bytes, value: Dict[str, Any]) -> None:
+        with self._lock:
+            if self._maxsize <= 0:
+                return
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self._maxsize = max(0, int(maxsize))
+            while len(self._items) > self._maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def info(self) -> DecodeCacheInfo:
+        with self._lock:
+            return DecodeCacheInfo(
+                hits=self._hits,
+                misses=self._misses,
+                maxsize=self._maxsize,
+                currsize=len(self._items),
+            )
+
+
+_decode_cache = _DecodeCache(DEFAULT_DECODE_CACHE_SIZE)
+
+
+def decode_cache_info() -> DecodeCacheInfo:
+    return _decode_cache.info()
+
+
+def clear_decode_cache() -> None:
+    _decode_cache.clear()
+
+
+def set_decode_cache_size(maxsize: int) -> None:
+    _decode_cache.resize(maxsize)
+
+
+def peek_decoded(raw_hex: str) -> Optional[Dict[str, Any]]:
+    """Return the cached decode for ``raw_hex`` without decoding on a miss."""
+    cached = _decode_cache.get(keccak(_raw_bytes(raw_hex)))
+    return None if cached is None else dict(cached)
+
+
+def remember_decoded(decoded: Dict[str, Any]) -> None:
+    """Store a decode produced elsewhere (e.g. a worker process) in this process's cache."""
+    _decode_cache.put(bytes.fromhex(decoded["hash"]), dict(decoded))
+
+
+def _raw_bytes(raw_hex: str) -> bytes:
     raw_hex = raw_hex.lower()
     if raw_hex.startswith("0x"):
         raw_hex = raw_hex[2:]
-    raw_bytes = bytes.fromhex(raw_hex)
+    return bytes.fromhex(raw_hex)
 
+
+def _decode(raw_bytes: bytes) -> Dict[str, Any]:
     tx = legacy_transactions.Transaction.from_bytes(raw_bytes)
     to_addr = to_checksum_address(tx.to) if tx.to else None
 
@@ -20,7 +112,7 @@ def decode_raw_transaction(raw_hex: str) -> Dict[str, Any]:
     else:
         chain_id = (tx.v - 35) // 2
 
-    sender = Account.recover_transaction("0x" + raw_hex)
+    sender = Account.recover_transaction(raw_bytes)
 
     return {
         "to": to_addr,
@@ -28,3 +120,19 @@ def decode_raw_transaction(raw_hex: str) -> Dict[str, Any]:
         "chain_id": chain_id,
         "from": to_checksum_address(sender),
     }
+
+
+def decode_raw_transaction(raw_hex: str) -> Dict[str, Any]:
+    """Decode a signed legacy transaction and recover its sender.
+
+    Results are memoised by transaction hash, so retries of the same
+    PAYMENT-SIGNATURE and the verify/settle phases share one recovery.
+    The returned dict also carries ``hash`` (keccak of the raw bytes, no 0x).
+    """
+    raw_bytes = _raw_bytes(raw_hex)
+    key = keccak(raw_bytes)
+    cached = _decode_cache.get(key)
+    if cached is None:
+        cached = {**_decode(raw_bytes), "hash": key.hex()}
+        _decode_cache.put(key, cached)
+    return dict(cached)
@@ -1,9 +1,13 @@
-from typing import Any, Dict
+from typing import Any, Dict, List
 
+import anyio
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-from contextswap.facilitator.base import BaseFacilitator
+from contextswap.facilitator.base import DEFAULT_BATCH_CONCURRENCY, BaseFacilitator
+from contextswap.facilitator.engine import VerificationEngine
+
+MAX_BATCH_SIZE = 100
 
 
 class FacilitatorRequest(BaseModel):
@@ -11,13 +15,31 @@ class FacilitatorRequest(BaseModel):
     requirements: Dict[str, Any]
 
 
-def create_facilitator_app(facilitator: BaseFacilitator) -> FastAPI:
+class FacilitatorBatchRequest(BaseModel):
+    items: List[FacilitatorRequest]
+    max_concurrency: int = Field(default=DEFAULT_BATCH_CONCURRENCY, ge=1, le=32)
+
+
+def create_facilitator_app(
+    facilitator: BaseFacilitator,
+    *,
+    verification_engine: VerificationEngine | None = None,
+) -> FastAPI:
     app = FastAPI(title="x402 Facilitator")
 
+    async def _verify(payload: FacilitatorRequest) -> Dict[str, Any]:
+        if verification_engine is not None:
+            return await verification_engine.verify_payment(payload.payment, payload.requirements)
+        return await anyio.to_thread.run_sync(facilitator.verify_payment, payload.payment, payload.requirements)
+
+    @app.get("/healthz")
+    def healthz() -> Dict[str, Any]:
+        return {"status": "ok"}
+
     @app.post("/v2/x402/verify")
-    def verify(payload: FacilitatorRequest) -> Dict[str, Any]:
+    async def verify(payload: FacilitatorRequest) -> Dict[str, Any]:
         try:
-            result = facilitator.verify_payment(payload.payment, payload.requirements)
+            result = await _verify(payload)
         except Exception as exc:  # noqa: BLE001
             raise HTTPException(status_code=400, detail=str(exc)) from exc
         return {"ok": True, "verified": True, **result}
@@ -30,4 +52,31 @@ def create_facilitator_app(facilitator: BaseFacilitator) -> FastAPI:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
         return {"ok": True, "txHash": tx_hash}
 
+    @app.post("/v2/x402/verify-and-settle")
+    async def verify_and_settle(payload: FacilitatorRequest) -> Dict[str, Any]:
+        try:
+            if verification_engine is None:
+                result = await anyio.to_thread.run_sync(
+                    facilitator.verify_and_settle_payment, payload.payment, payload.requirements
+                )
+            else:
+                verified = await _verify(payload)
+                tx_hash = await anyio.to_thread.run_sync(
+                    facilitator.settle_payment, payload.payment, payload.requirements
+                )
+                result = {**verified, "txHash": tx_hash}
+        except Exception as exc:  # noqa: BLE001
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return {"ok": True, "verified": True, **result}
+
+    @app.post("/v2/x402/settle-batch")
+    def settle_batch(payload: FacilitatorBatchRequest) -> Dict[str, Any]:
+        if len(payload.items) > MAX_BATCH_SIZE:
+            raise HTTPException(status_code=400, detail=f"batch size must be <= {MAX_BATCH_SIZE}")
+        results = facilitator.settle_payments(
+            [(item.payment, item.requirements) for item in payload.items],
+            max_concurrency=payload.max_concurrency,
+        )
+        return {"ok": True, "results": results}
+
     return app
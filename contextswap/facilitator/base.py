@@ -1,11 +1,17 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Protocol
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Protocol, Sequence, Tuple
 
 from web3 import Web3
 
 from contextswap.evm import decode_raw_transaction
 
 
+DEFAULT_BATCH_CONCURRENCY = 8
+
+PaymentItem = Tuple[Dict[str, Any], Dict[str, Any]]
+
+
 class FacilitatorClient(Protocol):
     def verify_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> Dict[str, Any]:
         ...
@@ -25,7 +31,14 @@ class BaseFacilitator(ABC):
             raise ValueError("Missing rawTransaction in payment payload")
 
         decoded = decode_raw_transaction(raw_tx)
-
+        return self.check_decoded_payment(decoded, payment, requirements)
+
+    def check_decoded_payment(
+        self,
+        decoded: Dict[str, Any],
+        payment: Dict[str, Any],
+        requirements: Dict[str, Any],
+    ) -> Dict[str, Any]:
         if decoded.get("chain_id") != self.chain_id:
             raise ValueError("Wrong chain_id in transaction")
 
@@ -56,6 +69,52 @@ class BaseFacilitator(ABC):
             raise ValueError("Missing rawTransaction in payment payload")
         return self.send_raw_transaction(raw_tx)
 
+    def verify_and_settle_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> Dict[str, Any]:
+        result = self.verify_payment(payment, requirements)
+        tx_hash = self.settle_payment(payment, requirements)
+        return {**result, "txHash": tx_hash}
+
+    def settle_payments(
+        self,
+        items: Sequence[PaymentItem],
+        *,
+        max_concurrency: int = DEFAULT_BATCH_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """Verify then broadcast a batch of (payment, requirements) pairs.
+
+        Both phases run on a bounded thread pool. Each item gets its own
+        result dict, so one bad payment never aborts the rest of the batch.
+        """
+        if not items:
+            return []
+
+        results: List[Dict[str, Any]] = [{"index": i, "ok": False} for i in range(len(items))]
+
+        def _verify(index: int) -> bool:
+            payment, requirements = items[index]
+            try:
+                verified = self.verify_payment(payment, requirements)
+            except Exception as exc:  # noqa: BLE001
+                results[index].update({"verified": False, "error": str(exc)})
+                return False
+            results[index].update({**verified, "verified": True})
+            return True
+
+        def _settle(index: int) -> None:
+            payment, requirements = items[index]
+            try:
+                tx_hash = self.settle_payment(payment, requirements)
+            except Exception as exc:  # noqa: BLE001
+                results[index]["error"] = str(exc)
+                return
+            results[index].update({"ok": True, "txHash": tx_hash})
+
+        workers = max(1, min(int(max_concurrency), len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            verified = list(pool.map(_verify, range(len(items))))
+            list(pool.map(_settle, [i for i, ok in enumerate(verified) if ok]))
+        return results
+
     @abstractmethod
     def send_raw_transaction(self, raw_hex: str) -> str:
         raise NotImplementedError
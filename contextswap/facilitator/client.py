@@ -1,8 +1,31 @@
-from typing import Any, Dict
+import asyncio
+from typing import Any, Dict, List, Sequence
 
-import requests
+import anyio
+import httpx
 
-from contextswap.facilitator.base import BaseFacilitator
+from contextswap.facilitator.base import BaseFacilitator, PaymentItem
+
+DEFAULT_POOL_SIZE = 20
+DEFAULT_CONNECT_TIMEOUT = 3.0
+DEFAULT_VERIFY_TIMEOUT = 10.0
+DEFAULT_SETTLE_TIMEOUT = 10.0
+
+
+def _phase_timeout(connect_timeout: float, read_timeout: float) -> httpx.Timeout:
+    return httpx.Timeout(read_timeout, connect=connect_timeout)
+
+
+def _pool_limits(pool_size: int) -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+        keepalive_expiry=60.0,
+    )
+
+
+def _batch_items(items: Sequence[PaymentItem]) -> List[Dict[str, Any]]:
+    return [{"payment": payment, "requirements": requirements} for payment, requirements in items]
 
 
 class DirectFacilitatorClient:
@@ -15,28 +38,177 @@ class DirectFacilitatorClient:
     def settle_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> str:
         return self._facilitator.settle_payment(payment, requirements)
 
+    def verify_and_settle_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> Dict[str, Any]:
+        return self._facilitator.verify_and_settle_payment(payment, requirements)
+
+    def settle_payments(self, items: Sequence[PaymentItem]) -> List[Dict[str, Any]]:
+        return self._facilitator.settle_payments(items)
+
 
 class HTTPFacilitatorClient:
-    def __init__(self, base_url: str) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        client: httpx.Client | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        verify_timeout: float = DEFAULT_VERIFY_TIMEOUT,
+        settle_timeout: float = DEFAULT_SETTLE_TIMEOUT,
+    ) -> None:
         self.base_url = base_url.rstrip("/")
+        self._verify_timeout = _phase_timeout(connect_timeout, verify_timeout)
+        self._settle_timeout = _phase_timeout(connect_timeout, settle_timeout)
+        self._client = client or httpx.Client(limits=_pool_limits(pool_size))
 
     def verify_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> Dict[str, Any]:
-        resp = requests.post(
+        resp = self._client.post(
             f"{self.base_url}/v2/x402/verify",
             json={"payment": payment, "requirements": requirements},
-            timeout=10,
+            timeout=self._verify_timeout,
         )
         if resp.status_code != 200:
             raise RuntimeError(resp.text)
         return resp.json()
 
     def settle_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> str:
-        resp = requests.post(
+        resp = self._client.post(
+            f"{self.base_url}/v2/x402/settle",
+            json={"payment": payment, "requirements": requirements},
+            timeout=self._settle_timeout,
+        )
+        if resp.status_code != 200:
+            raise RuntimeError(resp.text)
+        data = resp.json()
+        return data.get("txHash", "")
+
+    def verify_and_settle_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> Dict[str, Any]:
+        resp = self._client.post(
+            f"{self.base_url}/v2/x402/verify-and-settle",
+            json={"payment": payment, "requirements": requirements},
+            timeout=self._settle_timeout,
+        )
+        if resp.status_code != 200:
+            raise RuntimeError(resp.text)
+        return resp.json()
+
+    def settle_payments(self, items: Sequence[PaymentItem]) -> List[Dict[str, Any]]:
+        resp = self._client.post(
+            f"{self.base_url}/v2/x402/settle-batch",
+            json={"items": _batch_items(items)},
+            timeout=self._settle_timeout,
+        )
+        if resp.status_code != 200:
+            raise RuntimeError(resp.text)
+        return resp.json().get("results", [])
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class AsyncHTTPFacilitatorClient:
+    """Facilitator client on a shared keep-alive connection pool.
+
+    One ``httpx.AsyncClient`` is reused for every verify/settle call, so a
+    purchase no longer pays a TCP+TLS handshake per phase. ``warm_up`` opens
+    connections ahead of the first request (call it from the app lifespan).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        client: httpx.AsyncClient | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        verify_timeout: float = DEFAULT_VERIFY_TIMEOUT,
+        settle_timeout: float = DEFAULT_SETTLE_TIMEOUT,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self._verify_timeout = _phase_timeout(connect_timeout, verify_timeout)
+        self._settle_timeout = _phase_timeout(connect_timeout, settle_timeout)
+        self._client = client or httpx.AsyncClient(limits=_pool_limits(pool_size))
+
+    async def warm_up(self, connections: int = 1) -> int:
+        """Pre-open up to ``connections`` pooled connections; returns how many succeeded."""
+        count = max(0, min(int(connections), self.pool_size))
+        if count == 0:
+            return 0
+
+        async def _ping() -> bool:
+            try:
+                await self._client.get(f"{self.base_url}/healthz", timeout=self._verify_timeout)
+            except httpx.HTTPError:
+                return False
+            return True
+
+        results = await asyncio.gather(*[_ping() for _ in range(count)])
+        return sum(1 for ok in results if ok)
+
+    async def verify_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> Dict[str, Any]:
+        resp = await self._client.post(
+            f"{self.base_url}/v2/x402/verify",
+            json={"payment": payment, "requirements": requirements},
+            timeout=self._verify_timeout,
+        )
+        if resp.status_code != 200:
+            raise RuntimeError(resp.text)
+        return resp.json()
+
+    async def settle_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> str:
+        resp = await self._client.post(
             f"{self.base_url}/v2/x402/settle",
             json={"payment": payment, "requirements": requirements},
-            timeout=10,
+            timeout=self._settle_timeout,
         )
         if resp.status_code != 200:
             raise RuntimeError(resp.text)
         data = resp.json()
         return data.get("txHash", "")
+
+    async def verify_and_settle_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> Dict[str, Any]:
+        resp = await self._client.post(
+            f"{self.base_url}/v2/x402/verify-and-settle",
+            json={"payment": payment, "requirements": requirements},
+            timeout=self._settle_timeout,
+        )
+        if resp.status_code != 200:
+            raise RuntimeError(resp.text)
+        return resp.json()
+
+    async def settle_payments(self, items: Sequence[PaymentItem]) -> List[Dict[str, Any]]:
+        resp = await self._client.post(
+            f"{self.base_url}/v2/x402/settle-batch",
+            json={"items": _batch_items(items)},
+            timeout=self._settle_timeout,
+        )
+        if resp.status_code != 200:
+            raise RuntimeError(resp.text)
+        return resp.json().get("results", [])
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+class EventLoopFacilitatorClient:
+    """Synchronous facade over ``AsyncHTTPFacilitatorClient``.
+
+    Sync routes run in AnyIO worker threads; each call hops back to the event
+    loop that owns the pooled client, so the pool is shared across workers.
+    """
+
+    def __init__(self, client: AsyncHTTPFacilitatorClient) -> None:
+        self.client = client
+
+    def verify_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> Dict[str, Any]:
+        return anyio.from_thread.run(self.client.verify_payment, payment, requirements)
+
+    def settle_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> str:
+        return anyio.from_thread.run(self.client.settle_payment, payment, requirements)
+
+    def verify_and_settle_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> Dict[str, Any]:
+        return anyio.from_thread.run(self.client.verify_and_settle_payment, payment, requirements)
+
+    def settle_payments(self, items: Sequence[PaymentItem]) -> List[Dict[str, Any]]:
+        return anyio.from_thread.run(self.client.settle_payments, items)
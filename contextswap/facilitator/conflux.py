@@ -1,13 +1,25 @@
 from web3 import Web3
 
 from contextswap.facilitator.base import BaseFacilitator
+from contextswap.jsonrpc import BatchingHTTPProvider
 from contextswap.x402 import CHAIN_ID, NETWORK_ID
 
 
 class ConfluxFacilitator(BaseFacilitator):
-    def __init__(self, rpc_url: str) -> None:
+    def __init__(
+        self,
+        rpc_url: str,
+        *,
+        batch_window: float = 0.0,
+        max_batch: int = 50,
+    ) -> None:
         super().__init__(CHAIN_ID, NETWORK_ID)
-        self.web3 = Web3(Web3.HTTPProvider(rpc_url))
+        # batch_window > 0：把并发的 RPC 调用（如多笔 send_raw_transaction）合并成一个 JSON-RPC 批量请求
+        if batch_window > 0:
+            provider = BatchingHTTPProvider(rpc_url, window=batch_window, max_batch=max_batch)
+            self.web3 = Web3(provider)
+        else:
+            self.web3 = Web3(Web3.HTTPProvider(rpc_url))
 
     def send_raw_transaction(self, raw_hex: str) -> str:
         raw_hex = raw_hex.lower()
@@ -0,0 +1,79 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Dict, List, Sequence
+
+import anyio
+
+from contextswap import evm
+from contextswap.facilitator.base import BaseFacilitator, PaymentItem
+
+
+def default_worker_count() -> int:
+    return os.cpu_count() or 1
+
+
+class VerificationEngine:
+    """Runs signature recovery for ``BaseFacilitator.verify_payment`` in worker processes.
+
+    ``decode_raw_transaction`` is CPU-bound and holds the GIL, so verifying on
+    the FastAPI threadpool pins throughput to one core. The engine decodes in a
+    ``ProcessPoolExecutor`` and applies the facilitator's own checks to the
+    result in the calling process. Facilitators that override
+    ``verify_payment`` (e.g. Tron, which recovers nothing) run on a thread instead.
+    """
+
+    def __init__(
+        self,
+        facilitator: BaseFacilitator,
+        *,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
+    ) -> None:
+        self.facilitator = facilitator
+        self.max_workers = max_workers or default_worker_count()
+        self._owns_executor = executor is None
+        # spawn 而非 fork：服务进程里已有事件循环与线程池，fork 子进程可能死锁
+        self._executor = executor or ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._decodes_in_pool = type(facilitator).verify_payment is BaseFacilitator.verify_payment
+
+    async def decode(self, raw_hex: str) -> Dict[str, Any]:
+        cached = evm.peek_decoded(raw_hex)
+        if cached is not None:
+            return cached
+        loop = asyncio.get_running_loop()
+        decoded = await loop.run_in_executor(self._executor, evm.decode_raw_transaction, raw_hex)
+        evm.remember_decoded(decoded)
+        return decoded
+
+    async def verify_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> Dict[str, Any]:
+        if not self._decodes_in_pool:
+            return await anyio.to_thread.run_sync(self.facilitator.verify_payment, payment, requirements)
+
+        raw_tx = payment.get("rawTransaction")
+        if not raw_tx:
+            raise ValueError("Missing rawTransaction in payment payload")
+        decoded = await self.decode(raw_tx)
+        return self.facilitator.check_decoded_payment(decoded, payment, requirements)
+
+    async def verify_payments(self, items: Sequence[PaymentItem]) -> List[Dict[str, Any]]:
+        """Verify a batch concurrently; each item reports its own result or error."""
+        outcomes = await asyncio.gather(
+            *[self.verify_payment(payment, requirements) for payment, requirements in items],
+            return_exceptions=True,
+        )
+        results: List[Dict[str, Any]] = []
+        for index, outcome in enumerate(outcomes):
+            if isinstance(outcome, Exception):
+                results.append({"index": index, "verified": False, "error": str(outcome)})
+            else:
+                results.append({"index": index, **outcome, "verified": True})
+        return results
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
@@ -1,25 +1,33 @@
 import json
 from typing import Any, Dict
 
-import requests
 from eth_utils import to_checksum_address
 
 from contextswap.facilitator.base import BaseFacilitator
+from contextswap.tron_client import TronGridClient, get_tron_client
 from contextswap.tron_utils import extract_transfer_contract, tron_hex_to_evm
 from contextswap.x402_tron import CHAIN_ID, NETWORK_ID
 
 
 class TronFacilitator(BaseFacilitator):
-    def __init__(self, rpc_url: str, api_key: str | None = None) -> None:
+    def __init__(
+        self,
+        rpc_url: str,
+        api_key: str | None = None,
+        *,
+        client: TronGridClient | None = None,
+    ) -> None:
         super().__init__(CHAIN_ID, NETWORK_ID)
         self.rpc_url = rpc_url.rstrip("/")
         self.api_key = api_key
+        self._client = client
 
-    def _headers(self) -> Dict[str, str]:
-        headers = {"Content-Type": "application/json"}
-        if self.api_key:
-            headers["TRON-PRO-API-KEY"] = self.api_key
-        return headers
+    @property
+    def client(self) -> TronGridClient:
+        # 延迟创建：只做验证的场景（测试、VerificationEngine）不需要连接池
+        if self._client is None:
+            self._client = get_tron_client(self.rpc_url, self.api_key)
+        return self._client
 
     def _extract_tx(self, payment: Dict[str, Any]) -> Dict[str, Any]:
         tx = payment.get("transaction") or payment.get("rawTransaction")
@@ -73,17 +81,10 @@ class TronFacilitator(BaseFacilitator):
 
     def settle_payment(self, payment: Dict[str, Any], requirements: Dict[str, Any]) -> str:
         tx = self._extract_tx(payment)
-        resp = requests.post(
-            f"{self.rpc_url}/wallet/broadcasttransaction",
-            json=tx,
-            headers=self._headers(),
-            timeout=10,
-        )
-        if resp.status_code != 200:
-            raise RuntimeError(resp.text)
-        data = resp.json()
-        if not data.get("result", True):
-            raise RuntimeError(resp.text)
+        data = self.client.post("/wallet/broadcasttransaction", tx)
+        # 错误响应只带 code/message 不带 result；DUP_TRANSACTION_ERROR 表示同一笔交易已被接收（如超时后重试），视为广播成功
+        if data.get("result") is not True and data.get("code") != "DUP_TRANSACTION_ERROR":
+            raise RuntimeError(json.dumps(data))
         return data.get("txid") or data.get("txID") or tx.get("txID", "")
 
     def send_raw_transaction(self, raw_hex: str) -> str:
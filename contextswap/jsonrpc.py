@@ -0,0 +1,199 @@
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Sequence, Tuple, cast
+
+import httpx
+from web3.providers.base import BaseProvider
+from web3.types import RPCEndpoint, RPCResponse
+
+DEFAULT_TIMEOUT = 10.0
+
+RpcCall = Tuple[str, Sequence[Any]]
+
+
+class JsonRpcError(RuntimeError):
+    def __init__(self, error: Dict[str, Any]) -> None:
+        super().__init__(error.get("message") or str(error))
+        self.code = error.get("code")
+        self.data = error.get("data")
+
+
+class JsonRpcClient:
+    """Minimal JSON-RPC 2.0 client over a pooled ``httpx.Client``, with batch support."""
+
+    def __init__(
+        self,
+        rpc_url: str,
+        *,
+        client: httpx.Client | None = None,
+        pool_size: int = 10,
+        timeout: float = DEFAULT_TIMEOUT,
+    ) -> None:
+        self.rpc_url = rpc_url
+        self.timeout = httpx.Timeout(timeout)
+        self._owns_client = client is None
+        self._client = client or httpx.Client(
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+        )
+        self._ids = itertools.count(1)
+        self._ids_lock = threading.Lock()
+
+    def _next_id(self) -> int:
+        with self._ids_lock:
+            return next(self._ids)
+
+    def _post(self, body: Any) -> Any:
+        resp = self._client.post(self.rpc_url, json=body, timeout=self.timeout)
+        if resp.status_code != 200:
+            raise RuntimeError(resp.text)
+        return resp.json()
+
+    def call(self, method: str, params: Sequence[Any]) -> Any:
+        data = self._post({"jsonrpc": "2.0", "id": self._next_id(), "method": method, "params": list(params)})
+        if data.get("error"):
+            raise JsonRpcError(data["error"])
+        return data.get("result")
+
+    def batch(self, calls: Sequence[RpcCall]) -> List[Any]:
+        """Send ``calls`` in one HTTP request.
+
+        Returns results in call order; a call that failed yields its
+        ``JsonRpcError`` in place of a result, so one bad item does not sink
+        the whole batch.
+        """
+        if not calls:
+            return []
+        ids = [self._next_id() for _ in calls]
+        body = [
+            {"jsonrpc": "2.0", "id": call_id, "method": method, "params": list(params)}
+            for call_id, (method, params) in zip(ids, calls)
+        ]
+        data = self._post(body)
+        if isinstance(data, dict):
+            # 节点不支持批量时会返回单个错误对象
+            raise JsonRpcError(data.get("error") or {"message": str(data)})
+        by_id = {item.get("id"): item for item in data}
+        results: List[Any] = []
+        for call_id in ids:
+            item = by_id.get(call_id)
+            if item is None:
+                results.append(JsonRpcError({"message": f"missing response for id {call_id}"}))
+            elif item.get("error"):
+                results.append(JsonRpcError(item["error"]))
+            else:
+                results.append(item.get("result"))
+        return results
+
+    def close(self) -> None:
+        if self._owns_client:
+            self._client.close()
+
+
+class _PendingCall:
+    __slots__ = ("method", "params", "done", "response", "error")
+
+    def __init__(self, method: str, params: Any) -> None:
+        self.method = method
+        self.params = params
+        self.done = threading.Event()
+        self.response: Dict[str, Any] | None = None
+        self.error: BaseException | None = None
+
+
+class BatchingHTTPProvider(BaseProvider):
+    """web3 provider that coalesces concurrent calls into JSON-RPC batch requests.
+
+    The first caller to arrive becomes the leader: it waits up to ``window``
+    seconds (or until ``max_batch`` calls are queued), sends them as one
+    batch array and hands each response back to its caller. A lone call is
+    sent as a plain request, so idle latency only grows by the window.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        *,
+        window: float = 0.005,
+        max_batch: int = 50,
+        client: JsonRpcClient | None = None,
+    ) -> None:
+        super().__init__()
+        if max_batch < 1:
+            raise ValueError("max_batch must be >= 1")
+        self.window = window
+        self.max_batch = max_batch
+        self.client = client or JsonRpcClient(rpc_url)
+        self._cond = threading.Condition()
+        self._pending: List[_PendingCall] = []
+        self._collecting = False
+        self.batches_sent = 0
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        try:
+            self.make_request(RPCEndpoint("web3_clientVersion"), [])
+        except Exception:  # noqa: BLE001
+            if show_traceback:
+                raise
+            return False
+        return True
+
+    def make_request(self, method: RPCEndpoint, params: Any) -> RPCResponse:
+        call = _PendingCall(method, params)
+        with self._cond:
+            self._pending.append(call)
+            leader = not self._collecting
+            self._collecting = True
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+
+        if leader:
+            self._lead()
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return cast(RPCResponse, call.response)
+
+    def _lead(self) -> None:
+        while True:
+            with self._cond:
+                deadline = time.monotonic() + self.window
+                while len(self._pending) < self.max_batch:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._pending[: self.max_batch]
+                del self._pending[: self.max_batch]
+            self._send(batch)
+            with self._cond:
+                if not self._pending:
+                    self._collecting = False
+                    return
+
+    def _send(self, batch: List[_PendingCall]) -> None:
+        ids = [self.client._next_id() for _ in batch]
+        bodies = [
+            {"jsonrpc": "2.0", "id": call_id, "method": call.method, "params": list(call.params or [])}
+            for call_id, call in zip(ids, batch)
+        ]
+        try:
+            data = self.client._post(bodies[0] if len(bodies) == 1 else bodies)
+            self.batches_sent += 1
+            if isinstance(data, dict) and len(batch) > 1:
+                # 节点拒绝批量请求时返回单个错误对象
+                raise JsonRpcError(data.get("error") or {"message": str(data)})
+            items = [data] if isinstance(data, dict) else list(data)
+            by_id = {item.get("id"): item for item in items}
+            for call_id, call in zip(ids, batch):
+                item = by_id.get(call_id)
+                if item is None:
+                    call.error = JsonRpcError({"message": f"missing response for id {call_id}"})
+                else:
+                    call.response = item
+        except BaseException as exc:  # noqa: BLE001
+            for call in batch:
+                call.error = exc
+        finally:
+            for call in batch:
+                call.done.set()
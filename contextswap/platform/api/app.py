@@ -1,21 +1,40 @@
+import asyncio
+import dataclasses
+import os
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from telethon import TelegramClient
 from telethon.sessions import StringSession
 
-from contextswap.facilitator.client import DirectFacilitatorClient, HTTPFacilitatorClient
+from contextswap.facilitator.client import (
+    AsyncHTTPFacilitatorClient,
+    DirectFacilitatorClient,
+    EventLoopFacilitatorClient,
+)
 from contextswap.facilitator.conflux import ConfluxFacilitator
 from contextswap.facilitator.tron import TronFacilitator
+from contextswap.jsonrpc import JsonRpcClient
+from contextswap.platform.api.routes.events import router as events_router
 from contextswap.platform.api.routes.health import router as health_router
 from contextswap.platform.api.routes.session import router as session_router
 from contextswap.platform.api.routes.sellers import router as sellers_router
+from contextswap.platform.api.routes.stats import router as stats_router
 from contextswap.platform.api.routes.transactions import router as transactions_router
 from contextswap.platform.config import Settings, load_settings
-from contextswap.platform.db.engine import connect_sqlite, init_db
+from contextswap.platform.db.engine import init_db, open_database
+from contextswap.platform.services.archiver import TransactionArchiver
+from contextswap.platform.services.catalog_cache import CatalogCache
+from contextswap.platform.services import transaction_service
+from contextswap.platform.services.confirmation_tracker import ConfirmationTracker
+from contextswap.platform.services.event_bus import EventBus
 from contextswap.platform.services.inprocess_tg_manager_client import InProcessTgManagerClient
+from contextswap.platform.services.replica import ReadReplica
 from contextswap.platform.services.session_client import SessionManagerClient
+from contextswap.platform.services.settlement_worker import SettlementWorker
 from contextswap.platform.services.tg_manager_client import TgManagerClient
+from contextswap.tron_client import TronGridClient
+from tg_manager.services import session_service as tg_session_service
 from tg_manager.services.mock_bot_relay import MockBotRelay, parse_mock_bots
 from tg_manager.services.telethon_relay import TelethonRelay
 from tg_manager.services.telethon_service import TelethonService
@@ -33,7 +52,19 @@ def create_app(
         nonlocal facilitator_client
         nonlocal tg_manager_client
         nonlocal tg_manager_telegram_service
-        conn = connect_sqlite(settings.sqlite_path)
+        archive_enabled = getattr(settings, "archive_after_days", 0) > 0
+        archive_path = getattr(settings, "archive_sqlite_path", None)
+        if archive_path and not archive_enabled and not os.path.exists(archive_path):
+            # 未启用归档且没有历史归档文件时不挂载
+            archive_path = None
+        conn = open_database(
+            settings.sqlite_path,
+            read_pool_size=settings.sqlite_read_pool_size,
+            group_commit=settings.sqlite_group_commit,
+            group_commit_window=settings.sqlite_group_commit_window_ms / 1000,
+            group_commit_max=settings.sqlite_group_commit_max,
+            archive_path=archive_path,
+        )
         init_db(conn)
         app.state.db = conn
         app.state.settings = settings
@@ -43,19 +74,43 @@ def create_app(
         telethon_client: TelegramClient | None = None
 
         facilitators: dict[str, object] | None = None
+        pooled_facilitators: list[AsyncHTTPFacilitatorClient] = []
+        tron_clients: list[TronGridClient] = []
         if isinstance(facilitator_client, dict):
             facilitators = facilitator_client
             facilitator_client = facilitators.get("conflux") or next(iter(facilitators.values()))
         elif facilitator_client is None:
             facilitators = {}
             if settings.facilitator_base_url:
-                facilitators["conflux"] = HTTPFacilitatorClient(settings.facilitator_base_url)
+                pooled = AsyncHTTPFacilitatorClient(
+                    settings.facilitator_base_url,
+                    pool_size=settings.facilitator_pool_size,
+                    connect_timeout=settings.facilitator_connect_timeout,
+                    verify_timeout=settings.facilitator_verify_timeout,
+                    settle_timeout=settings.facilitator_settle_timeout,
+                )
+                pooled_facilitators.append(pooled)
+                await pooled.warm_up(settings.facilitator_warm_connections)
+                facilitators["conflux"] = EventLoopFacilitatorClient(pooled)
             elif settings.rpc_url:
-                facilitators["conflux"] = DirectFacilitatorClient(ConfluxFacilitator(settings.rpc_url))
+                facilitators["conflux"] = DirectFacilitatorClient(
+                    ConfluxFacilitator(
+                        settings.rpc_url,
+                        batch_window=settings.conflux_rpc_batch_window_ms / 1000,
+                        max_batch=settings.conflux_rpc_max_batch,
+                    )
+                )
 
             if settings.tron_rpc_url:
+                tron_client = TronGridClient(
+                    settings.tron_rpc_url,
+                    settings.tron_api_key,
+                    rate_limit=settings.tron_rate_limit,
+                    max_retries=settings.tron_max_retries,
+                )
+                tron_clients.append(tron_client)
                 facilitators["tron"] = DirectFacilitatorClient(
-                    TronFacilitator(settings.tron_rpc_url, settings.tron_api_key)
+                    TronFacilitator(settings.tron_rpc_url, settings.tron_api_key, client=tron_client)
                 )
 
             if not facilitators:
@@ -116,9 +171,95 @@ def create_app(
         app.state.facilitators = facilitators or {"conflux": facilitator_client}
         app.state.tg_manager = tg_manager_client
 
+        events: EventBus | None = app.state.event_bus
+        session_listener = None
+        if events is not None and isinstance(tg_manager_client, InProcessTgManagerClient):
+            # 进程内 tg_manager：会话创建 / 结束（含 relay 自动结束）直接推送到事件流
+            def session_listener(session) -> None:
+                transaction_service.publish_session(events, dataclasses.asdict(session))
+
+            tg_session_service.add_session_listener(session_listener)
+
+        settlement_task: asyncio.Task | None = None
+        if getattr(settings, "settlement_mode", "sync") == "async":
+            settlement_worker = SettlementWorker(
+                conn,
+                facilitators=app.state.facilitators,
+                tg_manager=tg_manager_client,
+                max_attempts=settings.settlement_max_attempts,
+                events=events,
+            )
+            settlement_worker.recover()
+            app.state.settlement_worker = settlement_worker
+            settlement_task = asyncio.create_task(
+                settlement_worker.run_forever(poll_interval=settings.settlement_poll_interval)
+            )
+
+        confirmation_task: asyncio.Task | None = None
+        confirmation_rpc: JsonRpcClient | None = None
+        if getattr(settings, "confirmation_tracker_enabled", False):
+            if settings.rpc_url:
+                confirmation_rpc = JsonRpcClient(settings.rpc_url)
+            tracker_tron_client = tron_clients[0] if tron_clients else None
+            if tracker_tron_client is None and settings.tron_rpc_url:
+                tracker_tron_client = TronGridClient(
+                    settings.tron_rpc_url,
+                    settings.tron_api_key,
+                    rate_limit=settings.tron_rate_limit,
+                    max_retries=settings.tron_max_retries,
+                )
+                tron_clients.append(tracker_tron_client)
+            tracker = ConfirmationTracker(
+                conn,
+                conflux_rpc=confirmation_rpc,
+                tron_client=tracker_tron_client,
+                timeout_seconds=settings.confirmation_timeout,
+                events=events,
+            )
+            app.state.confirmation_tracker = tracker
+            confirmation_task = asyncio.create_task(
+                tracker.run_forever(poll_interval=settings.confirmation_poll_interval)
+            )
+
+        archive_task: asyncio.Task | None = None
+        if archive_enabled and archive_path:
+            archiver = TransactionArchiver(
+                conn,
+                after_days=settings.archive_after_days,
+                batch_size=settings.archive_batch_size,
+                require_confirmation=getattr(settings, "confirmation_tracker_enabled", False),
+            )
+            app.state.archiver = archiver
+            archive_task = asyncio.create_task(archiver.run_forever(poll_interval=settings.archive_interval))
+
+        replica: ReadReplica | None = None
+        replica_task: asyncio.Task | None = None
+        replica_path = getattr(settings, "read_replica_path", None)
+        if getattr(settings, "read_replica_interval", 0) > 0 and replica_path:
+            replica = ReadReplica(
+                settings.sqlite_path,
+                replica_path,
+                pages=settings.read_replica_pages,
+                read_pool_size=settings.sqlite_read_pool_size,
+            )
+            app.state.replica = replica
+            replica_task = asyncio.create_task(replica.run_forever(poll_interval=settings.read_replica_interval))
+
         try:
             yield
         finally:
+            for task in (replica_task, archive_task, confirmation_task, settlement_task):
+                if task is None:
+                    continue
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            if session_listener is not None:
+                tg_session_service.remove_session_listener(session_listener)
+            if confirmation_rpc is not None:
+                confirmation_rpc.close()
             if mock_relay is not None:
                 await mock_relay.stop()
             if relay is not None:
@@ -127,13 +268,29 @@ def create_app(
                 await telethon_client.disconnect()
             if tg_manager_client is not None:
                 tg_manager_client.close()
+                aclose = getattr(tg_manager_client, "aclose", None)
+                if aclose is not None:
+                    await aclose()
+            for pooled in pooled_facilitators:
+                await pooled.aclose()
+            for tron_client in tron_clients:
+                tron_client.close()
+            if replica is not None:
+                replica.close()
             conn.close()
 
     app = FastAPI(title="contextswap-platform", version="0.1.0", lifespan=lifespan)
+    catalog_cache_size = getattr(settings, "catalog_cache_size", 0)
+    # 进程内缓存：卖家写接口调用 bump() 使其失效，多进程部署时各自独立
+    app.state.catalog_cache = CatalogCache(max_entries=catalog_cache_size) if catalog_cache_size > 0 else None
+    event_buffer_size = getattr(settings, "event_buffer_size", 0)
+    app.state.event_bus = EventBus(max_events=event_buffer_size) if event_buffer_size > 0 else None
     app.include_router(health_router)
     app.include_router(sellers_router)
     app.include_router(transactions_router)
     app.include_router(session_router)
+    app.include_router(stats_router)
+    app.include_router(events_router)
     return app
 
 
@@ -8,6 +8,13 @@ def get_db(request: Request):
     return request.app.state.db
 
 
+def get_read_db(request: Request):
+    """Connection for list/search/stats reads: the read replica when one is ready, else the primary."""
+    replica = getattr(request.app.state, "replica", None)
+    db = replica.db if replica is not None else None
+    return db if db is not None else request.app.state.db
+
+
 def get_facilitator(request: Request) -> FacilitatorClient | dict[str, FacilitatorClient]:
     facilitators = getattr(request.app.state, "facilitators", None)
     if facilitators:
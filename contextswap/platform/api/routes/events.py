@@ -0,0 +1,62 @@
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from contextswap.platform.services.event_bus import EventBus
+
+router = APIRouter(prefix="/v1/events", tags=["events"])
+
+KEEPALIVE_SECONDS = 15.0
+RETRY_MS = 3000
+
+
+async def event_stream(
+    bus: EventBus,
+    *,
+    last_event_id: int | None,
+    transaction_id: str | None = None,
+    keepalive: float = KEEPALIVE_SECONDS,
+) -> AsyncIterator[bytes]:
+    yield f"retry: {RETRY_MS}\n\n".encode("ascii")
+    async for item in bus.subscribe(last_event_id, keepalive=keepalive):
+        if item is None:
+            # 注释行保活，防止代理因空闲断开
+            yield b": keepalive\n\n"
+        elif item.type == "reset" or transaction_id is None or item.data.get("transaction_id") == transaction_id:
+            # reset 不按 transaction_id 过滤；它带 id，EventSource 重连时从新的续传点开始，不会反复收到 reset
+            yield item.encode()
+
+
+def _parse_event_id(raw: str | None) -> int | None:
+    if raw is None or not raw.strip():
+        return None
+    try:
+        value = int(raw.strip())
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail="Last-Event-ID must be an integer") from exc
+    return max(0, value)
+
+
+@router.get("/stream")
+def stream_events(
+    request: Request,
+    transaction_id: str | None = None,
+    last_event_id: str | None = None,
+    last_event_id_header: str | None = Header(default=None, alias="Last-Event-ID"),
+) -> StreamingResponse:
+    """SSE feed of transaction and session status deltas (``event: transaction`` / ``event: session``).
+
+    Reconnecting clients resume after ``Last-Event-ID`` (header, or the
+    ``last_event_id`` query for the first connect); optional
+    ``transaction_id`` limits the feed to one purchase.
+    """
+    bus = getattr(request.app.state, "event_bus", None)
+    if bus is None:
+        raise HTTPException(status_code=503, detail="event stream is disabled (EVENT_BUFFER_SIZE=0)")
+    resume = _parse_event_id(last_event_id_header if last_event_id_header is not None else last_event_id)
+    return StreamingResponse(
+        event_stream(bus, last_event_id=resume, transaction_id=transaction_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
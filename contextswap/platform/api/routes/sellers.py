@@ -1,9 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel
 
-from contextswap.platform.api.deps import get_db
+from contextswap.platform.api.deps import get_db, get_read_db
 from contextswap.platform.db import models
-from contextswap.platform.services import seller_service
+from contextswap.platform.services import catalog_cache, seller_service, stats_service
 from eth_utils import to_checksum_address
 
 router = APIRouter(prefix="/v1/sellers", tags=["sellers"])
@@ -39,23 +39,63 @@ def _seller_full(seller: models.Seller) -> dict:
     return seller_service.seller_to_full_dict(seller)
 
 
+def _catalog_response(request: Request, conn, key: tuple, build) -> Response:
+    """Serve a catalog read from the response cache, with a strong ETag and ``If-None-Match`` -> 304."""
+    state = request.app.state
+    cache = getattr(state, "catalog_cache", None)
+    if cache is not None and conn is not getattr(state, "db", None):
+        # 读副本：键带上副本代数，副本刷新后旧条目自然失效；已被替换的旧副本不写缓存
+        replica = getattr(state, "replica", None)
+        generation = replica.refreshes if replica is not None else None
+        if replica is None or conn is not replica.db:
+            cache = None
+        else:
+            key = (*key, generation)
+    entry = cache.get_or_build(key, build) if cache is not None else catalog_cache.render(build())
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if catalog_cache.etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+def _catalog_changed(request: Request) -> None:
+    cache = getattr(request.app.state, "catalog_cache", None)
+    if cache is not None:
+        cache.bump()
+
+
 # ---------- List & get（按 db 全字段返回） ----------
 
 
 @router.get("")
 def list_sellers(
-    conn=Depends(get_db),
+    request: Request,
+    conn=Depends(get_read_db),
     limit: int = 100,
     offset: int = 0,
     status: str | None = None,
-) -> dict:
-    """列出卖家，支持分页与按 status 筛选。返回与 db 表一致的全字段。"""
+    cursor: str | None = None,
+) -> Response:
+    """列出卖家，支持分页与按 status 筛选。返回与 db 表一致的全字段。
+
+    传入上一页的 ``next_cursor`` 作为 ``cursor`` 做 keyset 分页（忽略 offset）；最后一页 ``next_cursor`` 为 null。
+    """
     if limit < 1 or limit > 200:
         limit = 100
     if offset < 0:
         offset = 0
-    items = seller_service.list_sellers(conn, limit=limit, offset=offset, status=status)
-    return {"items": [_seller_full(s) for s in items]}
+    if cursor:
+        offset = 0
+
+    def build() -> dict:
+        try:
+            items = seller_service.list_sellers(conn, limit=limit, offset=offset, status=status, cursor=cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        next_cursor = models.seller_cursor(items[-1]) if len(items) == limit else None
+        return {"items": [_seller_full(s) for s in items], "next_cursor": next_cursor}
+
+    return _catalog_response(request, conn, ("list", limit, offset, status or None, cursor or None), build)
 
 
 @router.get("/by-address/{evm_address}")
@@ -72,29 +112,82 @@ def get_seller_by_address(evm_address: str, conn=Depends(get_db)) -> dict:
 
 
 @router.get("/search")
-def search_sellers(keyword: str, conn=Depends(get_db)) -> dict:
-    """按关键词搜索（仅 active）。返回与 db 表一致的全字段。"""
+def search_sellers(
+    keyword: str,
+    request: Request,
+    conn=Depends(get_read_db),
+    limit: int = 100,
+    offset: int = 0,
+) -> Response:
+    """按关键词搜索（仅 active，每个词都须作为子串出现，支持中文）。返回与 db 表一致的全字段。
+
+    词长 ≥ 3 时走 FTS5 trigram 索引并按 BM25 排序；任一词不足 3 个字符（如两字中文）时退回全表 LIKE 扫描，按更新时间排序。
+    """
+    if limit < 1 or limit > 200:
+        limit = 100
+    if offset < 0:
+        offset = 0
+
+    def build() -> dict:
+        try:
+            sellers = seller_service.search_sellers(conn, keyword=keyword, limit=limit, offset=offset)
+        except Exception as exc:  # noqa: BLE001
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+        return {"items": [_seller_full(s) for s in sellers]}
+
+    # 搜索不区分大小写，多余空白不影响分词：归一化后共享同一缓存条目
+    normalized = " ".join(keyword.lower().split())
+    return _catalog_response(request, conn, ("search", normalized, limit, offset), build)
+
+
+@router.get("/by-keywords")
+def find_sellers_by_keywords(
+    conn=Depends(get_read_db),
+    all_keywords: str | None = Query(None, alias="all"),
+    any_keywords: str | None = Query(None, alias="any"),
+    limit: int = 100,
+    offset: int = 0,
+) -> dict:
+    """按关键词精确匹配（仅 active）：``all`` 中的词必须全部命中，``any`` 中至少命中一个，逗号分隔。"""
+    if limit < 1 or limit > 200:
+        limit = 100
+    if offset < 0:
+        offset = 0
     try:
-        sellers = seller_service.search_sellers(conn, keyword=keyword)
-    except Exception as exc:  # noqa: BLE001
+        sellers = seller_service.find_sellers_by_keywords(
+            conn, all_keywords=all_keywords, any_keywords=any_keywords, limit=limit, offset=offset
+        )
+    except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     return {"items": [_seller_full(s) for s in sellers]}
 
 
 @router.get("/{seller_id}")
-def get_seller(seller_id: str, conn=Depends(get_db)) -> dict:
+def get_seller(seller_id: str, request: Request, conn=Depends(get_db)) -> Response:
     """按 seller_id 查询卖家。返回与 db 表一致的全字段。"""
-    seller = models.get_seller_by_id(conn, seller_id=seller_id)
-    if seller is None:
+
+    def build() -> dict:
+        seller = models.get_seller_by_id(conn, seller_id=seller_id)
+        if seller is None:
+            raise HTTPException(status_code=404, detail="seller not found")
+        return _seller_full(seller)
+
+    return _catalog_response(request, conn, ("seller", seller_id), build)
+
+
+@router.get("/{seller_id}/stats")
+def get_seller_stats(seller_id: str, conn=Depends(get_db)) -> dict:
+    """卖家交易统计（按状态的交易数与交易量），由触发器增量维护。"""
+    if models.get_seller_by_id(conn, seller_id=seller_id) is None:
         raise HTTPException(status_code=404, detail="seller not found")
-    return _seller_full(seller)
+    return stats_service.seller_stats(conn, seller_id=seller_id)
 
 
 # ---------- Create / update / unregister ----------
 
 
 @router.post("/register")
-def register_seller(payload: SellerRegisterRequest, conn=Depends(get_db)) -> dict:
+def register_seller(payload: SellerRegisterRequest, request: Request, conn=Depends(get_db)) -> dict:
     try:
         seller = seller_service.register_seller(
             conn,
@@ -108,11 +201,12 @@ def register_seller(payload: SellerRegisterRequest, conn=Depends(get_db)) -> dic
         )
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    _catalog_changed(request)
     return _seller_full(seller)
 
 
 @router.patch("/{seller_id}")
-def update_seller(seller_id: str, payload: SellerUpdateRequest, conn=Depends(get_db)) -> dict:
+def update_seller(seller_id: str, payload: SellerUpdateRequest, request: Request, conn=Depends(get_db)) -> dict:
     """部分更新卖家。仅提交需修改的字段。禁止修改 id、seller_id、created_at。"""
     fields = payload.model_dump(exclude_unset=True)
     if not fields:
@@ -126,11 +220,12 @@ def update_seller(seller_id: str, payload: SellerUpdateRequest, conn=Depends(get
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    _catalog_changed(request)
     return _seller_full(seller)
 
 
 @router.post("/unregister")
-def unregister_seller(payload: SellerUnregisterRequest, conn=Depends(get_db)) -> dict:
+def unregister_seller(payload: SellerUnregisterRequest, request: Request, conn=Depends(get_db)) -> dict:
     try:
         seller = seller_service.unregister_seller(
             conn,
@@ -141,4 +236,5 @@ def unregister_seller(payload: SellerUnregisterRequest, conn=Depends(get_db)) ->
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=400, detail=str(exc)) from exc
+    _catalog_changed(request)
     return _seller_full(seller)
@@ -4,6 +4,8 @@ from fastapi import APIRouter, Depends, Header, HTTPException, Request
 from pydantic import BaseModel
 
 from contextswap.platform.api.deps import get_tg_manager
+from contextswap.platform.services import transaction_service
+from contextswap.platform.services.inprocess_tg_manager_client import InProcessTgManagerClient
 from contextswap.platform.services.session_client import SessionClientError, SessionClientNotFound
 
 router = APIRouter(prefix="/v1/session", tags=["session"])
@@ -59,10 +61,10 @@ def get_session(transaction_id: str, tg_manager=Depends(get_tg_manager)) -> dict
 
 
 @router.post("/end", dependencies=[Depends(require_session_auth)])
-def end_session(payload: SessionEndRequest, tg_manager=Depends(get_tg_manager)) -> dict:
+def end_session(payload: SessionEndRequest, request: Request, tg_manager=Depends(get_tg_manager)) -> dict:
     session_client = _get_session_client_or_503(tg_manager)
     try:
-        return session_client.end_session(
+        session = session_client.end_session(
             transaction_id=payload.transaction_id,
             reason=payload.reason,
         )
@@ -72,3 +74,7 @@ def end_session(payload: SessionEndRequest, tg_manager=Depends(get_tg_manager))
         raise HTTPException(status_code=400, detail=str(exc)) from exc
     except SessionClientError as exc:
         raise HTTPException(status_code=502, detail=str(exc)) from exc
+    if not isinstance(session_client, InProcessTgManagerClient):
+        # 进程内 tg_manager 通过会话监听回调推送事件；远端 tg_manager 只能在这里补发
+        transaction_service.publish_session(getattr(request.app.state, "event_bus", None), session)
+    return session
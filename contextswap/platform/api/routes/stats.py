@@ -0,0 +1,14 @@
+from fastapi import APIRouter, Depends
+
+from contextswap.platform.api.deps import get_read_db
+from contextswap.platform.services import stats_service
+
+router = APIRouter(prefix="/v1/stats", tags=["stats"])
+
+
+@router.get("")
+def get_market_stats(conn=Depends(get_read_db), days: int = stats_service.DEFAULT_STATS_DAYS) -> dict:
+    """市场汇总统计（卖家数、交易数/交易量按状态、最近 ``days`` 天的每日交易量），由触发器增量维护。"""
+    if days < 1 or days > 366:
+        days = stats_service.DEFAULT_STATS_DAYS
+    return stats_service.market_stats(conn, days=days)
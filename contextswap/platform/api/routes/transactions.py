@@ -1,12 +1,16 @@
+import functools
+
+import anyio
 from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from contextswap.platform.api.deps import get_db, get_facilitator, get_tg_manager
+from contextswap.platform.api.deps import get_db, get_facilitator, get_read_db, get_tg_manager
 from contextswap.platform.config import DEFAULT_DEMO_MARKET_SLUG
 from contextswap.platform.db import models
 from eth_utils import to_checksum_address
 
-from contextswap.platform.services import transaction_service
+from contextswap.platform.services import transaction_export, transaction_service
 from contextswap.x402 import b64decode_json, b64encode_json
 
 router = APIRouter(prefix="/v1/transactions", tags=["transactions"])
@@ -45,23 +49,70 @@ def _get_seller(conn, *, seller_id: str | None, seller_address: str | None) -> m
 
 @router.get("")
 def list_transactions(
-    conn=Depends(get_db),
+    conn=Depends(get_read_db),
     limit: int = 50,
     offset: int = 0,
     status: str | None = None,
     seller_id: str | None = None,
+    cursor: str | None = None,
 ) -> dict:
-    """List transactions, newest first. Optional query: limit, offset, status, seller_id."""
-    items = models.list_transactions(
-        conn, limit=limit, offset=offset, status=status, seller_id=seller_id
-    )
+    """List transactions, newest first. Optional query: limit, offset, status, seller_id, cursor.
+
+    Pass the previous page's ``next_cursor`` as ``cursor`` for keyset paging
+    (offset is then ignored); ``next_cursor`` is null on the last page.
+    """
+    if limit < 1 or limit > 200:
+        limit = 50
+    try:
+        items = models.list_transactions(
+            conn, limit=limit, offset=offset, status=status, seller_id=seller_id, cursor=cursor
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     return {
         "items": [transaction_service.transaction_to_dict(t) for t in items],
+        "next_cursor": models.transaction_cursor(items[-1]) if len(items) == limit else None,
     }
 
 
+@router.get("/export")
+def export_transactions(
+    request: Request,
+    format: str = "ndjson",
+    since: str | None = None,
+    until: str | None = None,
+    status: str | None = None,
+) -> StreamingResponse:
+    """Stream every matching transaction, oldest first, as NDJSON or CSV.
+
+    ``since`` is inclusive and ``until`` exclusive (ISO 8601, UTC when no
+    offset is given). Rows use the same fields as ``GET /v1/transactions``.
+    """
+    fmt = format.strip().lower()
+    if fmt not in transaction_export.MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be one of: ndjson, csv")
+    try:
+        since_at = transaction_export.parse_timestamp(since)
+        until_at = transaction_export.parse_timestamp(until)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    body = transaction_export.iter_export(
+        lambda: get_read_db(request), fmt=fmt, since=since_at, until=until_at, status=status
+    )
+    return StreamingResponse(
+        body,
+        media_type=transaction_export.MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="transactions.{fmt}"'},
+    )
+
+
+async def _in_thread(fn, *args, **kwargs):
+    # 数据库与签名解码是短时阻塞操作，放进 worker thread，事件循环只等待 I/O
+    return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs))
+
+
 @router.post("/create")
-def create_transaction(
+async def create_transaction(
     payload: TransactionCreateRequest,
     request: Request,
     response: Response,
@@ -78,12 +129,15 @@ def create_transaction(
     default_market_slug = DEFAULT_DEMO_MARKET_SLUG
     default_question_dir = "~/.openclaw/question"
     default_wait_seconds = 120
+    settlement_mode = "sync"
+    events = getattr(app_state, "event_bus", None)
     if settings is not None:
         default_market_slug = getattr(settings, "delegation_market_slug", default_market_slug)
         default_question_dir = getattr(settings, "delegation_question_dir", default_question_dir)
         default_wait_seconds = getattr(settings, "delegation_wait_seconds", default_wait_seconds)
+        settlement_mode = getattr(settings, "settlement_mode", settlement_mode)
 
-    seller = _get_seller(conn, seller_id=payload.seller_id, seller_address=payload.seller_address)
+    seller = await _in_thread(_get_seller, conn, seller_id=payload.seller_id, seller_address=payload.seller_address)
 
     payment_network = (payload.payment_network or "").strip().lower()
     if not payment_network:
@@ -125,13 +179,15 @@ def create_transaction(
         return {"error": f"invalid payment payload: {exc}"}
 
     try:
-        computed_tx_hash = transaction_service.compute_payment_id(payment_payload, network=payment_network)
+        computed_tx_hash = await _in_thread(
+            transaction_service.compute_payment_id, payment_payload, network=payment_network
+        )
     except Exception as exc:  # noqa: BLE001
         response.status_code = 402
         response.headers["PAYMENT-REQUIRED"] = requirements_b64
         return {"error": f"invalid payment payload: {exc}"}
 
-    existing = models.get_transaction_by_id(conn, transaction_id=computed_tx_hash)
+    existing = await _in_thread(models.get_transaction_by_id, conn, transaction_id=computed_tx_hash)
     if existing is not None:
         response.headers["PAYMENT-RESPONSE"] = transaction_service.build_payment_response(
             existing.tx_hash or computed_tx_hash,
@@ -139,18 +195,6 @@ def create_transaction(
         )
         return transaction_service.transaction_to_dict(existing)
 
-    try:
-        tx_hash = transaction_service.verify_and_settle_payment(
-            facilitator_client,
-            payment_payload,
-            requirements,
-        )
-    except Exception as exc:  # noqa: BLE001
-        response.status_code = 402
-        response.headers["PAYMENT-REQUIRED"] = requirements_b64
-        return {"error": str(exc)}
-
-    transaction_id = tx_hash
     resolved_wait_seconds = (
         payload.wait_seconds
         if isinstance(payload.wait_seconds, int) and payload.wait_seconds > 0
@@ -167,7 +211,62 @@ def create_transaction(
     if payload.transaction_id:
         metadata["client_transaction_id"] = payload.transaction_id
 
-    transaction = transaction_service.create_transaction(
+    if settlement_mode == "async":
+        # 异步结算：同步验证后先落库为 settling，由后台 worker 广播交易并创建会话
+        try:
+            await transaction_service.averify_payment(facilitator_client, payment_payload, requirements)
+        except Exception as exc:  # noqa: BLE001
+            response.status_code = 402
+            response.headers["PAYMENT-REQUIRED"] = requirements_b64
+            return {"error": str(exc)}
+
+        def _store_settling() -> models.Transaction:
+            transaction = transaction_service.create_transaction(
+                conn,
+                transaction_id=computed_tx_hash,
+                seller=seller,
+                buyer_address=payload.buyer_address,
+                payment_payload=payment_payload,
+                requirements=requirements,
+                tx_hash=None,
+                price_wei=price_amount,
+                metadata=metadata,
+                status="settling",
+            )
+            transaction_service.enqueue_settlement(
+                conn,
+                transaction_id=computed_tx_hash,
+                payment_network=payment_network,
+            )
+            return transaction
+
+        transaction = await _in_thread(_store_settling)
+        transaction_service.publish_transaction(events, transaction)
+        worker = getattr(app_state, "settlement_worker", None)
+        if worker is not None:
+            worker.notify()
+
+        status_url = f"/v1/transactions/{computed_tx_hash}"
+        response.status_code = 202
+        response.headers["Location"] = status_url
+        result = transaction_service.transaction_to_dict(transaction)
+        result["status_url"] = status_url
+        return result
+
+    try:
+        tx_hash = await transaction_service.averify_and_settle_payment(
+            facilitator_client,
+            payment_payload,
+            requirements,
+        )
+    except Exception as exc:  # noqa: BLE001
+        response.status_code = 402
+        response.headers["PAYMENT-REQUIRED"] = requirements_b64
+        return {"error": str(exc)}
+
+    transaction_id = tx_hash
+    transaction = await _in_thread(
+        transaction_service.create_transaction,
         conn,
         transaction_id=transaction_id,
         seller=seller,
@@ -178,36 +277,20 @@ def create_transaction(
         price_wei=price_amount,
         metadata=metadata,
     )
+    transaction_service.publish_transaction(events, transaction)
 
     session_info = None
     if tg_manager is not None:
         try:
-            session_info = tg_manager.create_session(
-                transaction_id=tx_hash,
-                buyer_bot_username=payload.buyer_bot_username,
-                seller_bot_username=payload.seller_bot_username,
-                initial_prompt=payload.initial_prompt,
-                market_slug=metadata["market_slug"],
-                question_dir=metadata["question_dir"],
-                wait_seconds=int(metadata["wait_seconds"]),
-            )
-            session_chat_id = session_info.get("chat_id")
-            session_thread_id = session_info.get("message_thread_id")
-            if session_chat_id is None or session_thread_id is None:
-                raise RuntimeError("tg_manager response missing chat_id or message_thread_id")
-            transaction = transaction_service.attach_session(
+            transaction, session_info = await transaction_service.aopen_session(
                 conn,
+                tg_manager,
                 transaction_id=transaction_id,
-                chat_id=str(session_chat_id),
-                message_thread_id=int(session_thread_id),
+                metadata=metadata,
             )
         except Exception as exc:  # noqa: BLE001
-            transaction = transaction_service.record_tg_manager_error(
-                conn,
-                transaction_id=transaction_id,
-                error_reason=str(exc),
-            )
             raise HTTPException(status_code=502, detail=str(exc)) from exc
+        transaction_service.publish_transaction(events, transaction)
 
     response.headers["PAYMENT-RESPONSE"] = transaction_service.build_payment_response(tx_hash, network=payment_network)
 
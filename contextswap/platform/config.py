@@ -32,6 +32,19 @@ def _read_int_env(key: str, default: int, *, min_value: int) -> int:
     return value
 
 
+def _read_float_env(key: str, default: float, *, min_value: float) -> float:
+    raw = os.getenv(key, "").strip()
+    if raw == "":
+        return default
+    try:
+        value = float(raw)
+    except ValueError as exc:
+        raise RuntimeError(f"{key} must be a number, got: {raw!r}") from exc
+    if value < min_value:
+        raise RuntimeError(f"{key} must be >= {min_value}, got: {value}")
+    return value
+
+
 @dataclass(frozen=True)
 class Settings:
     sqlite_path: str
@@ -53,6 +66,34 @@ class Settings:
     mock_bots_enabled: bool
     mock_bots_json: str | None
     mock_seller_auto_end: bool
+    facilitator_pool_size: int = 20
+    facilitator_connect_timeout: float = 3.0
+    facilitator_verify_timeout: float = 10.0
+    facilitator_settle_timeout: float = 10.0
+    facilitator_warm_connections: int = 2
+    settlement_mode: str = "sync"
+    settlement_poll_interval: float = 0.5
+    settlement_max_attempts: int = 5
+    tron_rate_limit: float = 10.0
+    tron_max_retries: int = 3
+    confirmation_tracker_enabled: bool = False
+    confirmation_poll_interval: float = 15.0
+    confirmation_timeout: float = 900.0
+    conflux_rpc_batch_window_ms: int = 0
+    conflux_rpc_max_batch: int = 50
+    sqlite_read_pool_size: int = 4
+    sqlite_group_commit: bool = False
+    sqlite_group_commit_window_ms: int = 2
+    sqlite_group_commit_max: int = 64
+    archive_sqlite_path: str | None = None
+    archive_after_days: float = 0.0
+    archive_interval: float = 3600.0
+    archive_batch_size: int = 500
+    read_replica_path: str | None = None
+    read_replica_interval: float = 0.0
+    read_replica_pages: int = 1024
+    catalog_cache_size: int = 1024
+    event_buffer_size: int = 1024
 
 
 def load_settings(env_path: str | None = None) -> Settings:
@@ -97,6 +138,38 @@ def load_settings(env_path: str | None = None) -> Settings:
     mock_bots_enabled = _read_bool_env("MOCK_BOTS_ENABLED", False)
     mock_bots_json = os.getenv("MOCK_BOTS_JSON", "").strip() or None
     mock_seller_auto_end = _read_bool_env("MOCK_SELLER_AUTO_END", True)
+    facilitator_pool_size = _read_int_env("FACILITATOR_POOL_SIZE", 20, min_value=1)
+    facilitator_connect_timeout = _read_float_env("FACILITATOR_CONNECT_TIMEOUT", 3.0, min_value=0.1)
+    facilitator_verify_timeout = _read_float_env("FACILITATOR_VERIFY_TIMEOUT", 10.0, min_value=0.1)
+    facilitator_settle_timeout = _read_float_env("FACILITATOR_SETTLE_TIMEOUT", 10.0, min_value=0.1)
+    facilitator_warm_connections = _read_int_env("FACILITATOR_WARM_CONNECTIONS", 2, min_value=0)
+    settlement_mode = os.getenv("SETTLEMENT_MODE", "sync").strip().lower() or "sync"
+    settlement_poll_interval = _read_float_env("SETTLEMENT_POLL_INTERVAL", 0.5, min_value=0.05)
+    settlement_max_attempts = _read_int_env("SETTLEMENT_MAX_ATTEMPTS", 5, min_value=1)
+    tron_rate_limit = _read_float_env("TRON_GRID_RATE_LIMIT", 10.0, min_value=0.1)
+    tron_max_retries = _read_int_env("TRON_GRID_MAX_RETRIES", 3, min_value=0)
+    confirmation_tracker_enabled = _read_bool_env("CONFIRMATION_TRACKER_ENABLED", False)
+    confirmation_poll_interval = _read_float_env("CONFIRMATION_POLL_INTERVAL", 15.0, min_value=0.5)
+    confirmation_timeout = _read_float_env("CONFIRMATION_TIMEOUT", 900.0, min_value=1.0)
+    conflux_rpc_batch_window_ms = _read_int_env("CONFLUX_RPC_BATCH_WINDOW_MS", 0, min_value=0)
+    conflux_rpc_max_batch = _read_int_env("CONFLUX_RPC_MAX_BATCH", 50, min_value=1)
+    sqlite_read_pool_size = _read_int_env("SQLITE_READ_POOL_SIZE", 4, min_value=1)
+    sqlite_group_commit = _read_bool_env("SQLITE_GROUP_COMMIT", False)
+    sqlite_group_commit_window_ms = _read_int_env("SQLITE_GROUP_COMMIT_WINDOW_MS", 2, min_value=0)
+    sqlite_group_commit_max = _read_int_env("SQLITE_GROUP_COMMIT_MAX", 64, min_value=1)
+    archive_sqlite_path = os.getenv("ARCHIVE_SQLITE_PATH", "").strip() or None
+    if archive_sqlite_path is None and sqlite_path != ":memory:":
+        archive_sqlite_path = f"{os.path.splitext(sqlite_path)[0]}.archive.sqlite3"
+    archive_after_days = _read_float_env("ARCHIVE_AFTER_DAYS", 0.0, min_value=0.0)
+    archive_interval = _read_float_env("ARCHIVE_INTERVAL", 3600.0, min_value=1.0)
+    archive_batch_size = _read_int_env("ARCHIVE_BATCH_SIZE", 500, min_value=1)
+    read_replica_path = os.getenv("READ_REPLICA_PATH", "").strip() or None
+    if read_replica_path is None and sqlite_path != ":memory:":
+        read_replica_path = f"{os.path.splitext(sqlite_path)[0]}.replica.sqlite3"
+    read_replica_interval = _read_float_env("READ_REPLICA_INTERVAL", 0.0, min_value=0.0)
+    read_replica_pages = _read_int_env("READ_REPLICA_PAGES", 1024, min_value=1)
+    catalog_cache_size = _read_int_env("CATALOG_CACHE_SIZE", 1024, min_value=0)
+    event_buffer_size = _read_int_env("EVENT_BUFFER_SIZE", 1024, min_value=0)
 
     if not facilitator_base_url and not rpc_url and not tron_rpc_url:
         raise RuntimeError(
@@ -104,6 +177,8 @@ def load_settings(env_path: str | None = None) -> Settings:
         )
     if tg_manager_mode not in {"http", "inprocess"}:
         raise RuntimeError("TG_MANAGER_MODE must be one of: http, inprocess")
+    if settlement_mode not in {"sync", "async"}:
+        raise RuntimeError("SETTLEMENT_MODE must be one of: sync, async")
     if tg_manager_mode == "http" and tg_manager_base_url and not tg_manager_auth_token:
         raise RuntimeError("Missing TG_MANAGER_AUTH_TOKEN while TG_MANAGER_BASE_URL is set")
     if tg_manager_mode == "inprocess":
@@ -132,4 +207,32 @@ def load_settings(env_path: str | None = None) -> Settings:
         mock_bots_enabled=mock_bots_enabled,
         mock_bots_json=mock_bots_json,
         mock_seller_auto_end=mock_seller_auto_end,
+        facilitator_pool_size=facilitator_pool_size,
+        facilitator_connect_timeout=facilitator_connect_timeout,
+        facilitator_verify_timeout=facilitator_verify_timeout,
+        facilitator_settle_timeout=facilitator_settle_timeout,
+        facilitator_warm_connections=facilitator_warm_connections,
+        settlement_mode=settlement_mode,
+        settlement_poll_interval=settlement_poll_interval,
+        settlement_max_attempts=settlement_max_attempts,
+        tron_rate_limit=tron_rate_limit,
+        tron_max_retries=tron_max_retries,
+        confirmation_tracker_enabled=confirmation_tracker_enabled,
+        confirmation_poll_interval=confirmation_poll_interval,
+        confirmation_timeout=confirmation_timeout,
+        conflux_rpc_batch_window_ms=conflux_rpc_batch_window_ms,
+        conflux_rpc_max_batch=conflux_rpc_max_batch,
+        sqlite_read_pool_size=sqlite_read_pool_size,
+        sqlite_group_commit=sqlite_group_commit,
+        sqlite_group_commit_window_ms=sqlite_group_commit_window_ms,
+        sqlite_group_commit_max=sqlite_group_commit_max,
+        archive_sqlite_path=archive_sqlite_path,
+        archive_after_days=archive_after_days,
+        archive_interval=archive_interval,
+        archive_batch_size=archive_batch_size,
+        read_replica_path=read_replica_path,
+        read_replica_interval=read_replica_interval,
+        read_replica_pages=read_replica_pages,
+        catalog_cache_size=catalog_cache_size,
+        event_buffer_size=event_buffer_size,
     )
@@ -0,0 +1,53 @@
+"""Upgrade a platform database to the compact transactions layout and report the space reclaimed.
+
+Usage: python -m contextswap.platform.db.compact <sqlite_path> [--vacuum] [--incremental-vacuum]
+
+The server performs the same migration on startup; run this first to see
+the numbers, and pass ``--vacuum`` to also shrink the file on disk.
+``--incremental-vacuum`` switches a database created before incremental
+auto-vacuum was the default, so the archiver can return freed pages to the
+filesystem. Both rewrite the whole file; stop the server first.
+"""
+import argparse
+import os
+
+from contextswap.platform.db.engine import connect_sqlite, enable_incremental_vacuum, init_db
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("sqlite_path")
+    parser.add_argument("--vacuum", action="store_true", help="run VACUUM afterwards to return freed pages to the OS")
+    parser.add_argument(
+        "--incremental-vacuum",
+        action="store_true",
+        help="switch the database to auto_vacuum = INCREMENTAL (one full VACUUM)",
+    )
+    args = parser.parse_args()
+    if not os.path.exists(args.sqlite_path):
+        raise SystemExit(f"not found: {args.sqlite_path}")
+
+    conn = connect_sqlite(args.sqlite_path)
+    try:
+        size_before = os.path.getsize(args.sqlite_path)
+        report = init_db(conn)
+        print(f"transactions rewritten: {report.rows}")
+        print(f"distinct requirements:  {report.requirements}")
+        print(f"bytes reclaimed:        {report.bytes_reclaimed}")
+        vacuumed = False
+        if args.incremental_vacuum:
+            vacuumed = enable_incremental_vacuum(conn)
+            print(f"incremental vacuum:     {'enabled' if vacuumed else 'already enabled'}")
+        if args.vacuum and not vacuumed:
+            conn.execute("VACUUM")
+            vacuumed = True
+        if vacuumed:
+            # WAL 模式下 VACUUM 写进 WAL，checkpoint 之后主文件才会变小
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            print(f"file size:              {size_before} -> {os.path.getsize(args.sqlite_path)}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
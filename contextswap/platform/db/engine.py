@@ -1,13 +1,43 @@
+import functools
+import hashlib
 import os
+import re
 import sqlite3
+import urllib.parse
+import zlib
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
+from contextswap.platform.db.migrations import Migration, migrate
+from contextswap.platform.db.pool import (
+    DEFAULT_GROUP_COMMIT_MAX,
+    DEFAULT_GROUP_COMMIT_WINDOW,
+    DEFAULT_READ_POOL_SIZE,
+    SqliteConnectionManager,
+)
+
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
 
 
-def connect_sqlite(sqlite_path: str) -> sqlite3.Connection:
+# INSERT/UPDATE ... RETURNING 需要 SQLite 3.35+；更旧的库回退为写后再 SELECT 一次
+SQLITE_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def split_keywords(text: str | None) -> list[str]:
+    """Keyword tokens of a ``sellers.keywords`` value (comma/space separated, lowercased, deduplicated)."""
+    seen: dict[str, None] = {}
+    for token in re.split(r"[,\s]+", (text or "").lower()):
+        if token:
+            seen.setdefault(token, None)
+    return list(seen)
+
+
+ARCHIVE_SCHEMA = "archive"
+
+
+def connect_sqlite(sqlite_path: str, *, archive_path: str | None = None) -> sqlite3.Connection:
     if sqlite_path != ":memory:":
         parent = os.path.dirname(os.path.abspath(sqlite_path))
         if parent and not os.path.exists(parent):
@@ -17,73 +47,557 @@ def connect_sqlite(sqlite_path: str) -> sqlite3.Connection:
     conn.row_factory = sqlite3.Row
 
     conn.execute("PRAGMA foreign_keys = ON;")
+    # 只对还没建表的新库生效，且必须在切 WAL（会写出文件头）之前；已有的库用 compact --incremental-vacuum 切换
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL;")
     conn.execute("PRAGMA journal_mode = WAL;")
     conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute("PRAGMA busy_timeout = 5000;")
+    if archive_path:
+        conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (archive_path,))
 
     return conn
 
 
-def init_db(conn: sqlite3.Connection) -> None:
-    try:
-        conn.executescript(
-            """
-            CREATE TABLE IF NOT EXISTS sellers (
-              id INTEGER PRIMARY KEY AUTOINCREMENT,
-              seller_id TEXT NOT NULL UNIQUE,
-              evm_address TEXT NOT NULL,
-              price_wei INTEGER NOT NULL,
-              price_conflux_wei INTEGER,
-              price_tron_sun INTEGER,
-              description TEXT NOT NULL,
-              keywords TEXT NOT NULL,
-              status TEXT NOT NULL,
-              created_at TEXT NOT NULL,
-              updated_at TEXT NOT NULL
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_sellers_status ON sellers(status);
-            CREATE INDEX IF NOT EXISTS idx_sellers_keywords ON sellers(keywords);
-
-            CREATE TABLE IF NOT EXISTS transactions (
-              id INTEGER PRIMARY KEY AUTOINCREMENT,
-              transaction_id TEXT NOT NULL UNIQUE,
-              seller_id TEXT NOT NULL,
-              buyer_address TEXT NOT NULL,
-              price_wei INTEGER NOT NULL,
-              status TEXT NOT NULL,
-              payment_payload_json TEXT NOT NULL,
-              requirements_json TEXT NOT NULL,
-              tx_hash TEXT,
-              chat_id TEXT,
-              message_thread_id INTEGER,
-              metadata_json TEXT NOT NULL,
-              error_reason TEXT,
-              created_at TEXT NOT NULL,
-              updated_at TEXT NOT NULL,
-              FOREIGN KEY (seller_id) REFERENCES sellers(seller_id)
-            );
-
-            CREATE INDEX IF NOT EXISTS idx_transactions_status ON transactions(status);
-            CREATE INDEX IF NOT EXISTS idx_transactions_seller_id ON transactions(seller_id);
-            """
-        )
+def connect_replica(replica_path: str) -> sqlite3.Connection:
+    """Open a read replica snapshot read-only.
 
-        _ensure_column(conn, "sellers", "price_conflux_wei", "INTEGER")
-        _ensure_column(conn, "sellers", "price_tron_sun", "INTEGER")
-        conn.execute(
-            """
-            UPDATE sellers
-            SET price_conflux_wei = price_wei
-            WHERE price_conflux_wei IS NULL
-            """
+    Replica files are written once and then swapped in with ``os.replace``,
+    never modified in place, so they are opened ``immutable`` (no locks, no
+    WAL lookups).
+    """
+    uri = f"file:{urllib.parse.quote(os.path.abspath(replica_path))}?mode=ro&immutable=1"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def open_database(
+    sqlite_path: str,
+    *,
+    read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+    group_commit: bool = False,
+    group_commit_window: float = DEFAULT_GROUP_COMMIT_WINDOW,
+    group_commit_max: int = DEFAULT_GROUP_COMMIT_MAX,
+    archive_path: str | None = None,
+) -> SqliteConnectionManager:
+    """Open the platform database as a reader pool plus a single writer connection.
+
+    ``archive_path`` attaches the transaction archive database to every
+    connection as schema ``archive``.
+    """
+    return SqliteConnectionManager(
+        sqlite_path,
+        functools.partial(connect_sqlite, archive_path=archive_path),
+        read_pool_size=read_pool_size,
+        group_commit=group_commit,
+        group_commit_window=group_commit_window,
+        group_commit_max=group_commit_max,
+    )
+
+
+def _transactions_ddl(name: str, *, if_not_exists: bool = False) -> str:
+    # requirements_json 按内容哈希存入 requirements 表去重；签名载荷 zlib 压缩存储
+    return f"""
+    CREATE TABLE {"IF NOT EXISTS " if if_not_exists else ""}{name} (
+      id INTEGER PRIMARY KEY AUTOINCREMENT,
+      transaction_id TEXT NOT NULL UNIQUE,
+      seller_id TEXT NOT NULL,
+      buyer_address TEXT NOT NULL,
+      price_wei INTEGER NOT NULL,
+      status TEXT NOT NULL,
+      payment_payload_z BLOB NOT NULL,
+      requirements_hash TEXT NOT NULL REFERENCES requirements(hash),
+      tx_hash TEXT,
+      chat_id TEXT,
+      message_thread_id INTEGER,
+      metadata_json TEXT NOT NULL,
+      error_reason TEXT,
+      created_at TEXT NOT NULL,
+      updated_at TEXT NOT NULL,
+      confirmation_status TEXT,
+      confirmation_block INTEGER,
+      FOREIGN KEY (seller_id) REFERENCES sellers(seller_id)
+    )
+    """
+
+
+_TRANSACTION_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_transactions_status_created ON transactions(status, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_seller_created ON transactions(seller_id, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_created ON transactions(created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_transactions_confirmation ON transactions(confirmation_status, tx_hash)",
+)
+
+
+def requirements_hash(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def compress_text(text: str, level: int = 6) -> bytes:
+    return zlib.compress(text.encode("utf-8"), level)
+
+
+def decompress_text(blob: bytes) -> str:
+    return zlib.decompress(blob).decode("utf-8")
+
+
+def _migrate_baseline(conn: sqlite3.Connection) -> None:
+    """Core tables and indexes; also upgrades databases created before versioning."""
+    statements = (
+        """
+        CREATE TABLE IF NOT EXISTS sellers (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          seller_id TEXT NOT NULL UNIQUE,
+          evm_address TEXT NOT NULL,
+          price_wei INTEGER NOT NULL,
+          price_conflux_wei INTEGER,
+          price_tron_sun INTEGER,
+          description TEXT NOT NULL,
+          keywords TEXT NOT NULL,
+          status TEXT NOT NULL,
+          created_at TEXT NOT NULL,
+          updated_at TEXT NOT NULL
         )
-        conn.commit()
+        """,
+        "DROP INDEX IF EXISTS idx_sellers_status",
+        "CREATE INDEX IF NOT EXISTS idx_sellers_status_updated ON sellers(status, updated_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_sellers_updated ON sellers(updated_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_sellers_keywords ON sellers(keywords)",
+        """
+        CREATE TABLE IF NOT EXISTS requirements (
+          hash TEXT PRIMARY KEY,
+          body TEXT NOT NULL
+        ) WITHOUT ROWID
+        """,
+        _transactions_ddl("transactions", if_not_exists=True),
+        # 复合索引（见 _TRANSACTION_INDEXES）：按 status / seller_id 过滤后直接按 (created_at, id) 有序扫描，支持 keyset 分页
+        "DROP INDEX IF EXISTS idx_transactions_status",
+        "DROP INDEX IF EXISTS idx_transactions_seller_id",
+        """
+        CREATE TABLE IF NOT EXISTS settlement_jobs (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          transaction_id TEXT NOT NULL UNIQUE,
+          payment_network TEXT NOT NULL,
+          status TEXT NOT NULL,
+          attempts INTEGER NOT NULL DEFAULT 0,
+          next_attempt_at TEXT NOT NULL,
+          last_error TEXT,
+          created_at TEXT NOT NULL,
+          updated_at TEXT NOT NULL,
+          FOREIGN KEY (transaction_id) REFERENCES transactions(transaction_id)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_settlement_jobs_due ON settlement_jobs(status, next_attempt_at)",
+    )
+    for sql in statements:
+        conn.execute(sql)
+    _ensure_column(conn, "sellers", "price_conflux_wei", "INTEGER")
+    _ensure_column(conn, "sellers", "price_tron_sun", "INTEGER")
+    _ensure_column(conn, "transactions", "confirmation_status", "TEXT")
+    _ensure_column(conn, "transactions", "confirmation_block", "INTEGER")
+    for ddl in _TRANSACTION_INDEXES:
+        conn.execute(ddl)
+    conn.execute(
+        """
+        UPDATE sellers
+        SET price_conflux_wei = price_wei
+        WHERE price_conflux_wei IS NULL
+        """
+    )
+
+
+def init_db(conn: sqlite3.Connection) -> "PayloadCompaction":
+    """Bring the schema up to date; returns what the transactions payload compaction did.
+
+    Each entry of ``MIGRATIONS`` runs once per database, so restarting an
+    up-to-date database costs a single ``schema_version`` lookup.
+    """
+    compaction = PayloadCompaction(rows=0, requirements=0, bytes_reclaimed=0)
+    try:
+        applied = migrate(conn, MIGRATIONS)
+        compaction = applied.get(5) or compaction
+        if archive_attached(conn):
+            # 归档库可以后挂载或被替换，不随主库版本走，每次挂载时确保建表
+            _ensure_archive(conn)
     except sqlite3.OperationalError as e:
         if "readonly" in str(e).lower():
             # 只读数据库（如复制的文件）：跳过建表/迁移，仅做只读查询
             pass
         else:
             raise
+    return compaction
+
+
+@dataclass(frozen=True)
+class PayloadCompaction:
+    rows: int
+    requirements: int
+    bytes_reclaimed: int
+
+
+def _used_bytes(conn: sqlite3.Connection) -> int:
+    page_size = int(conn.execute("PRAGMA page_size").fetchone()[0])
+    page_count = int(conn.execute("PRAGMA page_count").fetchone()[0])
+    free_pages = int(conn.execute("PRAGMA freelist_count").fetchone()[0])
+    return (page_count - free_pages) * page_size
+
+
+def compact_transaction_payloads(conn: sqlite3.Connection, *, batch_size: int = 500) -> PayloadCompaction:
+    """Rebuild a legacy ``transactions`` table into the compact layout.
+
+    Older databases stored ``requirements_json`` and ``payment_payload_json``
+    as text on every row. The table is copied into the current layout (one
+    ``requirements`` row per distinct body, payloads zlib-compressed) and
+    swapped in, with its indexes and stats triggers recreated. Returns the
+    number of bytes of database pages the old layout no longer occupies
+    (they go to the freelist; run ``VACUUM`` or ``PRAGMA incremental_vacuum``
+    to shrink the file). A database already in the compact layout is left
+    untouched.
+    """
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(transactions)").fetchall()}
+    if "requirements_json" not in columns:
+        return PayloadCompaction(rows=0, requirements=0, bytes_reclaimed=0)
+
+    used_before = _used_bytes(conn)
+    copy_columns = [
+        "id", "transaction_id", "seller_id", "buyer_address", "price_wei", "status",
+        "tx_hash", "chat_id", "message_thread_id", "metadata_json", "error_reason",
+        "created_at", "updated_at", "confirmation_status", "confirmation_block",
+    ]
+    insert_sql = (
+        f"INSERT INTO transactions_compact ({', '.join(copy_columns)}, payment_payload_z, requirements_hash)"
+        f" VALUES ({', '.join('?' for _ in copy_columns)}, ?, ?)"
+    )
+    rows_copied = 0
+    hashes: set[str] = set()
+
+    # 表重建期间关闭外键检查（settlement_jobs 引用 transactions），只能在事务外切换
+    conn.execute("PRAGMA foreign_keys = OFF")
+    try:
+        conn.execute("BEGIN")
+        conn.execute(_transactions_ddl("transactions_compact"))
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                "SELECT * FROM transactions WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            requirement_rows = []
+            values = []
+            for row in rows:
+                digest = requirements_hash(str(row["requirements_json"]))
+                if digest not in hashes:
+                    hashes.add(digest)
+                    requirement_rows.append((digest, str(row["requirements_json"])))
+                values.append(
+                    (
+                        *(row[column] for column in copy_columns),
+                        compress_text(str(row["payment_payload_json"])),
+                        digest,
+                    )
+                )
+            conn.executemany("INSERT OR IGNORE INTO requirements (hash, body) VALUES (?, ?)", requirement_rows)
+            conn.executemany(insert_sql, values)
+            rows_copied += len(rows)
+            last_id = int(rows[-1]["id"])
+        conn.execute("DROP TABLE transactions")
+        conn.execute("ALTER TABLE transactions_compact RENAME TO transactions")
+        for ddl in _TRANSACTION_INDEXES:
+            conn.execute(ddl)
+        for trigger in _STATS_TRIGGERS:
+            if " ON transactions" in trigger:
+                conn.execute(trigger)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.commit()
+
+    return PayloadCompaction(
+        rows=rows_copied,
+        requirements=len(hashes),
+        bytes_reclaimed=max(0, used_before - _used_bytes(conn)),
+    )
+
+
+def archive_attached(conn: sqlite3.Connection) -> bool:
+    return any(row["name"] == ARCHIVE_SCHEMA for row in conn.execute("PRAGMA database_list").fetchall())
+
+
+def _ensure_archive(conn: sqlite3.Connection) -> None:
+    """Archived transactions: hot columns as-is, JSON payload columns zlib-compressed."""
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.archived_transactions (
+          id INTEGER PRIMARY KEY,
+          transaction_id TEXT NOT NULL UNIQUE,
+          seller_id TEXT NOT NULL,
+          buyer_address TEXT NOT NULL,
+          price_wei INTEGER NOT NULL,
+          status TEXT NOT NULL,
+          payment_payload_z BLOB NOT NULL,
+          requirements_z BLOB NOT NULL,
+          metadata_z BLOB NOT NULL,
+          tx_hash TEXT,
+          chat_id TEXT,
+          message_thread_id INTEGER,
+          error_reason TEXT,
+          confirmation_status TEXT,
+          confirmation_block INTEGER,
+          created_at TEXT NOT NULL,
+          updated_at TEXT NOT NULL,
+          archived_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_archived_transactions_seller"
+        " ON archived_transactions(seller_id, created_at)"
+    )
+    conn.commit()
+
+
+def enable_incremental_vacuum(conn: sqlite3.Connection) -> bool:
+    """Switch the main database to ``auto_vacuum = INCREMENTAL``; returns whether anything changed.
+
+    An existing database needs a full ``VACUUM`` to change mode, which
+    rewrites the whole file under an exclusive lock, so this is only called
+    from the offline ``compact`` command, never by the server.
+    """
+    if int(conn.execute("PRAGMA main.auto_vacuum").fetchone()[0]) == 2:
+        return False
+    conn.execute("PRAGMA main.auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    conn.commit()
+    return True
+
+
+def fts5_available(conn: sqlite3.Connection) -> bool:
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sellers_fts'").fetchone()
+    return row is not None
+
+
+def _ensure_seller_fts(conn: sqlite3.Connection, *, tokenize: str = "unicode61 remove_diacritics 2") -> None:
+    """Create the FTS5 index over seller keywords/description and its sync triggers.
+
+    The index is an external-content table on ``sellers`` (no duplicated text);
+    it is rebuilt once when first created so existing rows become searchable.
+    SQLite builds without FTS5 skip this and search falls back to LIKE.
+    """
+    if fts5_available(conn):
+        return
+    try:
+        conn.execute(
+            f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS sellers_fts USING fts5(
+              keywords,
+              description,
+              content='sellers',
+              content_rowid='id',
+              tokenize='{tokenize}'
+            )
+            """
+        )
+    except sqlite3.OperationalError as exc:
+        if "fts5" not in str(exc).lower():
+            raise
+        return
+    for sql in (
+        """
+        CREATE TRIGGER IF NOT EXISTS sellers_fts_ai AFTER INSERT ON sellers BEGIN
+          INSERT INTO sellers_fts(rowid, keywords, description)
+          VALUES (new.id, new.keywords, new.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS sellers_fts_ad AFTER DELETE ON sellers BEGIN
+          INSERT INTO sellers_fts(sellers_fts, rowid, keywords, description)
+          VALUES ('delete', old.id, old.keywords, old.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS sellers_fts_au AFTER UPDATE OF keywords, description ON sellers BEGIN
+          INSERT INTO sellers_fts(sellers_fts, rowid, keywords, description)
+          VALUES ('delete', old.id, old.keywords, old.description);
+          INSERT INTO sellers_fts(rowid, keywords, description)
+          VALUES (new.id, new.keywords, new.description);
+        END
+        """,
+        "INSERT INTO sellers_fts(sellers_fts) VALUES ('rebuild')",
+    ):
+        conn.execute(sql)
+
+
+def _migrate_seller_fts_trigram(conn: sqlite3.Connection) -> None:
+    """Rebuild ``sellers_fts`` with the trigram tokenizer so search matches substrings.
+
+    unicode61 only matches whole tokens or prefixes; CJK text is a single
+    unbroken token, so an infix such as "预报" found nothing. Trigram needs
+    SQLite 3.34+; older builds keep the unicode61 index.
+    """
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'sellers_fts'").fetchone()
+    if row is None or "trigram" in str(row["sql"]):
+        return
+    try:
+        conn.execute("CREATE VIRTUAL TABLE temp.trigram_probe USING fts5(x, tokenize='trigram')")
+    except sqlite3.OperationalError:
+        return
+    conn.execute("DROP TABLE temp.trigram_probe")
+    for trigger in ("sellers_fts_ai", "sellers_fts_ad", "sellers_fts_au"):
+        conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    conn.execute("DROP TABLE sellers_fts")
+    _ensure_seller_fts(conn, tokenize="trigram")
+
+
+def _ensure_seller_keywords(conn: sqlite3.Connection) -> None:
+    """Create the keyword -> seller inverted index and backfill it once from ``sellers.keywords``."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'seller_keywords'"
+    ).fetchone()
+    if exists:
+        return
+    conn.execute(
+        """
+        CREATE TABLE seller_keywords (
+          keyword TEXT NOT NULL,
+          seller_id TEXT NOT NULL,
+          PRIMARY KEY (keyword, seller_id),
+          FOREIGN KEY (seller_id) REFERENCES sellers(seller_id) ON DELETE CASCADE
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute("CREATE INDEX idx_seller_keywords_seller ON seller_keywords(seller_id)")
+    rows = conn.execute("SELECT seller_id, keywords FROM sellers").fetchall()
+    conn.executemany(
+        "INSERT OR IGNORE INTO seller_keywords (keyword, seller_id) VALUES (?, ?)",
+        [(keyword, row["seller_id"]) for row in rows for keyword in split_keywords(row["keywords"])],
+    )
+
+
+_STATS_TRIGGERS = (
+    """
+    CREATE TRIGGER stats_sellers_ai AFTER INSERT ON sellers BEGIN
+      INSERT INTO market_stats (kind, key, count) VALUES ('seller_status', NEW.status, 1)
+        ON CONFLICT (kind, key) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER stats_sellers_au AFTER UPDATE OF status ON sellers
+    WHEN OLD.status IS NOT NEW.status BEGIN
+      UPDATE market_stats SET count = count - 1 WHERE kind = 'seller_status' AND key = OLD.status;
+      INSERT INTO market_stats (kind, key, count) VALUES ('seller_status', NEW.status, 1)
+        ON CONFLICT (kind, key) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER stats_transactions_ai AFTER INSERT ON transactions BEGIN
+      INSERT INTO market_stats (kind, key, count, volume_wei)
+        VALUES ('transaction_status', NEW.status, 1, NEW.price_wei)
+        ON CONFLICT (kind, key) DO UPDATE SET count = count + 1, volume_wei = volume_wei + excluded.volume_wei;
+      INSERT INTO market_stats (kind, key, count, volume_wei)
+        VALUES ('transaction_day', substr(NEW.created_at, 1, 10), 1, NEW.price_wei)
+        ON CONFLICT (kind, key) DO UPDATE SET count = count + 1, volume_wei = volume_wei + excluded.volume_wei;
+      INSERT INTO seller_stats (seller_id, status, count, volume_wei, last_transaction_at)
+        VALUES (NEW.seller_id, NEW.status, 1, NEW.price_wei, NEW.created_at)
+        ON CONFLICT (seller_id, status) DO UPDATE SET
+          count = count + 1,
+          volume_wei = volume_wei + excluded.volume_wei,
+          last_transaction_at = max(last_transaction_at, excluded.last_transaction_at);
+    END
+    """,
+    """
+    CREATE TRIGGER stats_transactions_au AFTER UPDATE OF status, price_wei ON transactions
+    WHEN OLD.status IS NOT NEW.status OR OLD.price_wei IS NOT NEW.price_wei BEGIN
+      UPDATE market_stats SET count = count - 1, volume_wei = volume_wei - OLD.price_wei
+        WHERE kind = 'transaction_status' AND key = OLD.status;
+      INSERT INTO market_stats (kind, key, count, volume_wei)
+        VALUES ('transaction_status', NEW.status, 1, NEW.price_wei)
+        ON CONFLICT (kind, key) DO UPDATE SET count = count + 1, volume_wei = volume_wei + excluded.volume_wei;
+      UPDATE market_stats SET volume_wei = volume_wei - OLD.price_wei + NEW.price_wei
+        WHERE kind = 'transaction_day' AND key = substr(NEW.created_at, 1, 10);
+      UPDATE seller_stats SET count = count - 1, volume_wei = volume_wei - OLD.price_wei
+        WHERE seller_id = OLD.seller_id AND status = OLD.status;
+      INSERT INTO seller_stats (seller_id, status, count, volume_wei, last_transaction_at)
+        VALUES (NEW.seller_id, NEW.status, 1, NEW.price_wei, NEW.created_at)
+        ON CONFLICT (seller_id, status) DO UPDATE SET
+          count = count + 1,
+          volume_wei = volume_wei + excluded.volume_wei,
+          last_transaction_at = max(last_transaction_at, excluded.last_transaction_at);
+    END
+    """,
+)
+
+
+def _ensure_stats(conn: sqlite3.Connection) -> None:
+    """Create the trigger-maintained aggregate tables and seed them once from existing rows.
+
+    ``market_stats`` holds one counter row per (kind, key): sellers per
+    status, transactions and volume per status, and per UTC day.
+    ``seller_stats`` holds the per-seller, per-status transaction counters.
+    Counters are lifetime totals: the archiver deletes old transactions from
+    the hot table but deliberately leaves their counts in place, so there are
+    no DELETE triggers.
+    """
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'market_stats'"
+    ).fetchone()
+    if exists:
+        return
+    conn.execute(
+        """
+        CREATE TABLE market_stats (
+          kind TEXT NOT NULL,
+          key TEXT NOT NULL,
+          count INTEGER NOT NULL DEFAULT 0,
+          volume_wei INTEGER NOT NULL DEFAULT 0,
+          PRIMARY KEY (kind, key)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE seller_stats (
+          seller_id TEXT NOT NULL,
+          status TEXT NOT NULL,
+          count INTEGER NOT NULL DEFAULT 0,
+          volume_wei INTEGER NOT NULL DEFAULT 0,
+          last_transaction_at TEXT,
+          PRIMARY KEY (seller_id, status)
+        ) WITHOUT ROWID
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO market_stats (kind, key, count)
+        SELECT 'seller_status', status, COUNT(*) FROM sellers GROUP BY status
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO market_stats (kind, key, count, volume_wei)
+        SELECT 'transaction_status', status, COUNT(*), SUM(price_wei) FROM transactions GROUP BY status
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO market_stats (kind, key, count, volume_wei)
+        SELECT 'transaction_day', substr(created_at, 1, 10), COUNT(*), SUM(price_wei)
+        FROM transactions GROUP BY substr(created_at, 1, 10)
+        """
+    )
+    conn.execute(
+        """
+        INSERT INTO seller_stats (seller_id, status, count, volume_wei, last_transaction_at)
+        SELECT seller_id, status, COUNT(*), SUM(price_wei), MAX(created_at)
+        FROM transactions GROUP BY seller_id, status
+        """
+    )
+    for trigger in _STATS_TRIGGERS:
+        conn.execute(trigger)
 
 
 def _ensure_column(conn: sqlite3.Connection, table: str, name: str, ddl: str) -> None:
@@ -91,3 +605,14 @@ def _ensure_column(conn: sqlite3.Connection, table: str, name: str, ddl: str) ->
     if name in columns:
         return
     conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}")
+
+
+# 只追加、不修改：已部署的数据库按 schema_version 只执行新增的编号
+MIGRATIONS = (
+    Migration(1, "baseline", _migrate_baseline),
+    Migration(2, "seller_fts", _ensure_seller_fts),
+    Migration(3, "seller_keywords", _ensure_seller_keywords),
+    Migration(4, "stats", _ensure_stats),
+    Migration(5, "compact_payloads", compact_transaction_payloads, transactional=False),
+    Migration(6, "seller_fts_trigram", _migrate_seller_fts_trigram),
+)
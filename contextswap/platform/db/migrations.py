@@ -0,0 +1,95 @@
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Sequence
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One numbered schema change, applied at most once per database.
+
+    ``apply`` runs inside the same transaction that records the version, so a
+    failed migration leaves neither its changes nor its ``schema_version``
+    row behind. Migrations that must manage transactions themselves (e.g.
+    table rebuilds that toggle ``PRAGMA foreign_keys``) set
+    ``transactional=False``; they must then be safe to re-run, because a
+    crash between their own commit and the version row means they run again.
+    """
+
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Connection], Any]
+    transactional: bool = True
+
+
+def _has_version_table(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    return row is not None
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """Highest applied migration version (0 for a database that predates versioning)."""
+    if not _has_version_table(conn):
+        return 0
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return int(row[0] or 0)
+
+
+def _record(conn: sqlite3.Connection, migration: Migration) -> None:
+    conn.execute(
+        "INSERT OR IGNORE INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+        (
+            migration.version,
+            migration.name,
+            datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+        ),
+    )
+
+
+def migrate(conn: sqlite3.Connection, migrations: Sequence[Migration]) -> dict[int, Any]:
+    """Apply every migration newer than the database's ``schema_version``.
+
+    Returns ``{version: value returned by apply}`` for the migrations that ran;
+    an up-to-date database costs one lookup and returns ``{}``.
+    """
+    versions = [m.version for m in migrations]
+    if versions != sorted(set(versions)):
+        raise ValueError("migration versions must be unique and ascending")
+    if not migrations or schema_version(conn) >= versions[-1]:
+        return {}
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+          version INTEGER PRIMARY KEY,
+          name TEXT NOT NULL,
+          applied_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.commit()
+
+    applied: dict[int, Any] = {}
+    for migration in migrations:
+        if not migration.transactional:
+            if schema_version(conn) >= migration.version:
+                continue
+            applied[migration.version] = migration.apply(conn)
+            _record(conn, migration)
+            conn.commit()
+            continue
+        # IMMEDIATE 先拿写锁再复查版本：多个进程同时启动时只有一个会执行
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) >= migration.version:
+                conn.rollback()
+                continue
+            applied[migration.version] = migration.apply(conn)
+            _record(conn, migration)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    return applied
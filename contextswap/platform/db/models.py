@@ -1,8 +1,20 @@
+import base64
+import functools
+import json
+import re
 import sqlite3
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable, Collection, TypeVar
 
-from contextswap.platform.db.engine import utc_now_iso
+from contextswap.platform.db.engine import (
+    ARCHIVE_SCHEMA,
+    SQLITE_SUPPORTS_RETURNING,
+    compress_text,
+    decompress_text,
+    requirements_hash,
+    split_keywords,
+    utc_now_iso,
+)
 
 
 class DbError(RuntimeError):
@@ -13,6 +25,49 @@ class AlreadyExistsError(DbError):
     pass
 
 
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _returning(sql: str, columns: str = "*") -> str:
+    """Append ``RETURNING <columns>`` when the linked SQLite supports it (3.35+)."""
+    return f"{sql.rstrip()} RETURNING {columns}" if SQLITE_SUPPORTS_RETURNING else sql
+
+
+def _returned_row(cur: Any) -> sqlite3.Row | None:
+    """The single row an INSERT/UPDATE ... RETURNING produced; None if nothing matched or unsupported."""
+    if not SQLITE_SUPPORTS_RETURNING:
+        return None
+    rows = cur.fetchall()
+    return rows[0] if rows else None
+
+
+def _changed_one(cur: Any, row: sqlite3.Row | None) -> bool:
+    return row is not None if SQLITE_SUPPORTS_RETURNING else cur.rowcount == 1
+
+
+def write_operation(fn: _F) -> _F:
+    """Route a mutation through ``conn.run_write`` when the connection supports group commit.
+
+    Either way a mutation that raises part-way is rolled back, unless it ran
+    inside a transaction the caller had already opened.
+    """
+
+    @functools.wraps(fn)
+    def wrapper(conn: Any, *args: Any, **kwargs: Any) -> Any:
+        run_write = getattr(conn, "run_write", None)
+        if run_write is not None:
+            return run_write(fn, conn, *args, **kwargs)
+        outer = conn.in_transaction
+        try:
+            return fn(conn, *args, **kwargs)
+        except BaseException:
+            if not outer:
+                conn.rollback()
+            raise
+
+    return wrapper  # type: ignore[return-value]
+
+
 @dataclass(frozen=True)
 class Seller:
     id: int
@@ -46,6 +101,46 @@ class Transaction:
     created_at: str
     updated_at: str
     payment_chain: str | None = None
+    confirmation_status: str | None = None
+    confirmation_block: int | None = None
+
+
+@dataclass(frozen=True)
+class SettlementJob:
+    id: int
+    transaction_id: str
+    payment_network: str
+    status: str
+    attempts: int
+    next_attempt_at: str
+    last_error: str | None
+    created_at: str
+    updated_at: str
+
+
+@dataclass(frozen=True)
+class StatCounter:
+    """One trigger-maintained counter row (``market_stats`` or ``seller_stats``)."""
+
+    key: str
+    count: int
+    volume_wei: int
+    last_transaction_at: str | None = None
+
+
+def encode_cursor(sort_value: str, row_id: int) -> str:
+    """Opaque keyset cursor for ``(sort_value, id)`` pagination."""
+    raw = json.dumps([sort_value, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return str(sort_value), int(row_id)
+    except Exception as exc:  # noqa: BLE001
+        raise ValueError("invalid cursor") from exc
 
 
 def _row_to_seller(row: sqlite3.Row) -> Seller:
@@ -74,6 +169,15 @@ def _row_to_transaction(row: sqlite3.Row) -> Transaction:
     if "payment_chain" in row.keys():
         raw = row["payment_chain"]
         payment_chain = None if raw is None else str(raw)
+    keys = row.keys()
+    confirmation_status = row["confirmation_status"] if "confirmation_status" in keys else None
+    confirmation_block = row["confirmation_block"] if "confirmation_block" in keys else None
+    if "payment_payload_z" in keys:
+        payment_payload_json = decompress_text(row["payment_payload_z"])
+        requirements_json = str(row["requirements_body"])
+    else:
+        payment_payload_json = str(row["payment_payload_json"])
+        requirements_json = str(row["requirements_json"])
     return Transaction(
         id=int(row["id"]),
         transaction_id=str(row["transaction_id"]),
@@ -81,8 +185,8 @@ def _row_to_transaction(row: sqlite3.Row) -> Transaction:
         buyer_address=str(row["buyer_address"]),
         price_wei=int(row["price_wei"]),
         status=str(row["status"]),
-        payment_payload_json=str(row["payment_payload_json"]),
-        requirements_json=str(row["requirements_json"]),
+        payment_payload_json=payment_payload_json,
+        requirements_json=requirements_json,
         tx_hash=row["tx_hash"],
         chat_id=row["chat_id"],
         message_thread_id=row["message_thread_id"],
@@ -91,9 +195,24 @@ def _row_to_transaction(row: sqlite3.Row) -> Transaction:
         created_at=str(row["created_at"]),
         updated_at=str(row["updated_at"]),
         payment_chain=payment_chain,
+        confirmation_status=confirmation_status,
+        confirmation_block=None if confirmation_block is None else int(confirmation_block),
     )
 
 
+_INSERT_SELLER_SQL = _returning(
+    """
+    INSERT INTO sellers (
+      seller_id, evm_address, price_wei, price_conflux_wei, price_tron_sun,
+      description, keywords, status,
+      created_at, updated_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+)
+
+
+@write_operation
 def create_seller(
     conn: sqlite3.Connection,
     *,
@@ -109,14 +228,7 @@ def create_seller(
     now = utc_now_iso()
     try:
         cur = conn.execute(
-            """
-            INSERT INTO sellers (
-              seller_id, evm_address, price_wei, price_conflux_wei, price_tron_sun,
-              description, keywords, status,
-              created_at, updated_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            _INSERT_SELLER_SQL,
             (
                 seller_id,
                 evm_address,
@@ -133,7 +245,11 @@ def create_seller(
     except sqlite3.IntegrityError as exc:
         raise AlreadyExistsError(f"seller already exists: seller_id={seller_id}") from exc
 
+    row = _returned_row(cur)
+    _replace_seller_keywords(conn, seller_id=seller_id, keywords=keywords)
     conn.commit()
+    if row is not None:
+        return _row_to_seller(row)
     got = get_seller_by_id(conn, seller_id=seller_id)
     if got is None:
         raise DbError("failed to read seller after create")
@@ -156,7 +272,9 @@ def list_sellers(
     limit: int = 100,
     offset: int = 0,
     status: str | None = None,
+    cursor: str | None = None,
 ) -> list[Seller]:
+    """List sellers, most recently updated first; ``cursor`` (from ``seller_cursor``) replaces ``offset``."""
     if limit < 1 or limit > 200:
         limit = 100
     if offset < 0:
@@ -166,30 +284,154 @@ def list_sellers(
     if status is not None:
         query += " AND status = ?"
         params.append(status)
-    query += " ORDER BY updated_at DESC LIMIT ? OFFSET ?"
+    if cursor:
+        updated_at, row_id = decode_cursor(cursor)
+        query += " AND (updated_at, id) < (?, ?)"
+        params.extend([updated_at, row_id])
+        offset = 0
+    query += " ORDER BY updated_at DESC, id DESC LIMIT ? OFFSET ?"
     params.extend([limit, offset])
     rows = conn.execute(query, params).fetchall()
     return [_row_to_seller(row) for row in rows]
 
 
-def search_sellers(conn: sqlite3.Connection, *, keyword: str) -> list[Seller]:
+def seller_cursor(seller: Seller) -> str:
+    return encode_cursor(seller.updated_at, seller.id)
+
+
+# trigram 索引只能回答不短于 3 个字符的词
+_MIN_TRIGRAM_TERM = 3
+
+
+def search_terms(keyword: str) -> list[str]:
+    return re.findall(r"\w+", keyword.lower())
+
+
+def fts_match_expression(terms: list[str]) -> str | None:
+    """FTS5 trigram query where every term must appear as a substring.
+
+    Returns ``None`` when a term is too short for the trigram index; the
+    caller then answers the query with LIKE.
+    """
+    if any(len(term) < _MIN_TRIGRAM_TERM for term in terms):
+        return None
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def _like_pattern(term: str) -> str:
+    return "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def search_sellers(
+    conn: sqlite3.Connection,
+    *,
+    keyword: str,
+    limit: int = 100,
+    offset: int = 0,
+) -> list[Seller]:
     kw = (keyword or "").strip().lower()
     if not kw:
         return []
+    if limit < 1 or limit > 200:
+        limit = 100
+    if offset < 0:
+        offset = 0
+
+    terms = search_terms(kw)
+    if not terms:
+        return []
+    match = fts_match_expression(terms)
+    rows = None
+    if match is not None:
+        try:
+            rows = conn.execute(
+                """
+                SELECT s.* FROM sellers_fts f
+                JOIN sellers s ON s.id = f.rowid
+                WHERE sellers_fts MATCH ? AND s.status = 'active'
+                ORDER BY bm25(sellers_fts, 2.0, 1.0), s.updated_at DESC
+                LIMIT ? OFFSET ?
+                """,
+                (match, limit, offset),
+            ).fetchall()
+        except sqlite3.OperationalError as exc:
+            if "sellers_fts" not in str(exc):
+                raise
+    if rows is None:
+        # 无 FTS5 的 SQLite 或短词（如两字中文）：退回全表 LIKE 扫描，每个词都须出现
+        where = " AND ".join(
+            ["(lower(keywords) LIKE ? ESCAPE '\\' OR lower(description) LIKE ? ESCAPE '\\')"] * len(terms)
+        )
+        params: list[Any] = []
+        for term in terms:
+            params.extend([_like_pattern(term)] * 2)
+        rows = conn.execute(
+            f"""
+            SELECT * FROM sellers
+            WHERE status = 'active' AND {where}
+            ORDER BY updated_at DESC
+            LIMIT ? OFFSET ?
+            """,
+            (*params, limit, offset),
+        ).fetchall()
+    return [_row_to_seller(row) for row in rows]
+
+
+def _replace_seller_keywords(conn: sqlite3.Connection, *, seller_id: str, keywords: str | None) -> None:
+    """Rewrite a seller's rows in the ``seller_keywords`` inverted index (caller commits)."""
+    conn.execute("DELETE FROM seller_keywords WHERE seller_id = ?", (seller_id,))
+    conn.executemany(
+        "INSERT INTO seller_keywords (keyword, seller_id) VALUES (?, ?)",
+        [(keyword, seller_id) for keyword in split_keywords(keywords)],
+    )
+
+
+def find_sellers_by_keywords(
+    conn: sqlite3.Connection,
+    *,
+    all_keywords: list[str],
+    any_keywords: list[str],
+    limit: int = 100,
+    offset: int = 0,
+) -> list[Seller]:
+    """Active sellers tagged with every keyword in ``all_keywords`` and at least one of ``any_keywords``.
+
+    Each keyword is a primary-key lookup on ``seller_keywords``; the seller id
+    sets are intersected before touching ``sellers``.
+    """
+    all_keywords = [k.lower() for k in all_keywords if k]
+    any_keywords = [k.lower() for k in any_keywords if k]
+    if not all_keywords and not any_keywords:
+        raise ValueError("at least one keyword is required")
+    if limit < 1 or limit > 200:
+        limit = 100
+    if offset < 0:
+        offset = 0
+
+    selects: list[str] = []
+    params: list[Any] = []
+    for keyword in all_keywords:
+        selects.append("SELECT seller_id FROM seller_keywords WHERE keyword = ?")
+        params.append(keyword)
+    if any_keywords:
+        placeholders = ", ".join("?" for _ in any_keywords)
+        selects.append(f"SELECT seller_id FROM seller_keywords WHERE keyword IN ({placeholders})")
+        params.extend(any_keywords)
 
-    like = f"%{kw}%"
     rows = conn.execute(
-        """
+        f"""
         SELECT * FROM sellers
         WHERE status = 'active'
-          AND (lower(keywords) LIKE ? OR lower(description) LIKE ?)
-        ORDER BY updated_at DESC
+          AND seller_id IN ({" INTERSECT ".join(selects)})
+        ORDER BY updated_at DESC, id DESC
+        LIMIT ? OFFSET ?
         """,
-        (like, like),
+        [*params, limit, offset],
     ).fetchall()
     return [_row_to_seller(row) for row in rows]
 
 
+@write_operation
 def update_seller_fields(
     conn: sqlite3.Connection,
     *,
@@ -215,12 +457,18 @@ def update_seller_fields(
     values.append(seller_id)
 
     cur = conn.execute(
-        f"UPDATE sellers SET {columns} WHERE seller_id = ?",
+        _returning(f"UPDATE sellers SET {columns} WHERE seller_id = ?"),
         values,
     )
-    if cur.rowcount != 1:
+    row = _returned_row(cur)
+    if not _changed_one(cur, row):
+        conn.rollback()
         raise DbError(f"seller not found: seller_id={seller_id}")
+    if "keywords" in fields:
+        _replace_seller_keywords(conn, seller_id=seller_id, keywords=fields["keywords"])
     conn.commit()
+    if row is not None:
+        return _row_to_seller(row)
 
     got = get_seller_by_id(conn, seller_id=seller_id)
     if got is None:
@@ -228,6 +476,32 @@ def update_seller_fields(
     return got
 
 
+# 交易行只存 requirements 的内容哈希；读取时关联 requirements 表取回原文
+_SELECT_TRANSACTIONS = (
+    "SELECT t.*, r.body AS requirements_body FROM transactions t"
+    " LEFT JOIN requirements r ON r.hash = t.requirements_hash"
+)
+_TRANSACTION_RETURNING = (
+    "*, (SELECT body FROM requirements WHERE requirements.hash = transactions.requirements_hash) AS requirements_body"
+)
+_INSERT_REQUIREMENTS_SQL = "INSERT OR IGNORE INTO requirements (hash, body) VALUES (?, ?)"
+_INSERT_TRANSACTION_SQL = _returning(
+    """
+    INSERT INTO transactions (
+      transaction_id, seller_id, buyer_address,
+      price_wei, status,
+      payment_payload_z, requirements_hash,
+      tx_hash, chat_id, message_thread_id,
+      metadata_json, error_reason,
+      created_at, updated_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """,
+    _TRANSACTION_RETURNING,
+)
+
+
+@write_operation
 def create_transaction(
     conn: sqlite3.Connection,
     *,
@@ -245,27 +519,19 @@ def create_transaction(
     error_reason: str | None = None,
 ) -> Transaction:
     now = utc_now_iso()
+    digest = requirements_hash(requirements_json)
+    conn.execute(_INSERT_REQUIREMENTS_SQL, (digest, requirements_json))
     try:
         cur = conn.execute(
-            """
-            INSERT INTO transactions (
-              transaction_id, seller_id, buyer_address,
-              price_wei, status,
-              payment_payload_json, requirements_json,
-              tx_hash, chat_id, message_thread_id,
-              metadata_json, error_reason,
-              created_at, updated_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            _INSERT_TRANSACTION_SQL,
             (
                 transaction_id,
                 seller_id,
                 buyer_address,
                 int(price_wei),
                 status,
-                payment_payload_json,
-                requirements_json,
+                compress_text(payment_payload_json),
+                digest,
                 tx_hash,
                 chat_id,
                 message_thread_id,
@@ -276,9 +542,13 @@ def create_transaction(
             ),
         )
     except sqlite3.IntegrityError as exc:
+        conn.rollback()
         raise AlreadyExistsError(f"transaction already exists: {transaction_id}") from exc
 
+    row = _returned_row(cur)
     conn.commit()
+    if row is not None:
+        return _row_to_transaction(row)
     tx = get_transaction_by_id(conn, transaction_id=transaction_id)
     if tx is None:
         raise DbError("failed to read transaction after create")
@@ -286,11 +556,14 @@ def create_transaction(
 
 
 def get_transaction_by_id(conn: sqlite3.Connection, *, transaction_id: str) -> Transaction | None:
+    """Look a transaction up in the hot table, then in the attached archive."""
     row = conn.execute(
-        "SELECT * FROM transactions WHERE transaction_id = ?",
+        f"{_SELECT_TRANSACTIONS} WHERE t.transaction_id = ?",
         (transaction_id,),
     ).fetchone()
-    return _row_to_transaction(row) if row else None
+    if row:
+        return _row_to_transaction(row)
+    return get_archived_transaction(conn, transaction_id=transaction_id)
 
 
 def list_transactions(
@@ -300,26 +573,75 @@ def list_transactions(
     offset: int = 0,
     status: str | None = None,
     seller_id: str | None = None,
+    cursor: str | None = None,
 ) -> list[Transaction]:
-    """List transactions, newest first. Optional filter by status or seller_id."""
+    """List transactions, newest first. Optional filter by status or seller_id.
+
+    ``cursor`` (from ``transaction_cursor``) resumes after the last row of the
+    previous page and replaces ``offset``.
+    """
     if limit < 1 or limit > 200:
         limit = 50
     if offset < 0:
         offset = 0
-    query = "SELECT * FROM transactions WHERE 1=1"
+    query = f"{_SELECT_TRANSACTIONS} WHERE 1=1"
     params: list[Any] = []
     if status is not None:
-        query += " AND status = ?"
+        query += " AND t.status = ?"
         params.append(status)
     if seller_id is not None:
-        query += " AND seller_id = ?"
+        query += " AND t.seller_id = ?"
         params.append(seller_id)
-    query += " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query += " AND (t.created_at, t.id) < (?, ?)"
+        params.extend([created_at, row_id])
+        offset = 0
+    query += " ORDER BY t.created_at DESC, t.id DESC LIMIT ? OFFSET ?"
     params.extend([limit, offset])
     rows = conn.execute(query, params).fetchall()
     return [_row_to_transaction(row) for row in rows]
 
 
+def list_transactions_range(
+    conn: sqlite3.Connection,
+    *,
+    since: str | None = None,
+    until: str | None = None,
+    status: str | None = None,
+    after: tuple[str, int] | None = None,
+    limit: int = 500,
+) -> list[Transaction]:
+    """Transactions with ``since <= created_at < until``, oldest first, for bulk export.
+
+    ``after`` is the ``(created_at, id)`` of the last row already returned;
+    repeated calls walk the table in keyset batches of ``limit`` rows.
+    """
+    query = f"{_SELECT_TRANSACTIONS} WHERE 1=1"
+    params: list[Any] = []
+    if status is not None:
+        query += " AND t.status = ?"
+        params.append(status)
+    if since is not None:
+        query += " AND t.created_at >= ?"
+        params.append(since)
+    if until is not None:
+        query += " AND t.created_at < ?"
+        params.append(until)
+    if after is not None:
+        query += " AND (t.created_at, t.id) > (?, ?)"
+        params.extend(after)
+    query += " ORDER BY t.created_at, t.id LIMIT ?"
+    params.append(limit)
+    rows = conn.execute(query, params).fetchall()
+    return [_row_to_transaction(row) for row in rows]
+
+
+def transaction_cursor(transaction: Transaction) -> str:
+    return encode_cursor(transaction.created_at, transaction.id)
+
+
+@write_operation
 def update_transaction_fields(
     conn: sqlite3.Connection,
     *,
@@ -345,14 +667,344 @@ def update_transaction_fields(
     values.append(transaction_id)
 
     cur = conn.execute(
-        f"UPDATE transactions SET {columns} WHERE transaction_id = ?",
+        _returning(f"UPDATE transactions SET {columns} WHERE transaction_id = ?", _TRANSACTION_RETURNING),
         values,
     )
-    if cur.rowcount != 1:
+    row = _returned_row(cur)
+    if not _changed_one(cur, row):
+        conn.rollback()
         raise DbError(f"transaction not found: {transaction_id}")
     conn.commit()
+    if row is not None:
+        return _row_to_transaction(row)
 
     got = get_transaction_by_id(conn, transaction_id=transaction_id)
     if got is None:
         raise DbError("failed to read transaction after update")
     return got
+
+
+def list_unconfirmed_transactions(
+    conn: sqlite3.Connection, *, limit: int = 500, networks: Collection[str] | None = None
+) -> list[Transaction]:
+    """Settled transactions (tx_hash set) whose on-chain outcome is not known yet.
+
+    ``networks`` limits the result to payments whose requirements name one of
+    those networks (``accepts[0].network``), so rows nobody can check do not
+    crowd out the ones that can be.
+    """
+    network_filter = ""
+    params: list[Any] = []
+    if networks is not None:
+        if not networks:
+            return []
+        network_filter = (
+            f"AND json_extract(r.body, '$.accepts[0].network') IN ({', '.join('?' for _ in networks)})"
+        )
+        params.extend(networks)
+    rows = conn.execute(
+        f"""
+        {_SELECT_TRANSACTIONS}
+        WHERE t.confirmation_status IS NULL AND t.tx_hash IS NOT NULL
+          {network_filter}
+        ORDER BY t.id ASC
+        LIMIT ?
+        """,
+        (*params, limit),
+    ).fetchall()
+    return [_row_to_transaction(row) for row in rows]
+
+
+@write_operation
+def set_confirmation_results(
+    conn: sqlite3.Connection,
+    results: list[tuple[str, str, int | None]],
+) -> int:
+    """Apply ``(transaction_id, confirmation_status, block)`` updates in one commit."""
+    if not results:
+        return 0
+    now = utc_now_iso()
+    conn.executemany(
+        """
+        UPDATE transactions
+        SET confirmation_status = ?, confirmation_block = ?, updated_at = ?
+        WHERE transaction_id = ?
+        """,
+        [(status, block, now, transaction_id) for transaction_id, status, block in results],
+    )
+    conn.commit()
+    return len(results)
+
+
+def _row_to_settlement_job(row: sqlite3.Row) -> SettlementJob:
+    return SettlementJob(
+        id=int(row["id"]),
+        transaction_id=str(row["transaction_id"]),
+        payment_network=str(row["payment_network"]),
+        status=str(row["status"]),
+        attempts=int(row["attempts"]),
+        next_attempt_at=str(row["next_attempt_at"]),
+        last_error=row["last_error"],
+        created_at=str(row["created_at"]),
+        updated_at=str(row["updated_at"]),
+    )
+
+
+@write_operation
+def create_settlement_job(
+    conn: sqlite3.Connection,
+    *,
+    transaction_id: str,
+    payment_network: str,
+) -> SettlementJob:
+    now = utc_now_iso()
+    try:
+        conn.execute(
+            """
+            INSERT INTO settlement_jobs (
+              transaction_id, payment_network, status, attempts,
+              next_attempt_at, last_error, created_at, updated_at
+            )
+            VALUES (?, ?, 'pending', 0, ?, NULL, ?, ?)
+            """,
+            (transaction_id, payment_network, now, now, now),
+        )
+    except sqlite3.IntegrityError as exc:
+        raise AlreadyExistsError(f"settlement job already exists: {transaction_id}") from exc
+
+    conn.commit()
+    job = get_settlement_job(conn, transaction_id=transaction_id)
+    if job is None:
+        raise DbError("failed to read settlement job after create")
+    return job
+
+
+def get_settlement_job(conn: sqlite3.Connection, *, transaction_id: str) -> SettlementJob | None:
+    row = conn.execute(
+        "SELECT * FROM settlement_jobs WHERE transaction_id = ?",
+        (transaction_id,),
+    ).fetchone()
+    return _row_to_settlement_job(row) if row else None
+
+
+@write_operation
+def claim_due_settlement_jobs(conn: sqlite3.Connection, *, limit: int = 20) -> list[SettlementJob]:
+    """Mark due pending jobs as running and return them (single worker, no contention)."""
+    now = utc_now_iso()
+    rows = conn.execute(
+        """
+        SELECT * FROM settlement_jobs
+        WHERE status = 'pending' AND next_attempt_at <= ?
+        ORDER BY next_attempt_at ASC, id ASC
+        LIMIT ?
+        """,
+        (now, limit),
+    ).fetchall()
+    if not rows:
+        return []
+    ids = [int(row["id"]) for row in rows]
+    placeholders = ", ".join("?" for _ in ids)
+    conn.execute(
+        f"UPDATE settlement_jobs SET status = 'running', updated_at = ? WHERE id IN ({placeholders})",
+        [now, *ids],
+    )
+    conn.commit()
+    return [_row_to_settlement_job(row) for row in rows]
+
+
+@write_operation
+def reset_running_settlement_jobs(conn: sqlite3.Connection) -> int:
+    """Return jobs left in running by a crashed worker to the pending queue."""
+    cur = conn.execute(
+        "UPDATE settlement_jobs SET status = 'pending', updated_at = ? WHERE status = 'running'",
+        (utc_now_iso(),),
+    )
+    conn.commit()
+    return int(cur.rowcount)
+
+
+def list_transactions_without_settlement_job(conn: sqlite3.Connection, *, status: str) -> list[Transaction]:
+    rows = conn.execute(
+        f"""
+        {_SELECT_TRANSACTIONS}
+        LEFT JOIN settlement_jobs j ON j.transaction_id = t.transaction_id
+        WHERE t.status = ? AND j.id IS NULL
+        """,
+        (status,),
+    ).fetchall()
+    return [_row_to_transaction(row) for row in rows]
+
+
+@write_operation
+def update_settlement_job_fields(
+    conn: sqlite3.Connection,
+    *,
+    transaction_id: str,
+    fields: dict[str, Any],
+) -> SettlementJob:
+    forbidden = {"id", "transaction_id", "created_at"}
+    bad = forbidden.intersection(fields.keys())
+    if bad:
+        raise ValueError(f"forbidden fields: {sorted(bad)}")
+
+    fields = dict(fields)
+    fields["updated_at"] = utc_now_iso()
+
+    columns = ", ".join([f"{k} = ?" for k in fields.keys()])
+    values = list(fields.values())
+    values.append(transaction_id)
+
+    cur = conn.execute(
+        f"UPDATE settlement_jobs SET {columns} WHERE transaction_id = ?",
+        values,
+    )
+    if cur.rowcount != 1:
+        raise DbError(f"settlement job not found: {transaction_id}")
+    conn.commit()
+
+    job = get_settlement_job(conn, transaction_id=transaction_id)
+    if job is None:
+        raise DbError("failed to read settlement job after update")
+    return job
+
+
+def list_market_stats(conn: sqlite3.Connection, *, kind: str, limit: int | None = None) -> list[StatCounter]:
+    """Counters of one kind (``seller_status``, ``transaction_status``, ``transaction_day``), latest key first."""
+    query = "SELECT key, count, volume_wei FROM market_stats WHERE kind = ? ORDER BY key DESC"
+    params: list[Any] = [kind]
+    if limit is not None:
+        query += " LIMIT ?"
+        params.append(limit)
+    rows = conn.execute(query, params).fetchall()
+    return [StatCounter(key=str(r["key"]), count=int(r["count"]), volume_wei=int(r["volume_wei"])) for r in rows]
+
+
+def list_seller_stats(conn: sqlite3.Connection, *, seller_id: str) -> list[StatCounter]:
+    """Per-status transaction counters of one seller."""
+    rows = conn.execute(
+        "SELECT status, count, volume_wei, last_transaction_at FROM seller_stats WHERE seller_id = ?",
+        (seller_id,),
+    ).fetchall()
+    return [
+        StatCounter(
+            key=str(r["status"]),
+            count=int(r["count"]),
+            volume_wei=int(r["volume_wei"]),
+            last_transaction_at=r["last_transaction_at"],
+        )
+        for r in rows
+    ]
+
+
+# ---------- Archive ----------
+
+_ARCHIVE_PAYLOAD_COLUMNS = (
+    ("payment_payload_json", "payment_payload_z"),
+    ("requirements_json", "requirements_z"),
+    ("metadata_json", "metadata_z"),
+)
+_ARCHIVE_PLAIN_COLUMNS = (
+    "id",
+    "transaction_id",
+    "seller_id",
+    "buyer_address",
+    "price_wei",
+    "status",
+    "tx_hash",
+    "chat_id",
+    "message_thread_id",
+    "error_reason",
+    "confirmation_status",
+    "confirmation_block",
+    "created_at",
+    "updated_at",
+)
+
+
+def get_archived_transaction(conn: sqlite3.Connection, *, transaction_id: str) -> Transaction | None:
+    try:
+        row = conn.execute(
+            f"SELECT * FROM {ARCHIVE_SCHEMA}.archived_transactions WHERE transaction_id = ?",
+            (transaction_id,),
+        ).fetchone()
+    except sqlite3.OperationalError:
+        # 未挂载归档库
+        return None
+    if row is None:
+        return None
+    values: dict[str, Any] = {column: row[column] for column in _ARCHIVE_PLAIN_COLUMNS}
+    for column, packed in _ARCHIVE_PAYLOAD_COLUMNS:
+        values[column] = decompress_text(row[packed])
+    return _row_to_transaction(values)  # type: ignore[arg-type]
+
+
+def list_archivable_transactions(
+    conn: sqlite3.Connection, *, before: str, limit: int = 500, require_confirmation: bool = False
+) -> list[Transaction]:
+    """Finished transactions created before ``before``.
+
+    Rows still settling or holding an unfinished settlement job stay in the
+    hot table. With ``require_confirmation`` (the confirmation tracker is
+    running) so do broadcast rows the tracker has not checked yet; without it
+    nothing would ever fill ``confirmation_status``, so it is not required.
+    """
+    confirmation_guard = "AND (t.tx_hash IS NULL OR t.confirmation_status IS NOT NULL)" if require_confirmation else ""
+    rows = conn.execute(
+        f"""
+        {_SELECT_TRANSACTIONS}
+        WHERE t.created_at < ?
+          AND t.status != 'settling'
+          {confirmation_guard}
+          AND NOT EXISTS (
+            SELECT 1 FROM settlement_jobs j
+            WHERE j.transaction_id = t.transaction_id AND j.status IN ('pending', 'running')
+          )
+        ORDER BY t.created_at ASC, t.id ASC
+        LIMIT ?
+        """,
+        (before, limit),
+    ).fetchall()
+    return [_row_to_transaction(row) for row in rows]
+
+
+@write_operation
+def archive_transactions(conn: sqlite3.Connection, transactions: list[Transaction], *, level: int = 6) -> int:
+    """Copy ``transactions`` into the archive with compressed payloads, then delete them from ``transactions``.
+
+    The archive insert is ``OR REPLACE`` so a pass interrupted between the two
+    databases' commits is simply redone by the next pass. Any failure (e.g.
+    SQLITE_BUSY or an I/O error on the archive file) rolls the batch back.
+    """
+    if not transactions:
+        return 0
+    now = utc_now_iso()
+    columns = [*_ARCHIVE_PLAIN_COLUMNS, *(packed for _, packed in _ARCHIVE_PAYLOAD_COLUMNS), "archived_at"]
+    placeholders = ", ".join("?" for _ in columns)
+    ids = [(tx.transaction_id,) for tx in transactions]
+    try:
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {ARCHIVE_SCHEMA}.archived_transactions ({', '.join(columns)}) VALUES ({placeholders})",
+            [
+                (
+                    *(getattr(tx, column) for column in _ARCHIVE_PLAIN_COLUMNS),
+                    *(compress_text(getattr(tx, column), level) for column, _ in _ARCHIVE_PAYLOAD_COLUMNS),
+                    now,
+                )
+                for tx in transactions
+            ],
+        )
+        conn.executemany("DELETE FROM settlement_jobs WHERE transaction_id = ?", ids)
+        conn.executemany("DELETE FROM transactions WHERE transaction_id = ?", ids)
+        conn.commit()
+    except BaseException:
+        # 失败时必须回滚：否则归档线程一直占着写锁，平台的所有写入都会卡住
+        conn.rollback()
+        raise
+    return len(transactions)
+
+
+def reclaim_free_pages(conn: sqlite3.Connection, *, max_pages: int = 0) -> int:
+    """Run ``PRAGMA incremental_vacuum`` on the main database; returns the free pages left."""
+    conn.execute(f"PRAGMA main.incremental_vacuum({int(max_pages)})").fetchall()
+    conn.commit()
+    return int(conn.execute("PRAGMA main.freelist_count").fetchone()[0])
@@ -0,0 +1,347 @@
+import queue
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+DEFAULT_READ_POOL_SIZE = 4
+DEFAULT_GROUP_COMMIT_WINDOW = 0.002
+DEFAULT_GROUP_COMMIT_MAX = 64
+_GROUP_SAVEPOINT = "group_write"
+
+_WRITE_KEYWORDS = re.compile(r"\b(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b", re.IGNORECASE)
+_LEADING_COMMENTS = re.compile(r"^(\s+|--[^\n]*\n|/\*.*?\*/)+", re.DOTALL)
+# 不带 = 但会改库的 PRAGMA，必须走写连接
+_WRITE_PRAGMAS = re.compile(r"^PRAGMA\s+(\w+\.)?(incremental_vacuum|wal_checkpoint|optimize)\b", re.IGNORECASE)
+
+
+def is_read_statement(sql: str) -> bool:
+    body = _LEADING_COMMENTS.sub("", sql)
+    head = body[:10].upper()
+    if head.startswith("SELECT") or head.startswith("EXPLAIN"):
+        return True
+    if head.startswith("PRAGMA"):
+        # PRAGMA table_info(...) 等查询走读连接；带 = 的是设置
+        return "=" not in body and _WRITE_PRAGMAS.match(body) is None
+    if head.startswith("WITH"):
+        return _WRITE_KEYWORDS.search(body) is None
+    return False
+
+
+class MaterializedCursor:
+    """Fully fetched result of a read, detached from the connection it ran on."""
+
+    def __init__(self, rows: list[sqlite3.Row], description: Any) -> None:
+        self._rows = rows
+        self._pos = 0
+        self.description = description
+        self.rowcount = -1
+        self.lastrowid = None
+
+    def fetchone(self) -> sqlite3.Row | None:
+        if self._pos >= len(self._rows):
+            return None
+        row = self._rows[self._pos]
+        self._pos += 1
+        return row
+
+    def fetchmany(self, size: int = 1) -> list[sqlite3.Row]:
+        rows = self._rows[self._pos : self._pos + size]
+        self._pos += len(rows)
+        return rows
+
+    def fetchall(self) -> list[sqlite3.Row]:
+        rows = self._rows[self._pos :]
+        self._pos = len(self._rows)
+        return rows
+
+    def __iter__(self) -> Iterator[sqlite3.Row]:
+        return iter(self.fetchall())
+
+
+class _WriteJob:
+    __slots__ = ("fn", "args", "kwargs", "done", "result", "error")
+
+    def __init__(self, fn: Callable[..., Any], args: tuple, kwargs: dict) -> None:
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SqliteConnectionManager:
+    """Drop-in replacement for a shared ``sqlite3.Connection``.
+
+    Reads (SELECT / read-only WITH) are checked out on a connection from a
+    bounded reader pool, fully fetched, and the connection is returned, so
+    concurrent requests read in parallel under WAL. Every other statement
+    runs on the single writer connection: the first write of a thread takes
+    the writer lock and holds it until that thread calls ``commit()`` or
+    ``rollback()``, so multi-statement writes stay atomic and reads inside
+    them see their own changes. A failed first statement, or a write that
+    changed nothing, releases the lock immediately; an operation run through
+    ``run_write`` that raises at any later point is rolled back and releases
+    it too, so error paths cannot wedge the writer.
+
+    ``:memory:`` databases cannot be shared between connections; there the
+    writer connection also serves reads (under the same lock).
+
+    With ``group_commit`` enabled, ``run_write`` hands each write operation to
+    a single committer thread that runs up to ``group_commit_max`` queued
+    operations (or whatever arrives within ``group_commit_window`` seconds)
+    in one transaction, each under its own SAVEPOINT, and commits once. An
+    operation that raises is rolled back to its savepoint without affecting
+    the others; every caller gets its own result or exception only after the
+    shared COMMIT has succeeded.
+    """
+
+    def __init__(
+        self,
+        sqlite_path: str,
+        connect: Any,
+        *,
+        read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+        group_commit: bool = False,
+        group_commit_window: float = DEFAULT_GROUP_COMMIT_WINDOW,
+        group_commit_max: int = DEFAULT_GROUP_COMMIT_MAX,
+    ) -> None:
+        self.sqlite_path = sqlite_path
+        self._connect = connect
+        self._writer: sqlite3.Connection = connect(sqlite_path)
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
+        self._shared = sqlite_path == ":memory:" or read_pool_size < 1
+        self.read_pool_size = 0 if self._shared else read_pool_size
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._reader_count = 0
+        self._reader_lock = threading.Lock()
+        self._all_readers: list[sqlite3.Connection] = []
+        self._closed = False
+        self.group_commit = group_commit
+        self.group_commit_window = group_commit_window
+        self.group_commit_max = max(1, group_commit_max)
+        self._jobs: "queue.Queue[_WriteJob | None]" = queue.Queue()
+        self._committer: threading.Thread | None = None
+        self._committer_lock = threading.Lock()
+        self.group_commits = 0
+
+    # -- writer ---------------------------------------------------------
+
+    def _holds_writer(self) -> bool:
+        return getattr(self._local, "writing", False)
+
+    def _acquire_writer(self) -> bool:
+        """Take the writer lock for this thread; True if this call acquired it."""
+        if self._holds_writer():
+            return False
+        self._write_lock.acquire()
+        self._local.writing = True
+        return True
+
+    def _release_writer(self) -> None:
+        if self._holds_writer():
+            self._local.writing = False
+            self._write_lock.release()
+
+    def _write(self, fn: Any, *args: Any) -> Any:
+        fresh = self._acquire_writer()
+        try:
+            cur = fn(*args)
+        except BaseException:
+            if fresh:
+                self._writer.rollback()
+                self._release_writer()
+            raise
+        if fresh and cur.rowcount == 0 and cur.description is None:
+            # 未改动任何行（如 UPDATE 未命中）：调用方可能直接抛错而不 commit，这里提前释放写锁
+            self._writer.commit()
+            self._release_writer()
+        return cur
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._holds_writer() and self._writer.in_transaction
+
+    def commit(self) -> None:
+        if self._in_group():
+            # 组提交中由 committer 统一 COMMIT
+            return
+        if not self._holds_writer():
+            return
+        try:
+            self._writer.commit()
+        finally:
+            self._release_writer()
+
+    def rollback(self) -> None:
+        if self._in_group():
+            self._writer.execute(f"ROLLBACK TO SAVEPOINT {_GROUP_SAVEPOINT}")
+            return
+        if not self._holds_writer():
+            return
+        try:
+            self._writer.rollback()
+        finally:
+            self._release_writer()
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> sqlite3.Cursor:
+        return self._write(self._writer.executemany, sql, seq_of_params)
+
+    def executescript(self, script: str) -> sqlite3.Cursor:
+        fresh = self._acquire_writer()
+        try:
+            cur = self._writer.executescript(script)
+        except BaseException:
+            if fresh:
+                self._writer.rollback()
+                self._release_writer()
+            raise
+        if fresh:
+            # executescript 会先提交挂起的事务，脚本本身自行提交
+            self._release_writer()
+        return cur
+
+    # -- group commit ---------------------------------------------------
+
+    def _in_group(self) -> bool:
+        return getattr(self._local, "grouped", False)
+
+    def run_write(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``fn(*args, **kwargs)`` as one write operation and return its result.
+
+        ``fn`` issues its statements through this manager and calls
+        ``commit()`` as usual. Without group commit (or when the calling
+        thread is already inside a write) it simply runs inline; if it
+        raises, everything it wrote is rolled back and the writer lock is
+        released (a nested call leaves that to the outer operation).
+        """
+        if self._holds_writer():
+            return fn(*args, **kwargs)
+        if not self.group_commit or self._closed:
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                # 第一条之后的语句失败时 _write 不会释放写锁，这里兜底回滚，否则其它线程的写永远阻塞
+                self.rollback()
+                raise
+        self._ensure_committer()
+        job = _WriteJob(fn, args, kwargs)
+        self._jobs.put(job)
+        job.done.wait()
+        if job.error is not None:
+            raise job.error
+        return job.result
+
+    def _ensure_committer(self) -> None:
+        with self._committer_lock:
+            if self._committer is None:
+                self._committer = threading.Thread(target=self._commit_loop, name="sqlite-group-commit", daemon=True)
+                self._committer.start()
+
+    def _collect(self, first: _WriteJob) -> tuple[list[_WriteJob], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.group_commit_window
+        while len(batch) < self.group_commit_max:
+            remaining = deadline - time.monotonic()
+            try:
+                job = self._jobs.get(timeout=remaining) if remaining > 0 else self._jobs.get_nowait()
+            except queue.Empty:
+                break
+            if job is None:
+                return batch, True
+            batch.append(job)
+        return batch, False
+
+    def _commit_loop(self) -> None:
+        stop = False
+        while not stop:
+            first = self._jobs.get()
+            if first is None:
+                return
+            batch, stop = self._collect(first)
+            self._run_group(batch)
+
+    def _run_group(self, batch: list[_WriteJob]) -> None:
+        self._acquire_writer()
+        self._local.grouped = True
+        try:
+            if self._writer.in_transaction:
+                self._writer.commit()
+            self._writer.execute("BEGIN IMMEDIATE")
+            for job in batch:
+                self._writer.execute(f"SAVEPOINT {_GROUP_SAVEPOINT}")
+                try:
+                    job.result = job.fn(*job.args, **job.kwargs)
+                except BaseException as exc:  # noqa: BLE001
+                    job.error = exc
+                    self._writer.execute(f"ROLLBACK TO SAVEPOINT {_GROUP_SAVEPOINT}")
+                self._writer.execute(f"RELEASE SAVEPOINT {_GROUP_SAVEPOINT}")
+            self._writer.commit()
+            self.group_commits += 1
+        except BaseException as exc:  # noqa: BLE001
+            # COMMIT（或 BEGIN）失败：整组回滚，所有调用方都收到该错误
+            if self._writer.in_transaction:
+                self._writer.rollback()
+            for job in batch:
+                if job.error is None:
+                    job.result = None
+                    job.error = exc
+        finally:
+            self._local.grouped = False
+            self._release_writer()
+            for job in batch:
+                job.done.set()
+
+    # -- readers --------------------------------------------------------
+
+    def _checkout_reader(self) -> sqlite3.Connection:
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        with self._reader_lock:
+            if self._reader_count < self.read_pool_size:
+                self._reader_count += 1
+                conn = self._connect(self.sqlite_path)
+                conn.execute("PRAGMA query_only = ON;")
+                self._all_readers.append(conn)
+                return conn
+        return self._readers.get()
+
+    def _read(self, sql: str, params: Sequence[Any]) -> MaterializedCursor:
+        if self._shared:
+            fresh = self._acquire_writer()
+            try:
+                cur = self._writer.execute(sql, params)
+                return MaterializedCursor(cur.fetchall(), cur.description)
+            finally:
+                if fresh:
+                    self._release_writer()
+
+        conn = self._checkout_reader()
+        try:
+            cur = conn.execute(sql, params)
+            return MaterializedCursor(cur.fetchall(), cur.description)
+        finally:
+            self._readers.put(conn)
+
+    # -- sqlite3.Connection surface -----------------------------------
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> Any:
+        if is_read_statement(sql) and not self._holds_writer():
+            return self._read(sql, params)
+        return self._write(self._writer.execute, sql, params)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        if self._committer is not None:
+            self._jobs.put(None)
+            self._committer.join()
+        for conn in self._all_readers:
+            conn.close()
+        self._writer.close()
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import anyio
+
+from contextswap.platform.db import models
+
+DEFAULT_BATCH_SIZE = 500
+
+logger = logging.getLogger(__name__)
+
+
+class TransactionArchiver:
+    """Moves finished transactions older than ``after_days`` into the attached archive database.
+
+    Each pass archives up to ``max_per_pass`` rows in batches of
+    ``batch_size`` (one write transaction per batch, so request writes are
+    never blocked for long), then returns up to ``vacuum_pages`` freed pages
+    to the filesystem with ``PRAGMA incremental_vacuum``. That only shrinks
+    the file when the main database uses ``auto_vacuum = INCREMENTAL``: new
+    databases do, older ones are switched offline with
+    ``python -m contextswap.platform.db.compact <path> --incremental-vacuum``;
+    otherwise freed pages are simply reused.
+
+    ``require_confirmation`` keeps broadcast transactions in the hot table
+    until the confirmation tracker has recorded their on-chain status.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        after_days: float,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_per_pass: int = 5000,
+        vacuum_pages: int = 2000,
+        require_confirmation: bool = False,
+    ) -> None:
+        self.conn = conn
+        self.after_days = after_days
+        self.batch_size = batch_size
+        self.max_per_pass = max_per_pass
+        self.vacuum_pages = vacuum_pages
+        self.require_confirmation = require_confirmation
+
+    def _cutoff(self) -> str:
+        cutoff = datetime.now(timezone.utc) - timedelta(days=self.after_days)
+        return cutoff.replace(microsecond=0).isoformat()
+
+    def run_once(self) -> int:
+        before = self._cutoff()
+        archived = 0
+        while archived < self.max_per_pass:
+            rows = models.list_archivable_transactions(
+                self.conn,
+                before=before,
+                limit=min(self.batch_size, self.max_per_pass - archived),
+                require_confirmation=self.require_confirmation,
+            )
+            if not rows:
+                break
+            archived += models.archive_transactions(self.conn, rows)
+        if archived:
+            models.reclaim_free_pages(self.conn, max_pages=self.vacuum_pages)
+        return archived
+
+    async def run_forever(self, *, poll_interval: float) -> None:
+        while True:
+            try:
+                await anyio.to_thread.run_sync(self.run_once)
+            except Exception:  # noqa: BLE001
+                # 单轮失败不终止后台任务，下个周期重试
+                logger.exception("transaction archive pass failed")
+            await asyncio.sleep(poll_interval)
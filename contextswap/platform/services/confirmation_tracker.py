@@ -0,0 +1,164 @@
+import asyncio
+import json
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Tuple
+
+import anyio
+
+from contextswap.jsonrpc import JsonRpcClient
+from contextswap.platform.db import models
+from contextswap.platform.services.event_bus import EventBus
+from contextswap.tron_client import TronGridClient
+from contextswap.x402 import NETWORK_ID as CONFLUX_NETWORK_ID
+from contextswap.x402_tron import NETWORK_ID as TRON_NETWORK_ID
+
+DEFAULT_BATCH_SIZE = 100
+
+ConfirmationResult = Tuple[str, str, int | None]
+
+
+def _payment_network(tx: models.Transaction) -> str:
+    try:
+        requirements = json.loads(tx.requirements_json)
+        network = requirements.get("accepts", [{}])[0].get("network")
+    except Exception:  # noqa: BLE001
+        network = None
+    return "tron" if network == TRON_NETWORK_ID else "conflux"
+
+
+def _hex_hash(tx_hash: str) -> str:
+    return tx_hash if tx_hash.startswith("0x") else f"0x{tx_hash}"
+
+
+class ConfirmationTracker:
+    """Resolves the on-chain outcome of settled transactions, one pass per interval.
+
+    Each pass loads every transaction with a ``tx_hash`` and no
+    ``confirmation_status`` and checks them together: Conflux receipts in
+    batched ``eth_getTransactionReceipt`` JSON-RPC requests, Tron via
+    ``/wallet/gettransactioninfobyid``. Rows move to ``confirmed`` or
+    ``failed``; a hash the chain still does not know after ``timeout_seconds``
+    is marked ``failed`` (dropped from the mempool). Only payments on a
+    network with a configured client are loaded.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        conflux_rpc: JsonRpcClient | None,
+        tron_client: TronGridClient | None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        timeout_seconds: float = 900.0,
+        max_per_pass: int = 500,
+        events: EventBus | None = None,
+    ) -> None:
+        self.conn = conn
+        self.conflux_rpc = conflux_rpc
+        self.tron_client = tron_client
+        self.batch_size = batch_size
+        self.timeout_seconds = timeout_seconds
+        self.max_per_pass = max_per_pass
+        self.events = events
+
+    def _expired(self, tx: models.Transaction, now: datetime) -> bool:
+        try:
+            created = datetime.fromisoformat(tx.created_at)
+        except ValueError:
+            return False
+        return now - created > timedelta(seconds=self.timeout_seconds)
+
+    def _check_conflux(self, txs: List[models.Transaction]) -> Dict[str, Tuple[str, int | None]]:
+        outcomes: Dict[str, Tuple[str, int | None]] = {}
+        for start in range(0, len(txs), self.batch_size):
+            chunk = txs[start : start + self.batch_size]
+            receipts = self.conflux_rpc.batch(  # type: ignore[union-attr]
+                [("eth_getTransactionReceipt", [_hex_hash(tx.tx_hash or "")]) for tx in chunk]
+            )
+            for tx, receipt in zip(chunk, receipts):
+                if not isinstance(receipt, dict):
+                    continue
+                block = receipt.get("blockNumber")
+                block_number = int(block, 16) if isinstance(block, str) else block
+                status = "confirmed" if int(str(receipt.get("status", "0x1")), 16) == 1 else "failed"
+                outcomes[tx.transaction_id] = (status, block_number)
+        return outcomes
+
+    def _check_tron(
+        self, txs: List[models.Transaction]
+    ) -> Tuple[Dict[str, Tuple[str, int | None]], List[models.Transaction]]:
+        outcomes: Dict[str, Tuple[str, int | None]] = {}
+        reached: List[models.Transaction] = []
+        for tx in txs:
+            try:
+                info: Dict[str, Any] = self.tron_client.post(  # type: ignore[union-attr]
+                    "/wallet/gettransactioninfobyid",
+                    {"value": (tx.tx_hash or "").removeprefix("0x")},
+                )
+            except Exception:  # noqa: BLE001
+                continue
+            reached.append(tx)
+            if not info or "blockNumber" not in info:
+                continue
+            receipt_result = (info.get("receipt") or {}).get("result")
+            failed = info.get("result") == "FAILED" or receipt_result not in (None, "SUCCESS")
+            outcomes[tx.transaction_id] = ("failed" if failed else "confirmed", info.get("blockNumber"))
+        return outcomes, reached
+
+    def _networks(self) -> List[str] | None:
+        """Networks this tracker can check; ``None`` when it can check all of them."""
+        if self.conflux_rpc is not None and self.tron_client is not None:
+            return None
+        networks = []
+        if self.conflux_rpc is not None:
+            networks.append(CONFLUX_NETWORK_ID)
+        if self.tron_client is not None:
+            networks.append(TRON_NETWORK_ID)
+        return networks
+
+    def run_once(self) -> int:
+        pending = models.list_unconfirmed_transactions(self.conn, limit=self.max_per_pass, networks=self._networks())
+        if not pending:
+            return 0
+
+        outcomes: Dict[str, Tuple[str, int | None]] = {}
+        checked: List[models.Transaction] = []
+        if self.conflux_rpc is not None:
+            conflux = [tx for tx in pending if _payment_network(tx) == "conflux"]
+            try:
+                outcomes.update(self._check_conflux(conflux))
+                checked.extend(conflux)
+            except Exception:  # noqa: BLE001
+                # 本轮 RPC 失败：下个周期重试，不把交易标成失败
+                pass
+        if self.tron_client is not None:
+            tron_outcomes, reached = self._check_tron([tx for tx in pending if _payment_network(tx) == "tron"])
+            outcomes.update(tron_outcomes)
+            checked.extend(reached)
+
+        now = datetime.now(timezone.utc)
+        results: List[ConfirmationResult] = []
+        for tx in checked:
+            outcome = outcomes.get(tx.transaction_id)
+            if outcome is not None:
+                results.append((tx.transaction_id, outcome[0], outcome[1]))
+            elif self._expired(tx, now):
+                results.append((tx.transaction_id, "failed", None))
+        updated = models.set_confirmation_results(self.conn, results)
+        if self.events is not None:
+            for transaction_id, status, block in results:
+                self.events.publish(
+                    "transaction",
+                    {"transaction_id": transaction_id, "confirmation_status": status, "confirmation_block": block},
+                )
+        return updated
+
+    async def run_forever(self, *, poll_interval: float) -> None:
+        while True:
+            try:
+                await anyio.to_thread.run_sync(self.run_once)
+            except Exception:  # noqa: BLE001
+                # 单轮失败（如数据库锁）不终止后台任务，下个周期重试
+                pass
+            await asyncio.sleep(poll_interval)
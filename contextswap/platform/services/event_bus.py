@@ -0,0 +1,105 @@
+import asyncio
+import itertools
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+DEFAULT_MAX_EVENTS = 1024
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: dict
+
+    def encode(self) -> bytes:
+        """One Server-Sent Events frame."""
+        payload = json.dumps(self.data, separators=(",", ":"), ensure_ascii=False)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n".encode("utf-8")
+
+
+class EventBus:
+    """In-memory feed of status-change events with a bounded replay buffer.
+
+    ``publish`` may be called from any thread (worker threads, background
+    tasks, tg_manager callbacks); subscribers are woken on their own event
+    loop. The last ``max_events`` events are kept so a reconnecting client
+    can resume from its ``Last-Event-ID``. Ids restart at 1 with the
+    process, so a resume point that is older than the buffer, or newer than
+    the latest event, is reported as a gap and the client must reload.
+    """
+
+    def __init__(self, *, max_events: int = DEFAULT_MAX_EVENTS) -> None:
+        self.max_events = max(1, max_events)
+        self._events: "deque[Event]" = deque(maxlen=self.max_events)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._waiters: set[tuple[asyncio.AbstractEventLoop, asyncio.Event]] = set()
+
+    @property
+    def last_id(self) -> int:
+        with self._lock:
+            return self._events[-1].id if self._events else 0
+
+    def publish(self, type: str, data: dict) -> Event:
+        with self._lock:
+            event = Event(id=next(self._ids), type=type, data=data)
+            self._events.append(event)
+            waiters = list(self._waiters)
+        for loop, wakeup in waiters:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                # 订阅方的事件循环已关闭
+                pass
+        return event
+
+    def _since(self, last_id: int) -> tuple[list[Event], bool, int]:
+        with self._lock:
+            latest = self._events[-1].id if self._events else 0
+            first = self._events[0].id if self._events else latest + 1
+            if last_id > latest or last_id < first - 1:
+                return [], True, latest
+            return [e for e in self._events if e.id > last_id], False, latest
+
+    def since(self, last_id: int) -> tuple[list[Event], bool]:
+        """Events after ``last_id``, or ``([], True)`` when some were already dropped or ``last_id`` is unknown."""
+        events, gap, _ = self._since(last_id)
+        return events, gap
+
+    async def subscribe(self, last_id: int | None = None, *, keepalive: float = 15.0) -> AsyncIterator[Any]:
+        """Yield events after ``last_id`` (only new ones when ``None``), then live ones as they are published.
+
+        Yields a ``reset`` event (id and ``last_event_id`` = the new resume
+        point) when the old one is no longer in the buffer, so the client
+        reloads and resumes from there, and ``None`` after ``keepalive``
+        seconds without events.
+        """
+        wakeup = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), wakeup)
+        with self._lock:
+            self._waiters.add(waiter)
+        try:
+            cursor = self.last_id if last_id is None else last_id
+            while True:
+                wakeup.clear()
+                events, gap, latest = self._since(cursor)
+                if gap:
+                    cursor = latest
+                    yield Event(id=latest, type="reset", data={"last_event_id": latest})
+                    continue
+                for event in events:
+                    cursor = event.id
+                    yield event
+                if events:
+                    continue
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
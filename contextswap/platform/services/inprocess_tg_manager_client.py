@@ -88,18 +88,18 @@ class InProcessTgManagerClient:
         self.conn = connect_sqlite(sqlite_path)
         init_db(self.conn)
 
-    def create_session(
+    def _create_session_coro(
         self,
         *,
         transaction_id: str,
         buyer_bot_username: str,
         seller_bot_username: str,
         initial_prompt: str,
-        market_slug: str | None = None,
-        question_dir: str | None = None,
-        wait_seconds: int | None = None,
-        force_reinject: bool = False,
-    ) -> dict:
+        market_slug: str | None,
+        question_dir: str | None,
+        wait_seconds: int | None,
+        force_reinject: bool,
+    ):
         if self.telegram is None:
             raise SessionClientError(
                 "telethon is not configured "
@@ -124,18 +124,66 @@ class InProcessTgManagerClient:
             "telegram_stub": False,
         }
 
+        return create_or_resume_session_with_telegram(
+            self.conn,
+            transaction_id=tx,
+            incoming_metadata_json=json.dumps(metadata, ensure_ascii=False),
+            market_chat_id=self.market_chat_id,
+            telegram=self.telegram,  # type: ignore[arg-type]
+            force_reinject=bool(force_reinject),
+        )
+
+    def create_session(
+        self,
+        *,
+        transaction_id: str,
+        buyer_bot_username: str,
+        seller_bot_username: str,
+        initial_prompt: str,
+        market_slug: str | None = None,
+        question_dir: str | None = None,
+        wait_seconds: int | None = None,
+        force_reinject: bool = False,
+    ) -> dict:
         session = _run_async(
-            create_or_resume_session_with_telegram(
-                self.conn,
-                transaction_id=tx,
-                incoming_metadata_json=json.dumps(metadata, ensure_ascii=False),
-                market_chat_id=self.market_chat_id,
-                telegram=self.telegram,  # type: ignore[arg-type]
-                force_reinject=bool(force_reinject),
+            self._create_session_coro(
+                transaction_id=transaction_id,
+                buyer_bot_username=buyer_bot_username,
+                seller_bot_username=seller_bot_username,
+                initial_prompt=initial_prompt,
+                market_slug=market_slug,
+                question_dir=question_dir,
+                wait_seconds=wait_seconds,
+                force_reinject=force_reinject,
             )
         )
         return _session_to_dict(session)
 
+    async def acreate_session(
+        self,
+        *,
+        transaction_id: str,
+        buyer_bot_username: str,
+        seller_bot_username: str,
+        initial_prompt: str,
+        market_slug: str | None = None,
+        question_dir: str | None = None,
+        wait_seconds: int | None = None,
+        force_reinject: bool = False,
+    ) -> dict:
+        # 异步路由已在主事件循环上，直接 await，无需经 worker thread 回跳
+        session = await self._create_session_coro(
+            transaction_id=transaction_id,
+            buyer_bot_username=buyer_bot_username,
+            seller_bot_username=seller_bot_username,
+            initial_prompt=initial_prompt,
+            market_slug=market_slug,
+            question_dir=question_dir,
+            wait_seconds=wait_seconds,
+            force_reinject=force_reinject,
+        )
+        return _session_to_dict(session)
+
     def get_session(self, *, transaction_id: str) -> dict:
         tx = (transaction_id or "").strip()
         if not tx:
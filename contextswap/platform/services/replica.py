@@ -0,0 +1,101 @@
+import asyncio
+import os
+import sqlite3
+import threading
+
+import anyio
+
+from contextswap.platform.db.engine import connect_replica
+from contextswap.platform.db.pool import DEFAULT_READ_POOL_SIZE, SqliteConnectionManager
+
+DEFAULT_PAGES_PER_STEP = 1024
+
+
+class ReadReplica:
+    """Periodically copies the platform database into a read-only replica file.
+
+    Each refresh opens its own connection to the primary, pins a WAL read
+    snapshot and copies it with ``sqlite3.Connection.backup`` ``pages`` pages
+    per step. A WAL reader never blocks the writer, and because the
+    snapshot is pinned, concurrent writes do not restart the copy. The copy
+    is written to a temporary file and swapped in with ``os.replace``;
+    ``db`` then serves reads from a fresh pool on the new file. Until the
+    first refresh completes ``db`` is ``None`` and callers read the primary.
+    """
+
+    def __init__(
+        self,
+        source_path: str,
+        replica_path: str,
+        *,
+        pages: int = DEFAULT_PAGES_PER_STEP,
+        read_pool_size: int = DEFAULT_READ_POOL_SIZE,
+    ) -> None:
+        self.source_path = source_path
+        self.replica_path = replica_path
+        self.pages = pages
+        self.read_pool_size = read_pool_size
+        self.refreshes = 0
+        self._db: SqliteConnectionManager | None = None
+        self._retired: SqliteConnectionManager | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def db(self) -> SqliteConnectionManager | None:
+        return self._db
+
+    def refresh(self) -> int:
+        """Copy the current primary snapshot into the replica; returns the page count copied."""
+        tmp_path = f"{self.replica_path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        parent = os.path.dirname(os.path.abspath(self.replica_path))
+        os.makedirs(parent, exist_ok=True)
+
+        source = sqlite3.connect(self.source_path, isolation_level=None)
+        target = sqlite3.connect(tmp_path)
+        total = 0
+        try:
+            # 读事务固定 WAL 快照：写入方照常提交，备份也不会因源库变化而重启
+            source.execute("BEGIN")
+            source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+
+            def progress(status: int, remaining: int, page_count: int) -> None:
+                nonlocal total
+                total = page_count
+
+            source.backup(target, pages=self.pages, progress=progress)
+            source.execute("COMMIT")
+            # 副本只读且整体替换，不需要 WAL
+            target.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            target.close()
+            source.close()
+        os.replace(tmp_path, self.replica_path)
+
+        fresh = SqliteConnectionManager(self.replica_path, connect_replica, read_pool_size=self.read_pool_size)
+        with self._lock:
+            # 上一代连接池延后一轮再关闭，给仍在使用它的请求留出时间
+            retired, self._retired = self._retired, self._db
+            self._db = fresh
+            self.refreshes += 1
+        if retired is not None:
+            retired.close()
+        return total
+
+    async def run_forever(self, *, poll_interval: float) -> None:
+        while True:
+            try:
+                await anyio.to_thread.run_sync(self.refresh)
+            except Exception:  # noqa: BLE001
+                # 单轮失败不终止后台任务，继续使用上一份副本，下个周期重试
+                pass
+            await asyncio.sleep(poll_interval)
+
+    def close(self) -> None:
+        with self._lock:
+            managers = (self._db, self._retired)
+            self._db = self._retired = None
+        for manager in managers:
+            if manager is not None:
+                manager.close()
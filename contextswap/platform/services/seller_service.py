@@ -165,12 +165,36 @@ def list_sellers(
     limit: int = 100,
     offset: int = 0,
     status: str | None = None,
+    cursor: str | None = None,
 ) -> list[models.Seller]:
-    return models.list_sellers(conn, limit=limit, offset=offset, status=status)
+    return models.list_sellers(conn, limit=limit, offset=offset, status=status, cursor=cursor)
 
 
-def search_sellers(conn: sqlite3.Connection, *, keyword: str) -> list[models.Seller]:
-    return models.search_sellers(conn, keyword=keyword)
+def search_sellers(
+    conn: sqlite3.Connection,
+    *,
+    keyword: str,
+    limit: int = 100,
+    offset: int = 0,
+) -> list[models.Seller]:
+    return models.search_sellers(conn, keyword=keyword, limit=limit, offset=offset)
+
+
+def find_sellers_by_keywords(
+    conn: sqlite3.Connection,
+    *,
+    all_keywords: list[str] | str | None = None,
+    any_keywords: list[str] | str | None = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> list[models.Seller]:
+    return models.find_sellers_by_keywords(
+        conn,
+        all_keywords=_normalize_keywords(all_keywords),
+        any_keywords=_normalize_keywords(any_keywords),
+        limit=limit,
+        offset=offset,
+    )
 
 
 def seller_to_full_dict(seller: models.Seller) -> dict:
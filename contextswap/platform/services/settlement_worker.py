@@ -0,0 +1,168 @@
+import asyncio
+import json
+import re
+import sqlite3
+from datetime import datetime, timedelta, timezone
+
+import anyio
+
+from contextswap.facilitator.base import FacilitatorClient
+from contextswap.platform.db import models
+from contextswap.platform.services import transaction_service
+from contextswap.platform.services.event_bus import EventBus
+from contextswap.platform.services.session_client import SessionManagerClient
+
+MAX_BACKOFF_SECONDS = 60
+# 节点已收到同一笔交易（上次广播成功但客户端超时等）：geth "already known" / "known transaction"，
+# Conflux "tx already exist"，TronGrid DUP_TRANSACTION_ERROR
+_ALREADY_BROADCAST = re.compile(
+    r"already known|known transaction|already exist|already imported|DUP_TRANSACTION", re.IGNORECASE
+)
+
+
+def already_broadcast(exc: BaseException) -> bool:
+    """True if a broadcast error means the node already has this exact transaction."""
+    return _ALREADY_BROADCAST.search(str(exc)) is not None
+
+
+def _retry_at(attempts: int) -> str:
+    delay = min(MAX_BACKOFF_SECONDS, 2 ** max(0, attempts - 1))
+    return (datetime.now(timezone.utc) + timedelta(seconds=delay)).replace(microsecond=0).isoformat()
+
+
+class SettlementWorker:
+    """Settles `settling` transactions from the durable `settlement_jobs` queue.
+
+    The queue lives in the platform SQLite database, so jobs enqueued before a
+    restart are picked up again by `recover()`. Each job broadcasts the stored
+    payment, marks the transaction `paid`, then opens the Telegram session.
+    """
+
+    def __init__(
+        self,
+        conn: sqlite3.Connection,
+        *,
+        facilitators: dict[str, FacilitatorClient],
+        tg_manager: SessionManagerClient | None,
+        batch_size: int = 20,
+        max_attempts: int = 5,
+        events: EventBus | None = None,
+    ) -> None:
+        self.conn = conn
+        self.facilitators = facilitators
+        self.tg_manager = tg_manager
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.events = events
+        self._wakeup: asyncio.Event | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def recover(self) -> int:
+        """Requeue jobs interrupted mid-flight and settling rows that never got a job."""
+        recovered = models.reset_running_settlement_jobs(self.conn)
+        for tx in models.list_transactions_without_settlement_job(self.conn, status="settling"):
+            transaction_service.enqueue_settlement(
+                self.conn,
+                transaction_id=tx.transaction_id,
+                payment_network=transaction_service.transaction_to_dict(tx)["payment_network"] or "conflux",
+            )
+            recovered += 1
+        return recovered
+
+    def run_once(self) -> int:
+        jobs = models.claim_due_settlement_jobs(self.conn, limit=self.batch_size)
+        for job in jobs:
+            self._process(job)
+        return len(jobs)
+
+    def _process(self, job: models.SettlementJob) -> None:
+        tx = models.get_transaction_by_id(self.conn, transaction_id=job.transaction_id)
+        if tx is None or tx.status != "settling":
+            models.update_settlement_job_fields(self.conn, transaction_id=job.transaction_id, fields={"status": "done"})
+            return
+
+        attempts = job.attempts + 1
+        try:
+            facilitator = self.facilitators.get(job.payment_network)
+            if facilitator is None:
+                raise RuntimeError(f"facilitator for {job.payment_network} is not configured")
+            payment_payload = json.loads(tx.payment_payload_json)
+            requirements = json.loads(tx.requirements_json)
+            tx_hash = facilitator.settle_payment(payment_payload, requirements)
+        except Exception as exc:  # noqa: BLE001
+            if not already_broadcast(exc):
+                self._record_failure(job, attempts, exc)
+                return
+            # transaction_id 就是该笔支付的链上哈希（compute_payment_id），按已结算处理
+            tx_hash = tx.transaction_id
+
+        settled = transaction_service.mark_settled(
+            self.conn, transaction_id=job.transaction_id, tx_hash=tx_hash or tx.transaction_id
+        )
+        models.update_settlement_job_fields(
+            self.conn,
+            transaction_id=job.transaction_id,
+            fields={"status": "done", "attempts": attempts, "last_error": None},
+        )
+        transaction_service.publish_transaction(self.events, settled)
+
+        if self.tg_manager is not None:
+            metadata = json.loads(tx.metadata_json) if tx.metadata_json else {}
+            try:
+                opened, _ = transaction_service.open_session(
+                    self.conn,
+                    self.tg_manager,
+                    transaction_id=job.transaction_id,
+                    metadata=metadata,
+                )
+                transaction_service.publish_transaction(self.events, opened)
+            except Exception:  # noqa: BLE001
+                # 已由 open_session 记录 error_reason；交易保持 paid，可通过 tg_manager 重试
+                pass
+
+    def _record_failure(self, job: models.SettlementJob, attempts: int, exc: BaseException) -> None:
+        if attempts >= self.max_attempts:
+            models.update_settlement_job_fields(
+                self.conn,
+                transaction_id=job.transaction_id,
+                fields={"status": "failed", "attempts": attempts, "last_error": str(exc)},
+            )
+            failed = transaction_service.record_settlement_failure(
+                self.conn,
+                transaction_id=job.transaction_id,
+                error_reason=str(exc),
+            )
+            transaction_service.publish_transaction(self.events, failed)
+        else:
+            models.update_settlement_job_fields(
+                self.conn,
+                transaction_id=job.transaction_id,
+                fields={
+                    "status": "pending",
+                    "attempts": attempts,
+                    "last_error": str(exc),
+                    "next_attempt_at": _retry_at(attempts),
+                },
+            )
+
+    def notify(self) -> None:
+        """Wake the background loop early (safe to call from worker threads)."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run_forever(self, *, poll_interval: float) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                processed = await anyio.to_thread.run_sync(self.run_once)
+            except Exception:  # noqa: BLE001
+                # 单轮失败不终止后台任务；被认领的 job 在下次启动时由 recover() 放回队列
+                processed = 0
+            if processed:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
@@ -0,0 +1,42 @@
+import sqlite3
+
+from contextswap.platform.db import models
+
+DEFAULT_STATS_DAYS = 14
+
+
+def _summarize(counters: list[models.StatCounter]) -> dict:
+    counters = [c for c in counters if c.count > 0]
+    total = sum(c.count for c in counters)
+    volume = sum(c.volume_wei for c in counters)
+    return {
+        "total": total,
+        "volume_wei": volume,
+        "avg_price_wei": volume // total if total else 0,
+        "by_status": {c.key: {"count": c.count, "volume_wei": c.volume_wei} for c in counters},
+    }
+
+
+def market_stats(conn: sqlite3.Connection, *, days: int = DEFAULT_STATS_DAYS) -> dict:
+    """Marketplace totals read from the trigger-maintained counters (cost independent of history size)."""
+    sellers = {
+        c.key: c.count for c in models.list_market_stats(conn, kind="seller_status") if c.count > 0
+    }
+    daily = models.list_market_stats(conn, kind="transaction_day", limit=days)
+    return {
+        "sellers": {"total": sum(sellers.values()), "active": sellers.get("active", 0), "by_status": sellers},
+        "transactions": _summarize(models.list_market_stats(conn, kind="transaction_status")),
+        "daily": [
+            {"date": c.key, "count": c.count, "volume_wei": c.volume_wei} for c in reversed(daily)
+        ],
+    }
+
+
+def seller_stats(conn: sqlite3.Connection, *, seller_id: str) -> dict:
+    counters = models.list_seller_stats(conn, seller_id=seller_id)
+    last = [c.last_transaction_at for c in counters if c.last_transaction_at]
+    return {
+        "seller_id": seller_id,
+        "transactions": _summarize(counters),
+        "last_transaction_at": max(last) if last else None,
+    }
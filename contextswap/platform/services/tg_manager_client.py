@@ -3,13 +3,45 @@ import httpx
 from contextswap.platform.services.session_client import SessionClientError, SessionClientNotFound
 
 
+def _create_payload(
+    *,
+    transaction_id: str,
+    buyer_bot_username: str,
+    seller_bot_username: str,
+    initial_prompt: str,
+    market_slug: str | None = None,
+    question_dir: str | None = None,
+    wait_seconds: int | None = None,
+    force_reinject: bool = False,
+) -> dict:
+    return {
+        "transaction_id": transaction_id,
+        "buyer_bot_username": buyer_bot_username,
+        "seller_bot_username": seller_bot_username,
+        "initial_prompt": initial_prompt,
+        "market_slug": market_slug,
+        "question_dir": question_dir,
+        "wait_seconds": wait_seconds,
+        "force_reinject": force_reinject,
+    }
+
+
 class TgManagerClient:
-    def __init__(self, base_url: str, auth_token: str, *, client: httpx.Client | None = None) -> None:
+    def __init__(
+        self,
+        base_url: str,
+        auth_token: str,
+        *,
+        client: httpx.Client | None = None,
+        async_client: httpx.AsyncClient | None = None,
+    ) -> None:
         self.base_url = base_url.rstrip("/")
         self.auth_token = auth_token.strip()
         if not self.auth_token:
             raise ValueError("tg_manager auth_token is required")
         self._client = client or httpx.Client(timeout=10)
+        # 异步客户端在第一次 acreate_session 时创建（需在事件循环内）
+        self._async_client = async_client
 
     def create_session(
         self,
@@ -23,16 +55,16 @@ class TgManagerClient:
         wait_seconds: int | None = None,
         force_reinject: bool = False,
     ) -> dict:
-        payload = {
-            "transaction_id": transaction_id,
-            "buyer_bot_username": buyer_bot_username,
-            "seller_bot_username": seller_bot_username,
-            "initial_prompt": initial_prompt,
-            "market_slug": market_slug,
-            "question_dir": question_dir,
-            "wait_seconds": wait_seconds,
-            "force_reinject": force_reinject,
-        }
+        payload = _create_payload(
+            transaction_id=transaction_id,
+            buyer_bot_username=buyer_bot_username,
+            seller_bot_username=seller_bot_username,
+            initial_prompt=initial_prompt,
+            market_slug=market_slug,
+            question_dir=question_dir,
+            wait_seconds=wait_seconds,
+            force_reinject=force_reinject,
+        )
         resp = self._client.post(
             f"{self.base_url}/v1/session/create",
             headers={"Authorization": f"Bearer {self.auth_token}"},
@@ -42,6 +74,39 @@ class TgManagerClient:
             raise SessionClientError(resp.text)
         return resp.json()
 
+    async def acreate_session(
+        self,
+        *,
+        transaction_id: str,
+        buyer_bot_username: str,
+        seller_bot_username: str,
+        initial_prompt: str,
+        market_slug: str | None = None,
+        question_dir: str | None = None,
+        wait_seconds: int | None = None,
+        force_reinject: bool = False,
+    ) -> dict:
+        payload = _create_payload(
+            transaction_id=transaction_id,
+            buyer_bot_username=buyer_bot_username,
+            seller_bot_username=seller_bot_username,
+            initial_prompt=initial_prompt,
+            market_slug=market_slug,
+            question_dir=question_dir,
+            wait_seconds=wait_seconds,
+            force_reinject=force_reinject,
+        )
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(timeout=10)
+        resp = await self._async_client.post(
+            f"{self.base_url}/v1/session/create",
+            headers={"Authorization": f"Bearer {self.auth_token}"},
+            json=payload,
+        )
+        if resp.status_code != 200:
+            raise SessionClientError(resp.text)
+        return resp.json()
+
     def get_session(self, *, transaction_id: str) -> dict:
         resp = self._client.get(
             f"{self.base_url}/v1/session/{transaction_id}",
@@ -70,3 +135,8 @@ class TgManagerClient:
 
     def close(self) -> None:
         self._client.close()
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
@@ -0,0 +1,99 @@
+import csv
+import io
+import json
+import sqlite3
+from datetime import datetime, timezone
+from typing import Callable, Iterator
+
+from contextswap.platform.db import models
+from contextswap.platform.services.transaction_service import transaction_to_dict
+
+DEFAULT_BATCH_SIZE = 500
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+CSV_COLUMNS = (
+    "transaction_id",
+    "seller_id",
+    "buyer_address",
+    "price_wei",
+    "payment_chain",
+    "payment_network",
+    "status",
+    "tx_hash",
+    "chat_id",
+    "message_thread_id",
+    "metadata",
+    "error_reason",
+    "confirmation_status",
+    "confirmation_block",
+    "created_at",
+    "updated_at",
+)
+
+
+def parse_timestamp(value: str | None) -> str | None:
+    """Normalize an ISO 8601 date/datetime to the UTC form stored in ``created_at``; naive values are UTC."""
+    if value is None or not value.strip():
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip())
+    except ValueError as exc:
+        raise ValueError(f"invalid timestamp: {value}") from exc
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+
+def _ndjson_chunk(items: list[dict]) -> bytes:
+    return "".join(json.dumps(item, separators=(",", ":"), ensure_ascii=False) + "\n" for item in items).encode(
+        "utf-8"
+    )
+
+
+def _csv_chunk(items: list[dict], *, header: bool) -> bytes:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    if header:
+        writer.writerow(CSV_COLUMNS)
+    for item in items:
+        item["metadata"] = json.dumps(item["metadata"], separators=(",", ":"), ensure_ascii=False)
+        writer.writerow(["" if item[col] is None else item[col] for col in CSV_COLUMNS])
+    return buf.getvalue().encode("utf-8")
+
+
+def iter_export(
+    connect: Callable[[], sqlite3.Connection],
+    *,
+    fmt: str,
+    since: str | None = None,
+    until: str | None = None,
+    status: str | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """Yield the export body one batch of ``batch_size`` rows at a time.
+
+    Rows are read oldest first in keyset batches, so memory stays bounded by
+    one batch however many rows match, and no read transaction is held open
+    between batches. ``connect`` is called once per batch: a long export
+    keeps following the read replica across refreshes instead of holding
+    on to a retired pool.
+    """
+    if fmt not in MEDIA_TYPES:
+        raise ValueError(f"format must be one of: {', '.join(MEDIA_TYPES)}")
+    if fmt == "csv":
+        # 无数据时也输出表头
+        yield _csv_chunk([], header=True)
+    after = None
+    while True:
+        batch = models.list_transactions_range(
+            connect(), since=since, until=until, status=status, after=after, limit=batch_size
+        )
+        if not batch:
+            return
+        items = [transaction_to_dict(t) for t in batch]
+        yield _ndjson_chunk(items) if fmt == "ndjson" else _csv_chunk(items, header=False)
+        if len(batch) < batch_size:
+            return
+        after = (batch[-1].created_at, batch[-1].id)
@@ -1,11 +1,17 @@
+import functools
 import json
 import sqlite3
 import uuid
 
+import anyio
 from web3 import Web3
 
+from contextswap.evm import decode_raw_transaction
 from contextswap.facilitator.base import FacilitatorClient
+from contextswap.facilitator.client import AsyncHTTPFacilitatorClient
 from contextswap.platform.db import models
+from contextswap.platform.services.event_bus import EventBus
+from contextswap.platform.services.session_client import SessionManagerClient
 from contextswap.x402 import NETWORK_ID as CONFLUX_NETWORK_ID, b64encode_json, make_requirements
 from contextswap.x402_tron import NETWORK_ID as TRON_NETWORK_ID, make_requirements as make_tron_requirements
 
@@ -61,21 +67,81 @@ def compute_payment_id(payment_payload: dict, *, network: str = "conflux") -> st
         if not txid:
             raise ValueError("Missing txID in Tron transaction")
         return str(txid)
-    raw_tx = payment_payload.get("rawTransaction", "")
-    return compute_tx_hash(raw_tx)
+    raw_tx = (payment_payload.get("rawTransaction") or "").strip()
+    if not raw_tx:
+        raise ValueError("rawTransaction is required")
+    # 解码结果写入 evm 共享缓存，随后的 facilitator verify 直接命中，不再重复恢复签名
+    return decode_raw_transaction(raw_tx)["hash"]
 
 
-def verify_and_settle_payment(
+def verify_payment(
     facilitator_client: FacilitatorClient,
     payment_payload: dict,
     requirements: dict,
-) -> str:
+) -> dict:
     verify_resp = facilitator_client.verify_payment(payment_payload, requirements)
     if not verify_resp.get("verified", True):
         raise ValueError("payment verification failed")
+    return verify_resp
+
+
+def verify_and_settle_payment(
+    facilitator_client: FacilitatorClient,
+    payment_payload: dict,
+    requirements: dict,
+) -> str:
+    combined = getattr(facilitator_client, "verify_and_settle_payment", None)
+    if combined is not None:
+        # 单次往返：facilitator 只解码/恢复签名一次
+        result = combined(payment_payload, requirements)
+        if not result.get("verified", True):
+            raise ValueError("payment verification failed")
+        return str(result.get("txHash") or "")
+
+    verify_payment(facilitator_client, payment_payload, requirements)
     return facilitator_client.settle_payment(payment_payload, requirements)
 
 
+def _async_facilitator(facilitator_client: FacilitatorClient) -> AsyncHTTPFacilitatorClient | None:
+    if isinstance(facilitator_client, AsyncHTTPFacilitatorClient):
+        return facilitator_client
+    # EventLoopFacilitatorClient 包装的连接池客户端可以直接 await
+    inner = getattr(facilitator_client, "client", None)
+    return inner if isinstance(inner, AsyncHTTPFacilitatorClient) else None
+
+
+async def averify_payment(
+    facilitator_client: FacilitatorClient,
+    payment_payload: dict,
+    requirements: dict,
+) -> dict:
+    """Async ``verify_payment``: awaits pooled HTTP clients, runs blocking ones in a worker thread."""
+    client = _async_facilitator(facilitator_client)
+    if client is None:
+        return await anyio.to_thread.run_sync(verify_payment, facilitator_client, payment_payload, requirements)
+    verify_resp = await client.verify_payment(payment_payload, requirements)
+    if not verify_resp.get("verified", True):
+        raise ValueError("payment verification failed")
+    return verify_resp
+
+
+async def averify_and_settle_payment(
+    facilitator_client: FacilitatorClient,
+    payment_payload: dict,
+    requirements: dict,
+) -> str:
+    """Async ``verify_and_settle_payment``; only blocking (direct RPC) facilitators take a worker thread."""
+    client = _async_facilitator(facilitator_client)
+    if client is None:
+        return await anyio.to_thread.run_sync(
+            verify_and_settle_payment, facilitator_client, payment_payload, requirements
+        )
+    result = await client.verify_and_settle_payment(payment_payload, requirements)
+    if not result.get("verified", True):
+        raise ValueError("payment verification failed")
+    return str(result.get("txHash") or "")
+
+
 def create_transaction(
     conn: sqlite3.Connection,
     *,
@@ -85,8 +151,9 @@ def create_transaction(
     price_wei: int,
     payment_payload: dict,
     requirements: dict,
-    tx_hash: str,
+    tx_hash: str | None,
     metadata: dict,
+    status: str = "paid",
 ) -> models.Transaction:
     existing = models.get_transaction_by_id(conn, transaction_id=transaction_id)
     if existing is not None:
@@ -98,7 +165,7 @@ def create_transaction(
         seller_id=seller.seller_id,
         buyer_address=buyer_address,
         price_wei=int(price_wei),
-        status="paid",
+        status=status,
         payment_payload_json=json.dumps(payment_payload, separators=(",", ":")),
         requirements_json=json.dumps(requirements, separators=(",", ":")),
         tx_hash=tx_hash,
@@ -109,6 +176,116 @@ def create_transaction(
     )
 
 
+def enqueue_settlement(
+    conn: sqlite3.Connection,
+    *,
+    transaction_id: str,
+    payment_network: str,
+) -> models.SettlementJob:
+    existing = models.get_settlement_job(conn, transaction_id=transaction_id)
+    if existing is not None:
+        return existing
+    return models.create_settlement_job(
+        conn,
+        transaction_id=transaction_id,
+        payment_network=payment_network,
+    )
+
+
+def mark_settled(
+    conn: sqlite3.Connection,
+    *,
+    transaction_id: str,
+    tx_hash: str,
+) -> models.Transaction:
+    return models.update_transaction_fields(
+        conn,
+        transaction_id=transaction_id,
+        fields={"tx_hash": tx_hash, "status": "paid", "error_reason": None},
+    )
+
+
+def record_settlement_failure(
+    conn: sqlite3.Connection,
+    *,
+    transaction_id: str,
+    error_reason: str,
+) -> models.Transaction:
+    return models.update_transaction_fields(
+        conn,
+        transaction_id=transaction_id,
+        fields={"status": "settle_failed", "error_reason": error_reason},
+    )
+
+
+def _session_kwargs(transaction_id: str, metadata: dict) -> dict:
+    return {
+        "transaction_id": transaction_id,
+        "buyer_bot_username": metadata["buyer_bot_username"],
+        "seller_bot_username": metadata["seller_bot_username"],
+        "initial_prompt": metadata["initial_prompt"],
+        "market_slug": metadata.get("market_slug"),
+        "question_dir": metadata.get("question_dir"),
+        "wait_seconds": int(metadata["wait_seconds"]) if metadata.get("wait_seconds") else None,
+    }
+
+
+def _attach_session_info(conn: sqlite3.Connection, *, transaction_id: str, session_info: dict) -> models.Transaction:
+    session_chat_id = session_info.get("chat_id")
+    session_thread_id = session_info.get("message_thread_id")
+    if session_chat_id is None or session_thread_id is None:
+        raise RuntimeError("tg_manager response missing chat_id or message_thread_id")
+    return attach_session(
+        conn,
+        transaction_id=transaction_id,
+        chat_id=str(session_chat_id),
+        message_thread_id=int(session_thread_id),
+    )
+
+
+def open_session(
+    conn: sqlite3.Connection,
+    session_client: SessionManagerClient,
+    *,
+    transaction_id: str,
+    metadata: dict,
+) -> tuple[models.Transaction, dict]:
+    """Create the Telegram session for a paid transaction; failures are recorded then re-raised."""
+    try:
+        session_info = session_client.create_session(**_session_kwargs(transaction_id, metadata))
+        transaction = _attach_session_info(conn, transaction_id=transaction_id, session_info=session_info)
+    except Exception as exc:  # noqa: BLE001
+        record_tg_manager_error(conn, transaction_id=transaction_id, error_reason=str(exc))
+        raise
+    return transaction, session_info
+
+
+async def aopen_session(
+    conn: sqlite3.Connection,
+    session_client: SessionManagerClient,
+    *,
+    transaction_id: str,
+    metadata: dict,
+) -> tuple[models.Transaction, dict]:
+    """Async ``open_session``: awaits ``acreate_session`` when the client has one; database writes run in a worker thread."""
+    kwargs = _session_kwargs(transaction_id, metadata)
+    try:
+        acreate = getattr(session_client, "acreate_session", None)
+        if acreate is not None:
+            session_info = await acreate(**kwargs)
+        else:
+            session_info = await anyio.to_thread.run_sync(functools.partial(session_client.create_session, **kwargs))
+        transaction = await anyio.to_thread.run_sync(
+            functools.partial(_attach_session_info, conn, transaction_id=transaction_id, session_info=session_info)
+        )
+    except Exception as exc:  # noqa: BLE001
+        await anyio.to_thread.run_sync(
+            functools.partial(record_tg_manager_error, conn, transaction_id=transaction_id, error_reason=str(exc))
+        )
+        raise
+    return transaction, session_info
+
+
 def attach_session(
     conn: sqlite3.Connection,
     *,
@@ -154,17 +331,21 @@ def build_payment_response(tx_hash: str, *, network: str = "conflux") -> str:
     return b64encode_json(payload)
 
 
-def transaction_to_dict(transaction: models.Transaction) -> dict:
-    payment_network = None
+@functools.lru_cache(maxsize=256)
+def _payment_network(requirements_json: str) -> str | None:
+    # 同一卖家同一价格的交易共享同一份要求 JSON，解析结果按原文缓存，列表与导出不必逐行 json.loads
     try:
-        requirements = json.loads(transaction.requirements_json)
+        requirements = json.loads(requirements_json)
         network = requirements.get("accepts", [{}])[0].get("network")
-        if network == TRON_NETWORK_ID:
-            payment_network = "tron"
-        elif network:
-            payment_network = "conflux"
     except Exception:  # noqa: BLE001
-        payment_network = None
+        return None
+    if network == TRON_NETWORK_ID:
+        return "tron"
+    return "conflux" if network else None
+
+
+def transaction_to_dict(transaction: models.Transaction) -> dict:
+    payment_network = _payment_network(transaction.requirements_json)
     payment_chain = transaction.payment_chain or payment_network
     metadata = {}
     try:
@@ -184,6 +365,44 @@ def transaction_to_dict(transaction: models.Transaction) -> dict:
         "message_thread_id": transaction.message_thread_id,
         "metadata": metadata,
         "error_reason": transaction.error_reason,
+        "confirmation_status": transaction.confirmation_status,
+        "confirmation_block": transaction.confirmation_block,
         "created_at": transaction.created_at,
         "updated_at": transaction.updated_at,
     }
+
+
+def publish_transaction(events: EventBus | None, transaction: models.Transaction) -> None:
+    """Push a compact status delta of ``transaction`` to the event feed (no-op without one)."""
+    if events is None:
+        return
+    events.publish(
+        "transaction",
+        {
+            "transaction_id": transaction.transaction_id,
+            "seller_id": transaction.seller_id,
+            "status": transaction.status,
+            "tx_hash": transaction.tx_hash,
+            "chat_id": transaction.chat_id,
+            "message_thread_id": transaction.message_thread_id,
+            "error_reason": transaction.error_reason,
+            "updated_at": transaction.updated_at,
+        },
+    )
+
+
+def publish_session(events: EventBus | None, session_info: dict) -> None:
+    """Push a tg_manager session status change (``session_to_dict`` shape) to the event feed."""
+    if events is None:
+        return
+    events.publish(
+        "session",
+        {
+            "transaction_id": session_info.get("transaction_id"),
+            "status": session_info.get("status"),
+            "chat_id": session_info.get("chat_id"),
+            "message_thread_id": session_info.get("message_thread_id"),
+            "end_reason": session_info.get("end_reason"),
+            "updated_at": session_info.get("updated_at"),
+        },
+    )
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+
+import httpx
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_CONNECT_TIMEOUT = 3.0
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RATE_LIMIT = 10.0
+DEFAULT_MAX_RETRIES = 3
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Blocking token bucket; ``acquire`` sleeps until a request may be sent."""
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take one token and return how long the caller waited for it."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            self._sleep(delay)
+            waited += delay
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the server answered 429."""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+
+
+_buckets: Dict[Tuple[str, float], TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def bucket_for_key(api_key: str | None, rate: float) -> TokenBucket:
+    """Return the process-wide bucket for an API key; TronGrid budgets per key, not per client."""
+    key = (api_key or "", float(rate))
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            bucket = _buckets[key] = TokenBucket(rate)
+        return bucket
+
+
+@dataclass
+class EndpointMetrics:
+    requests: int = 0
+    retries: int = 0
+    errors: int = 0
+    throttled_seconds: float = 0.0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        avg = self.total_seconds / self.requests if self.requests else 0.0
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "errors": self.errors,
+            "throttled_seconds": round(self.throttled_seconds, 6),
+            "avg_seconds": round(avg, 6),
+            "max_seconds": round(self.max_seconds, 6),
+        }
+
+
+class TronGridClient:
+    """Pooled TronGrid HTTP client shared by the Tron facilitator and buyer.
+
+    Requests go through a keep-alive ``httpx.Client`` and a token bucket
+    keyed by API key. 429 and 5xx responses (and connection errors and
+    timeouts) are retried with full-jitter exponential backoff, honouring
+    ``Retry-After``. A retried broadcast may already have landed; callers
+    treat TronGrid's ``DUP_TRANSACTION_ERROR`` as success. Per-path latency
+    is recorded in ``metrics()``.
+    """
+
+    def __init__(
+        self,
+        rpc_url: str,
+        api_key: str | None = None,
+        *,
+        client: httpx.Client | None = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        timeout: float = DEFAULT_TIMEOUT,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        rate_limit: float = DEFAULT_RATE_LIMIT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = 0.25,
+        backoff_cap: float = 4.0,
+        bucket: TokenBucket | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rpc_url = rpc_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.bucket = bucket or bucket_for_key(api_key, rate_limit)
+        self._sleep = sleep
+        self._owns_client = client is None
+        self._client = client or httpx.Client(
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=60.0,
+            ),
+        )
+        self._metrics: Dict[str, EndpointMetrics] = {}
+        self._metrics_lock = threading.Lock()
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["TRON-PRO-API-KEY"] = self.api_key
+        return headers
+
+    def _backoff(self, attempt: int, resp: httpx.Response | None) -> float:
+        if resp is not None:
+            retry_after = resp.headers.get("Retry-After", "").strip()
+            if retry_after.isdigit():
+                return min(self.backoff_cap, float(retry_after))
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2**attempt)))
+
+    def _record(self, path: str, *, elapsed: float, throttled: float, retries: int, failed: bool) -> None:
+        with self._metrics_lock:
+            m = self._metrics.setdefault(path, EndpointMetrics())
+            m.requests += 1
+            m.retries += retries
+            m.errors += int(failed)
+            m.throttled_seconds += throttled
+            m.total_seconds += elapsed
+            m.max_seconds = max(m.max_seconds, elapsed)
+
+    def post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        url = f"{self.rpc_url}/{path.lstrip('/')}"
+        start = time.perf_counter()
+        throttled = 0.0
+        attempt = 0
+        failed = True
+        try:
+            while True:
+                throttled += self.bucket.acquire()
+                resp: httpx.Response | None = None
+                try:
+                    resp = self._client.post(url, json=payload, headers=self._headers(), timeout=self.timeout)
+                except (httpx.TimeoutException, httpx.NetworkError):
+                    if attempt >= self.max_retries:
+                        raise
+                else:
+                    if resp.status_code not in RETRY_STATUS or attempt >= self.max_retries:
+                        break
+                    if resp.status_code == 429:
+                        self.bucket.drain()
+                self._sleep(self._backoff(attempt, resp))
+                attempt += 1
+
+            if resp.status_code != 200:
+                raise RuntimeError(resp.text)
+            data = resp.json()
+            failed = False
+            return data
+        finally:
+            self._record(
+                path,
+                elapsed=time.perf_counter() - start,
+                throttled=throttled,
+                retries=attempt,
+                failed=failed,
+            )
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        with self._metrics_lock:
+            return {path: m.as_dict() for path, m in self._metrics.items()}
+
+    def close(self) -> None:
+        if self._owns_client:
+            self._client.close()
+
+
+_clients: Dict[Tuple[str, str], TronGridClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_tron_client(rpc_url: str, api_key: str | None = None) -> TronGridClient:
+    """Return the process-wide client for ``(rpc_url, api_key)`` so callers share one pool."""
+    key = (rpc_url.rstrip("/"), api_key or "")
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = TronGridClient(rpc_url, api_key)
+        return client
@@ -1,9 +1,12 @@
 import base64
 import json
-from typing import Any, Dict
+from typing import TYPE_CHECKING, Any, Dict
 
 from web3 import Web3
 
+if TYPE_CHECKING:
+    from contextswap.buyer import GasPriceCache, NonceManager
+
 CHAIN_ID = 71
 NETWORK_ID = f"eip155:{CHAIN_ID}"
 
@@ -41,11 +44,14 @@ def make_requirements(
     }
 
 
-def build_payment(
+def sign_payment(
     requirements: Dict[str, Any],
     w3: Web3,
+    *,
     buyer_address: str,
     buyer_private_key: str,
+    nonce: int,
+    gas_price: int,
 ) -> Dict[str, Any]:
     accepts = requirements.get("accepts", [])
     if not accepts:
@@ -55,12 +61,6 @@ def build_payment(
     pay_to = Web3.to_checksum_address(requirement["payTo"])
     amount = int(requirement["amountWei"])
 
-    nonce = w3.eth.get_transaction_count(buyer_address)
-    try:
-        gas_price = w3.eth.gas_price
-    except Exception:  # noqa: BLE001
-        gas_price = w3.to_wei(1, "gwei")
-
     tx = {
         "to": pay_to,
         "value": amount,
@@ -82,3 +82,51 @@ def build_payment(
         "amountWei": str(amount),
         "rawTransaction": raw_tx,
     }
+
+
+def build_payment(
+    requirements: Dict[str, Any],
+    w3: Web3,
+    buyer_address: str,
+    buyer_private_key: str,
+    *,
+    nonce_manager: "NonceManager | None" = None,
+    gas_price_cache: "GasPriceCache | None" = None,
+) -> Dict[str, Any]:
+    """Sign a single payment.
+
+    Without ``nonce_manager``/``gas_price_cache`` this reads both from the
+    node on every call; long-lived buyers should pass them (or use
+    ``contextswap.buyer.BuyerPaymentBuilder``) to skip the round trips and
+    keep concurrent payments from reusing a nonce.
+    """
+    if not requirements.get("accepts"):
+        raise RuntimeError("No payment requirements")
+
+    if nonce_manager is not None:
+        nonce = nonce_manager.reserve(buyer_address)
+    else:
+        nonce = w3.eth.get_transaction_count(buyer_address)
+
+    if gas_price_cache is not None:
+        gas_price = gas_price_cache.get()
+    else:
+        try:
+            gas_price = w3.eth.gas_price
+        except Exception:  # noqa: BLE001
+            gas_price = w3.to_wei(1, "gwei")
+
+    try:
+        return sign_payment(
+            requirements,
+            w3,
+            buyer_address=buyer_address,
+            buyer_private_key=buyer_private_key,
+            nonce=nonce,
+            gas_price=gas_price,
+        )
+    except Exception:
+        # 未签出的交易不会广播，归还 nonce，避免后续付款卡在空洞上
+        if nonce_manager is not None:
+            nonce_manager.release(buyer_address, nonce)
+        raise
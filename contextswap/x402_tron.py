@@ -2,9 +2,9 @@ import base64
 import json
 from typing import Any, Dict
 
-import requests
 from eth_utils import to_checksum_address
 
+from contextswap.tron_client import TronGridClient, get_tron_client
 from contextswap.tron_utils import evm_to_tron_hex, sign_txid_hex
 
 # Tron Shasta JSON-RPC (eth_chainId) returns 0x94a9059e.
@@ -54,6 +54,8 @@ def build_payment(
     buyer_address: str,
     buyer_private_key: str,
     api_key: str | None = None,
+    *,
+    client: TronGridClient | None = None,
 ) -> Dict[str, Any]:
     accepts = requirements.get("accepts", [])
     if not accepts:
@@ -63,25 +65,14 @@ def build_payment(
     amount = int(requirement["amountWei"])
     pay_to = requirement["payTo"]
 
-    headers = {"Content-Type": "application/json"}
-    if api_key:
-        headers["TRON-PRO-API-KEY"] = api_key
-
     create_payload = {
         "to_address": evm_to_tron_hex(pay_to),
         "owner_address": evm_to_tron_hex(buyer_address),
         "amount": amount,
         "visible": False,
     }
-    resp = requests.post(
-        f"{rpc_url.rstrip('/')}/wallet/createtransaction",
-        json=create_payload,
-        headers=headers,
-        timeout=10,
-    )
-    if resp.status_code != 200:
-        raise RuntimeError(resp.text)
-    unsigned_tx = resp.json()
+    client = client or get_tron_client(rpc_url, api_key)
+    unsigned_tx = client.post("/wallet/createtransaction", create_payload)
     txid = unsigned_tx.get("txID") or unsigned_tx.get("txid")
     if not txid:
         raise RuntimeError("Missing txID in create transaction response")
@@ -49,6 +49,30 @@ export interface ListTransactionsResponse {
   items: Transaction[];
 }
 
+export interface StatusStats {
+  count: number;
+  volume_wei: number;
+}
+
+export interface TransactionStats {
+  total: number;
+  volume_wei: number;
+  avg_price_wei: number;
+  by_status: Record<string, StatusStats>;
+}
+
+export interface MarketStats {
+  sellers: { total: number; active: number; by_status: Record<string, number> };
+  transactions: TransactionStats;
+  daily: { date: string; count: number; volume_wei: number }[];
+}
+
+export interface SellerStats {
+  seller_id: string;
+  transactions: TransactionStats;
+  last_transaction_at: string | null;
+}
+
 export const api = {
   health: async (): Promise<{ status: string }> => {
     const res = await client.get('/healthz');
@@ -67,6 +91,10 @@ export const api = {
       const res = await client.get(`/v1/sellers/${sellerId}`);
       return res.data;
     },
+    stats: async (sellerId: string): Promise<SellerStats> => {
+      const res = await client.get(`/v1/sellers/${sellerId}/stats`);
+      return res.data;
+    },
     register: async (data: {
       evm_address: string;
       price_wei?: number;
@@ -84,6 +112,10 @@ export const api = {
       return res.data;
     },
   },
+  stats: async (params?: { days?: number }): Promise<MarketStats> => {
+    const res = await client.get('/v1/stats', { params: params ?? {} });
+    return res.data;
+  },
   transactions: {
     list: async (params?: {
       limit?: number;
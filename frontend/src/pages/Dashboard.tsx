@@ -12,7 +12,7 @@ import {
   AreaChart,
   Area,
 } from 'recharts';
-import { api, Seller, Transaction } from '../api/client';
+import { api, MarketStats, Seller } from '../api/client';
 import SellerCard from '../components/SellerCard';
 import StatsCard from '../components/StatsCard';
 
@@ -25,7 +25,7 @@ const STATUS_COLORS: Record<string, string> = {
 
 function Dashboard() {
   const [sellers, setSellers] = useState<Seller[]>([]);
-  const [transactions, setTransactions] = useState<Transaction[]>([]);
+  const [stats, setStats] = useState<MarketStats | null>(null);
   const [searchKeyword, setSearchKeyword] = useState('');
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
@@ -34,20 +34,18 @@ function Dashboard() {
     setLoading(true);
     setError(null);
     try {
-      const [sellersRes, txRes] = await Promise.all([
+      const [sellersRes, statsRes] = await Promise.all([
         searchKeyword.trim()
           ? api.sellers.search(searchKeyword.trim() || ' ')
           : api.sellers.list({ limit: 200, status: 'active' }),
-        api.transactions.list({ limit: 100 }),
+        api.stats({ days: 14 }),
       ]);
-      const sellerList = sellersRes.items || [];
-      const txList = txRes.items || [];
-      setSellers(sellerList);
-      setTransactions(txList);
+      setSellers(sellersRes.items || []);
+      setStats(statsRes);
     } catch (e) {
       setError(e instanceof Error ? e.message : '请求失败');
       setSellers([]);
-      setTransactions([]);
+      setStats(null);
     } finally {
       setLoading(false);
     }
@@ -62,35 +60,23 @@ function Dashboard() {
     fetchAll();
   };
 
-  const totalSellers = sellers.length;
-  const activeTx = transactions.filter(
-    (t) => t.status === 'paid' || t.status === 'session_created'
-  ).length;
-  const totalVolume = transactions.reduce((s, t) => s + t.price_wei, 0);
-  const avgPrice =
-    transactions.length > 0 ? totalVolume / transactions.length : 0;
+  // 汇总数字来自 /v1/stats（服务端增量维护），不随历史数据量增长
+  const byStatus = stats?.transactions.by_status ?? {};
+  const totalSellers = stats?.sellers.active ?? 0;
+  const activeTx =
+    (byStatus.paid?.count ?? 0) + (byStatus.session_created?.count ?? 0);
+  const totalVolume = stats?.transactions.volume_wei ?? 0;
+  const avgPrice = stats?.transactions.avg_price_wei ?? 0;
 
-  const statusCounts = transactions.reduce<Record<string, number>>((acc, t) => {
-    acc[t.status] = (acc[t.status] || 0) + 1;
-    return acc;
-  }, {});
-  const statusChartData = Object.entries(statusCounts).map(([name, value]) => ({
+  const statusChartData = Object.entries(byStatus).map(([name, s]) => ({
     name,
-    value,
+    value: s.count,
   }));
 
-  const byDate = transactions.reduce<Record<string, number>>((acc, t) => {
-    const d = t.created_at.slice(0, 10);
-    acc[d] = (acc[d] || 0) + t.price_wei;
-    return acc;
-  }, {});
-  const volumeChartData = Object.entries(byDate)
-    .sort(([a], [b]) => a.localeCompare(b))
-    .slice(-14)
-    .map(([date, volume]) => ({
-      date,
-      volume: Number((volume / 1e18).toFixed(6)),
-    }));
+  const volumeChartData = (stats?.daily ?? []).map((d) => ({
+    date: d.date,
+    volume: Number((d.volume_wei / 1e18).toFixed(6)),
+  }));
 
   const priceBuckets = sellers.reduce<Record<string, number>>((acc, s) => {
     const p = s.price_conflux_wei ?? s.price_wei ?? s.price_tron_sun ?? 0;
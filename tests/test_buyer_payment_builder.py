@@ -0,0 +1,161 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from eth_account import Account
+from eth_account._utils import legacy_transactions
+from web3 import Web3
+
+from contextswap.buyer import BuyerPaymentBuilder, BuyerWallet, GasPriceCache, NonceManager
+from contextswap.evm import decode_raw_transaction
+from contextswap.x402 import build_payment, make_requirements
+
+
+class FakeChain:
+    def __init__(self, *, nonce: int = 0, gas_price: int = 7) -> None:
+        self.nonce = nonce
+        self.gas_price = gas_price
+        self.count_calls = 0
+        self.gas_calls = 0
+
+    def get_transaction_count(self, address: str) -> int:
+        self.count_calls += 1
+        return self.nonce
+
+    def get_gas_price(self) -> int:
+        self.gas_calls += 1
+        return self.gas_price
+
+
+def _nonce_of(payment: dict) -> int:
+    raw = bytes.fromhex(payment["rawTransaction"].removeprefix("0x"))
+    return int(legacy_transactions.Transaction.from_bytes(raw).nonce)
+
+
+class NonceManagerTest(unittest.TestCase):
+    def test_concurrent_reservations_are_unique(self) -> None:
+        chain = FakeChain(nonce=5)
+        nonces = NonceManager(chain.get_transaction_count)
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            got = list(pool.map(lambda _: nonces.reserve("0xAbC"), range(50)))
+        self.assertEqual(sorted(got), list(range(5, 55)))
+        self.assertEqual(chain.count_calls, 1)
+
+    def test_released_nonce_is_reused_first(self) -> None:
+        nonces = NonceManager(FakeChain().get_transaction_count)
+        first, second, third = (nonces.reserve("0xabc") for _ in range(3))
+        nonces.release("0xabc", second)
+        self.assertEqual(nonces.reserve("0xABC"), second)
+        self.assertEqual(nonces.reserve("0xabc"), third + 1)
+        self.assertEqual(first, 0)
+
+    def test_resync_drops_nonces_the_chain_has_passed(self) -> None:
+        chain = FakeChain()
+        nonces = NonceManager(chain.get_transaction_count)
+        for _ in range(3):
+            nonces.reserve("0xabc")
+        nonces.release("0xabc", 1)
+        chain.nonce = 10
+        self.assertEqual(nonces.resync("0xabc"), 10)
+        self.assertEqual(nonces.reserve("0xabc"), 10)
+
+
+class GasPriceCacheTest(unittest.TestCase):
+    def test_ttl_and_fallback(self) -> None:
+        now = [0.0]
+        chain = FakeChain(gas_price=3)
+        cache = GasPriceCache(chain.get_gas_price, ttl=10, clock=lambda: now[0])
+        self.assertEqual(cache.get(), 3)
+        chain.gas_price = 4
+        now[0] = 5
+        self.assertEqual(cache.get(), 3)
+        now[0] = 11
+        self.assertEqual(cache.get(), 4)
+        self.assertEqual(chain.gas_calls, 2)
+
+        def broken() -> int:
+            raise RuntimeError("rpc down")
+
+        self.assertEqual(GasPriceCache(broken, fallback=99).get(), 99)
+
+
+class BuyerPaymentBuilderTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.chain = FakeChain(nonce=2)
+        self.w3 = Web3()
+        self.wallets = [BuyerWallet(a.address, a.key.hex()) for a in (Account.create(), Account.create())]
+        self.builder = BuyerPaymentBuilder(
+            self.w3,
+            self.wallets,
+            nonce_manager=NonceManager(self.chain.get_transaction_count),
+            gas_price_cache=GasPriceCache(self.chain.get_gas_price),
+        )
+        self.requirements = make_requirements(Account.create().address, 1000)
+
+    def test_spreads_payments_across_wallets(self) -> None:
+        payments = [self.builder.build(self.requirements) for _ in range(4)]
+        senders = [decode_raw_transaction(p["rawTransaction"])["from"] for p in payments]
+        self.assertEqual([p["from"] for p in payments], senders)
+        self.assertEqual(senders.count(self.wallets[0].address), 2)
+        self.assertEqual(senders.count(self.wallets[1].address), 2)
+        self.assertEqual(sorted({_nonce_of(p) for p in payments}), [2, 3])
+        self.assertEqual(self.chain.gas_calls, 1)
+        self.assertEqual(self.builder.in_flight(), {w.address: 2 for w in self.wallets})
+
+        for payment in payments:
+            self.builder.complete(payment)
+        self.assertEqual(self.builder.in_flight(), {w.address: 0 for w in self.wallets})
+
+    def test_abandon_returns_nonce(self) -> None:
+        builder = BuyerPaymentBuilder(
+            self.w3,
+            self.wallets[:1],
+            nonce_manager=NonceManager(self.chain.get_transaction_count),
+            gas_price_cache=GasPriceCache(self.chain.get_gas_price),
+        )
+        first = builder.build(self.requirements)
+        second = builder.build(self.requirements)
+        builder.abandon(first)
+        builder.complete(second)
+        again = builder.build(self.requirements)
+        self.assertEqual(_nonce_of(again), _nonce_of(first))
+        self.assertEqual(_nonce_of(builder.build(self.requirements)), _nonce_of(second) + 1)
+
+    def test_abandon_with_nonce_error_reuses_unspent_nonce(self) -> None:
+        builder = BuyerPaymentBuilder(
+            self.w3,
+            self.wallets[:1],
+            nonce_manager=NonceManager(self.chain.get_transaction_count),
+            gas_price_cache=GasPriceCache(self.chain.get_gas_price),
+        )
+        first = builder.build(self.requirements)
+        second = builder.build(self.requirements)
+        # 节点拒绝了 first（链上 nonce 仍为 2）：second 之下不能留下空洞
+        builder.abandon(first, nonce_error=True)
+        self.assertEqual(_nonce_of(builder.build(self.requirements)), _nonce_of(first))
+
+        # 链上已用掉被拒的 nonce（nonce too low）：resync 丢弃它，继续向后分配
+        builder.abandon(second, nonce_error=True)
+        self.chain.nonce = 4
+        third = builder.build(self.requirements)
+        builder.abandon(third, nonce_error=True)
+        self.assertEqual(_nonce_of(builder.build(self.requirements)), 4)
+
+    def test_build_payment_releases_nonce_when_signing_fails(self) -> None:
+        wallet = self.wallets[0]
+        nonces = NonceManager(self.chain.get_transaction_count)
+        gas = GasPriceCache(self.chain.get_gas_price)
+        with self.assertRaises(Exception):
+            build_payment(self.requirements, self.w3, wallet.address, "0x1234", nonce_manager=nonces, gas_price_cache=gas)
+        self.assertEqual(nonces.reserve(wallet.address), 2)
+
+    def test_build_payment_uses_shared_nonce_manager(self) -> None:
+        wallet = self.wallets[0]
+        nonces = NonceManager(self.chain.get_transaction_count)
+        gas = GasPriceCache(self.chain.get_gas_price)
+        a = build_payment(self.requirements, self.w3, wallet.address, wallet.private_key, nonce_manager=nonces, gas_price_cache=gas)
+        b = build_payment(self.requirements, self.w3, wallet.address, wallet.private_key, nonce_manager=nonces, gas_price_cache=gas)
+        self.assertEqual((_nonce_of(a), _nonce_of(b)), (2, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
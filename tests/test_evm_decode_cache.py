@@ -0,0 +1,70 @@
+import unittest
+
+from eth_account import Account
+
+from contextswap import evm
+from contextswap.facilitator.base import BaseFacilitator
+from contextswap.platform.services import transaction_service
+from contextswap.x402 import CHAIN_ID, NETWORK_ID, make_requirements
+
+
+class _Facilitator(BaseFacilitator):
+    def __init__(self) -> None:
+        super().__init__(CHAIN_ID, NETWORK_ID)
+
+    def send_raw_transaction(self, raw_hex: str) -> str:
+        return transaction_service.compute_tx_hash(raw_hex)
+
+
+def _signed_raw(pay_to: str, *, nonce: int = 0) -> tuple[str, str]:
+    buyer = Account.create()
+    signed = Account.sign_transaction(
+        {"to": pay_to, "value": 1000, "gas": 21000, "gasPrice": 1, "nonce": nonce, "chainId": CHAIN_ID},
+        buyer.key,
+    )
+    return signed.raw_transaction.hex(), buyer.address
+
+
+class DecodeCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        evm.clear_decode_cache()
+        self.seller = Account.create().address
+
+    def tearDown(self) -> None:
+        evm.set_decode_cache_size(evm.DEFAULT_DECODE_CACHE_SIZE)
+        evm.clear_decode_cache()
+
+    def test_repeat_decode_hits_cache(self) -> None:
+        raw, buyer = _signed_raw(self.seller)
+        first = evm.decode_raw_transaction(raw)
+        first["from"] = "tampered"
+        second = evm.decode_raw_transaction("0x" + raw.upper().removeprefix("0X"))
+
+        self.assertEqual(second["from"], buyer)
+        self.assertEqual(second["hash"], transaction_service.compute_tx_hash(raw))
+        info = evm.decode_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (1, 1, 1))
+
+    def test_payment_id_and_verify_share_cache(self) -> None:
+        raw, buyer = _signed_raw(self.seller)
+        payment = {"rawTransaction": raw}
+        payment_id = transaction_service.compute_payment_id(payment)
+        self.assertEqual(payment_id, transaction_service.compute_tx_hash(raw))
+
+        verified = _Facilitator().verify_payment(payment, make_requirements(self.seller, 1000))
+        self.assertEqual(verified["payer"], buyer)
+        self.assertEqual(evm.decode_cache_info().hits, 1)
+
+    def test_lru_eviction(self) -> None:
+        evm.set_decode_cache_size(1)
+        raw_a, _ = _signed_raw(self.seller)
+        raw_b, _ = _signed_raw(self.seller, nonce=1)
+        evm.decode_raw_transaction(raw_a)
+        evm.decode_raw_transaction(raw_b)
+        evm.decode_raw_transaction(raw_a)
+        info = evm.decode_cache_info()
+        self.assertEqual((info.hits, info.misses, info.currsize), (0, 3, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
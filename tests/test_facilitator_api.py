@@ -0,0 +1,114 @@
+import unittest
+
+from eth_account import Account
+from fastapi.testclient import TestClient
+
+from contextswap.facilitator.api import create_facilitator_app
+from contextswap.facilitator.base import BaseFacilitator
+from contextswap.facilitator.tron import TronFacilitator
+from contextswap.platform.services import transaction_service
+from contextswap.x402 import CHAIN_ID, NETWORK_ID, make_requirements
+
+
+class RecordingFacilitator(BaseFacilitator):
+    def __init__(self) -> None:
+        super().__init__(CHAIN_ID, NETWORK_ID)
+        self.broadcasts: list[str] = []
+        self.reject: set[str] = set()
+
+    def send_raw_transaction(self, raw_hex: str) -> str:
+        if raw_hex in self.reject:
+            raise RuntimeError("node rejected transaction")
+        self.broadcasts.append(raw_hex)
+        return transaction_service.compute_tx_hash(raw_hex)
+
+
+def build_payment(pay_to: str, amount: int, *, nonce: int = 0) -> dict:
+    buyer = Account.create()
+    signed = Account.sign_transaction(
+        {
+            "to": pay_to,
+            "value": amount,
+            "gas": 21000,
+            "gasPrice": 1,
+            "nonce": nonce,
+            "chainId": CHAIN_ID,
+        },
+        buyer.key,
+    )
+    return {
+        "scheme": "exact",
+        "network": NETWORK_ID,
+        "from": buyer.address,
+        "rawTransaction": signed.raw_transaction.hex(),
+    }
+
+
+class FacilitatorApiTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.facilitator = RecordingFacilitator()
+        self.client = TestClient(create_facilitator_app(self.facilitator))
+        self.seller = Account.create().address
+        self.requirements = make_requirements(self.seller, 1000)
+
+    def test_verify_and_settle_single_round_trip(self) -> None:
+        payment = build_payment(self.seller, 1000)
+        resp = self.client.post(
+            "/v2/x402/verify-and-settle",
+            json={"payment": payment, "requirements": self.requirements},
+        )
+        self.assertEqual(resp.status_code, 200, resp.text)
+        body = resp.json()
+        self.assertTrue(body["verified"])
+        self.assertEqual(body["payer"], payment["from"])
+        self.assertEqual(body["txHash"], transaction_service.compute_tx_hash(payment["rawTransaction"]))
+        self.assertEqual(len(self.facilitator.broadcasts), 1)
+
+    def test_verify_and_settle_rejects_without_broadcast(self) -> None:
+        payment = build_payment(self.seller, 10)
+        resp = self.client.post(
+            "/v2/x402/verify-and-settle",
+            json={"payment": payment, "requirements": self.requirements},
+        )
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn("below requirement", resp.json()["detail"])
+        self.assertEqual(self.facilitator.broadcasts, [])
+
+    def test_settle_batch_reports_per_item_results(self) -> None:
+        good = build_payment(self.seller, 1000)
+        underpaid = build_payment(self.seller, 1)
+        rejected = build_payment(self.seller, 2000)
+        self.facilitator.reject.add(rejected["rawTransaction"])
+
+        resp = self.client.post(
+            "/v2/x402/settle-batch",
+            json={
+                "items": [
+                    {"payment": good, "requirements": self.requirements},
+                    {"payment": underpaid, "requirements": self.requirements},
+                    {"payment": rejected, "requirements": self.requirements},
+                ],
+                "max_concurrency": 2,
+            },
+        )
+        self.assertEqual(resp.status_code, 200, resp.text)
+        results = resp.json()["results"]
+        self.assertEqual([r["index"] for r in results], [0, 1, 2])
+        self.assertTrue(results[0]["ok"])
+        self.assertEqual(results[0]["txHash"], transaction_service.compute_tx_hash(good["rawTransaction"]))
+        self.assertFalse(results[1]["ok"])
+        self.assertFalse(results[1]["verified"])
+        self.assertFalse(results[2]["ok"])
+        self.assertTrue(results[2]["verified"])
+        self.assertIn("rejected", results[2]["error"])
+        self.assertEqual(self.facilitator.broadcasts, [good["rawTransaction"]])
+
+    def test_tron_settle_payments_isolates_failures(self) -> None:
+        facilitator = TronFacilitator("http://tron.invalid")
+        results = facilitator.settle_payments([({}, {"accepts": []}), ({}, {})])
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(not r["ok"] and not r["verified"] for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
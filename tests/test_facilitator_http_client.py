@@ -0,0 +1,82 @@
+import asyncio
+import json
+import unittest
+
+import anyio
+import httpx
+
+from contextswap.facilitator.client import (
+    AsyncHTTPFacilitatorClient,
+    EventLoopFacilitatorClient,
+    HTTPFacilitatorClient,
+)
+
+
+def _handler(calls: list[str]):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path == "/healthz":
+            return httpx.Response(200, json={"status": "ok"})
+        if request.url.path == "/v2/x402/verify":
+            payload = json.loads(request.content.decode("utf-8"))
+            if payload["payment"].get("bad"):
+                return httpx.Response(400, json={"detail": "bad payment"})
+            return httpx.Response(200, json={"ok": True, "verified": True, "payer": "0xabc"})
+        if request.url.path == "/v2/x402/settle":
+            return httpx.Response(200, json={"ok": True, "txHash": "0xhash"})
+        return httpx.Response(404)
+
+    return handler
+
+
+class HTTPFacilitatorClientTest(unittest.TestCase):
+    def test_sync_client_reuses_pool(self) -> None:
+        calls: list[str] = []
+        client = HTTPFacilitatorClient(
+            "http://facilitator/",
+            client=httpx.Client(transport=httpx.MockTransport(_handler(calls))),
+        )
+        self.assertEqual(client.verify_payment({}, {})["payer"], "0xabc")
+        self.assertEqual(client.settle_payment({}, {}), "0xhash")
+        with self.assertRaises(RuntimeError):
+            client.verify_payment({"bad": True}, {})
+        client.close()
+        self.assertEqual(calls, ["/v2/x402/verify", "/v2/x402/settle", "/v2/x402/verify"])
+
+    def test_async_client_warm_up_and_calls(self) -> None:
+        calls: list[str] = []
+
+        async def run() -> None:
+            client = AsyncHTTPFacilitatorClient(
+                "http://facilitator",
+                client=httpx.AsyncClient(transport=httpx.MockTransport(_handler(calls))),
+                pool_size=4,
+            )
+            self.assertEqual(await client.warm_up(10), 4)
+            verified = await client.verify_payment({}, {})
+            self.assertTrue(verified["verified"])
+            self.assertEqual(await client.settle_payment({}, {}), "0xhash")
+            await client.aclose()
+
+        asyncio.run(run())
+        self.assertEqual(calls.count("/healthz"), 4)
+
+    def test_event_loop_facade_from_worker_thread(self) -> None:
+        calls: list[str] = []
+
+        async def run() -> str:
+            pooled = AsyncHTTPFacilitatorClient(
+                "http://facilitator",
+                client=httpx.AsyncClient(transport=httpx.MockTransport(_handler(calls))),
+            )
+            facade = EventLoopFacilitatorClient(pooled)
+            try:
+                return await anyio.to_thread.run_sync(facade.settle_payment, {}, {})
+            finally:
+                await pooled.aclose()
+
+        self.assertEqual(anyio.run(run), "0xhash")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import asyncio
+import unittest
+
+from eth_account import Account
+from fastapi.testclient import TestClient
+
+from contextswap import evm
+from contextswap.facilitator.api import create_facilitator_app
+from contextswap.facilitator.base import BaseFacilitator
+from contextswap.facilitator.engine import VerificationEngine
+from contextswap.facilitator.tron import TronFacilitator
+from contextswap.platform.services import transaction_service
+from contextswap.x402 import CHAIN_ID, NETWORK_ID, make_requirements
+
+
+class _Facilitator(BaseFacilitator):
+    def __init__(self) -> None:
+        super().__init__(CHAIN_ID, NETWORK_ID)
+
+    def send_raw_transaction(self, raw_hex: str) -> str:
+        return transaction_service.compute_tx_hash(raw_hex)
+
+
+def _payment(pay_to: str, amount: int) -> dict:
+    buyer = Account.create()
+    signed = Account.sign_transaction(
+        {"to": pay_to, "value": amount, "gas": 21000, "gasPrice": 1, "nonce": 0, "chainId": CHAIN_ID},
+        buyer.key,
+    )
+    return {"from": buyer.address, "rawTransaction": signed.raw_transaction.hex()}
+
+
+class VerificationEngineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.engine = VerificationEngine(_Facilitator(), max_workers=2)
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.engine.close()
+
+    def setUp(self) -> None:
+        evm.clear_decode_cache()
+        self.seller = Account.create().address
+        self.requirements = make_requirements(self.seller, 1000)
+
+    def test_verify_in_worker_process_populates_parent_cache(self) -> None:
+        payment = _payment(self.seller, 1000)
+        result = asyncio.run(self.engine.verify_payment(payment, self.requirements))
+        self.assertEqual(result["payer"], payment["from"])
+        self.assertIsNotNone(evm.peek_decoded(payment["rawTransaction"]))
+
+    def test_verify_payments_batch_isolates_failures(self) -> None:
+        items = [
+            (_payment(self.seller, 1000), self.requirements),
+            (_payment(self.seller, 1), self.requirements),
+            ({}, self.requirements),
+        ]
+        results = asyncio.run(self.engine.verify_payments(items))
+        self.assertTrue(results[0]["verified"])
+        self.assertFalse(results[1]["verified"])
+        self.assertIn("below requirement", results[1]["error"])
+        self.assertIn("Missing rawTransaction", results[2]["error"])
+
+    def test_facilitator_app_uses_engine(self) -> None:
+        client = TestClient(create_facilitator_app(self.engine.facilitator, verification_engine=self.engine))
+        payment = _payment(self.seller, 1000)
+        resp = client.post("/v2/x402/verify-and-settle", json={"payment": payment, "requirements": self.requirements})
+        self.assertEqual(resp.status_code, 200, resp.text)
+        self.assertEqual(resp.json()["txHash"], transaction_service.compute_tx_hash(payment["rawTransaction"]))
+
+    def test_overridden_verify_runs_inline(self) -> None:
+        engine = VerificationEngine(TronFacilitator("http://tron.invalid"), max_workers=1)
+        try:
+            with self.assertRaises(ValueError):
+                asyncio.run(engine.verify_payment({}, {"accepts": []}))
+        finally:
+            engine.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
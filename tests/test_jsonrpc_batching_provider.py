@@ -0,0 +1,126 @@
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from eth_account import Account
+from web3 import Web3
+
+from contextswap.facilitator.conflux import ConfluxFacilitator
+from contextswap.jsonrpc import BatchingHTTPProvider, JsonRpcClient
+from contextswap.platform.services import transaction_service
+from contextswap.x402 import CHAIN_ID
+
+
+class FakeNode:
+    """Answers JSON-RPC like a node; records every HTTP body it receives."""
+
+    def __init__(self, *, reject_batches: bool = False) -> None:
+        self.bodies: list = []
+        self.reject_batches = reject_batches
+        self._lock = threading.Lock()
+
+    def _answer(self, call: dict) -> dict:
+        if call["method"] == "eth_sendRawTransaction":
+            result = transaction_service.compute_tx_hash(call["params"][0])
+        elif call["method"] == "eth_chainId":
+            result = hex(CHAIN_ID)
+        else:
+            return {"jsonrpc": "2.0", "id": call["id"], "error": {"code": -32601, "message": "method not found"}}
+        return {"jsonrpc": "2.0", "id": call["id"], "result": result}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        with self._lock:
+            self.bodies.append(body)
+        if isinstance(body, list):
+            if self.reject_batches:
+                return httpx.Response(
+                    200, json={"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "batch disabled"}}
+                )
+            return httpx.Response(200, json=list(reversed([self._answer(call) for call in body])))
+        return httpx.Response(200, json=self._answer(body))
+
+
+def _provider(node: FakeNode, **kwargs) -> BatchingHTTPProvider:
+    client = JsonRpcClient("http://node.test", client=httpx.Client(transport=httpx.MockTransport(node)))
+    return BatchingHTTPProvider("http://node.test", client=client, **kwargs)
+
+
+def _raw_transactions(count: int) -> list[str]:
+    buyer = Account.create()
+    to = Account.create().address
+    return [
+        Account.sign_transaction(
+            {"to": to, "value": 1, "gas": 21000, "gasPrice": 1, "nonce": nonce, "chainId": CHAIN_ID},
+            buyer.key,
+        ).raw_transaction.hex()
+        for nonce in range(count)
+    ]
+
+
+class BatchingProviderTest(unittest.TestCase):
+    def test_concurrent_sends_share_batches(self) -> None:
+        node = FakeNode()
+        facilitator = ConfluxFacilitator("http://node.test", batch_window=0.05, max_batch=8)
+        facilitator.web3 = Web3(_provider(node, window=0.05, max_batch=8))
+        raws = _raw_transactions(16)
+
+        start = threading.Barrier(16)
+
+        def send(raw: str) -> str:
+            start.wait()
+            return facilitator.send_raw_transaction(raw)
+
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            hashes = list(pool.map(send, raws))
+
+        self.assertEqual(
+            [h.removeprefix("0x") for h in hashes],
+            [transaction_service.compute_tx_hash(raw).removeprefix("0x") for raw in raws],
+        )
+        self.assertLess(len(node.bodies), 16)
+        self.assertTrue(all(isinstance(body, list) and len(body) <= 8 for body in node.bodies))
+
+    def test_single_call_is_sent_unbatched(self) -> None:
+        node = FakeNode()
+        w3 = Web3(_provider(node, window=0.001))
+        self.assertEqual(w3.eth.chain_id, CHAIN_ID)
+        self.assertIsInstance(node.bodies[0], dict)
+
+    def test_rpc_errors_reach_only_their_caller(self) -> None:
+        node = FakeNode()
+        provider = _provider(node, window=0.05)
+        barrier = threading.Barrier(2)
+
+        def call(method: str):
+            barrier.wait()
+            return provider.make_request(method, [])  # type: ignore[arg-type]
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            ok, bad = pool.map(call, ["eth_chainId", "eth_unknown"])
+        self.assertEqual(ok["result"], hex(CHAIN_ID))
+        self.assertEqual(bad["error"]["code"], -32601)
+        self.assertEqual(len(node.bodies), 1)
+
+    def test_batch_rejection_fails_every_caller(self) -> None:
+        node = FakeNode(reject_batches=True)
+        provider = _provider(node, window=0.05)
+        barrier = threading.Barrier(2)
+
+        def call(_: int):
+            barrier.wait()
+            try:
+                provider.make_request("eth_chainId", [])  # type: ignore[arg-type]
+            except RuntimeError as exc:
+                return str(exc)
+            return None
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            errors = list(pool.map(call, range(2)))
+        self.assertEqual(errors, ["batch disabled", "batch disabled"])
+
+
+if __name__ == "__main__":
+    unittest.main()
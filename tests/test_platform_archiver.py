@@ -0,0 +1,142 @@
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from contextswap.platform.db import models
+from contextswap.platform.db.engine import connect_sqlite, enable_incremental_vacuum, init_db, open_database, utc_now_iso
+from contextswap.platform.services.archiver import TransactionArchiver
+
+
+class TransactionArchiverTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = open_database(
+            os.path.join(self.tmp.name, "platform.sqlite3"),
+            read_pool_size=2,
+            archive_path=os.path.join(self.tmp.name, "platform.archive.sqlite3"),
+        )
+        init_db(self.db)
+        models.create_seller(
+            self.db,
+            seller_id="seller-1",
+            evm_address="0x1",
+            price_wei=1,
+            price_conflux_wei=1,
+            price_tron_sun=None,
+            description="",
+            keywords="",
+            status="active",
+        )
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.tmp.cleanup()
+
+    def _create_tx(self, transaction_id: str, *, status: str, created_at: str, tx_hash: str | None = None) -> None:
+        models.create_transaction(
+            self.db,
+            transaction_id=transaction_id,
+            seller_id="seller-1",
+            buyer_address="0xbuyer",
+            price_wei=10,
+            status=status,
+            payment_payload_json=json.dumps({"raw": "ab" * 200}),
+            requirements_json=json.dumps({"accepts": [{"network": "eip155:71"}]}),
+            tx_hash=tx_hash,
+            chat_id=None,
+            message_thread_id=None,
+            metadata_json=json.dumps({"initial_prompt": "hello"}),
+        )
+        self.db.execute("UPDATE transactions SET created_at = ? WHERE transaction_id = ?", (created_at, transaction_id))
+        self.db.commit()
+
+    def test_moves_finished_old_transactions(self) -> None:
+        old = "2020-01-01T00:00:00+00:00"
+        self._create_tx("tx-old", status="session_created", created_at=old)
+        self._create_tx("tx-settling", status="settling", created_at=old)
+        self._create_tx("tx-unconfirmed", status="paid", created_at=old, tx_hash="0xabc")
+        self._create_tx("tx-new", status="paid", created_at=utc_now_iso())
+        models.create_settlement_job(self.db, transaction_id="tx-old", payment_network="conflux")
+        models.update_settlement_job_fields(self.db, transaction_id="tx-old", fields={"status": "done"})
+        original = models.get_transaction_by_id(self.db, transaction_id="tx-old")
+
+        archiver = TransactionArchiver(self.db, after_days=30, batch_size=1, require_confirmation=True)
+        self.assertEqual(archiver.run_once(), 1)
+        self.assertEqual(archiver.run_once(), 0)
+
+        hot = {t.transaction_id for t in models.list_transactions(self.db, limit=50)}
+        self.assertEqual(hot, {"tx-settling", "tx-unconfirmed", "tx-new"})
+        self.assertIsNone(models.get_settlement_job(self.db, transaction_id="tx-old"))
+        archived = models.get_transaction_by_id(self.db, transaction_id="tx-old")
+        self.assertEqual(archived, original)
+        self.assertEqual(self.db.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+
+        # 统计是累计值，归档不回退
+        stats = self.db.execute(
+            "SELECT count FROM market_stats WHERE kind = 'transaction_status' AND key = 'session_created'"
+        ).fetchone()
+        self.assertEqual(stats[0], 1)
+
+    def test_without_confirmation_tracker_archives_broadcast_transactions(self) -> None:
+        old = "2020-01-01T00:00:00+00:00"
+        self._create_tx("tx-paid", status="paid", created_at=old, tx_hash="0xabc")
+        self._create_tx("tx-session", status="session_created", created_at=old, tx_hash="0xdef")
+
+        self.assertEqual(TransactionArchiver(self.db, after_days=30).run_once(), 2)
+        self.assertEqual(models.list_transactions(self.db, limit=50), [])
+        self.assertEqual(models.get_transaction_by_id(self.db, transaction_id="tx-paid").tx_hash, "0xabc")  # type: ignore[union-attr]
+
+    def test_failed_batch_is_rolled_back_and_logged(self) -> None:
+        self._create_tx("tx-old", status="session_created", created_at="2020-01-01T00:00:00+00:00")
+        self.db.execute(
+            "CREATE TEMP TRIGGER fail_delete BEFORE DELETE ON main.transactions BEGIN SELECT RAISE(ABORT, 'disk I/O error'); END"
+        )
+        self.db.commit()
+        archiver = TransactionArchiver(self.db, after_days=30)
+
+        with self.assertLogs("contextswap.platform.services.archiver", level="ERROR"):
+            with self.assertRaises(asyncio.TimeoutError):
+                asyncio.run(asyncio.wait_for(archiver.run_forever(poll_interval=60), timeout=0.5))
+
+        self.assertFalse(self.db.in_transaction)
+        self.assertIsNone(self.db.execute("SELECT 1 FROM archive.archived_transactions").fetchone())
+        # 写锁已释放，其它线程可以继续写
+        done = threading.Event()
+        t = threading.Thread(target=lambda: (self._create_tx("tx-next", status="paid", created_at=utc_now_iso()), done.set()))
+        t.start()
+        self.assertTrue(done.wait(5))
+        t.join()
+
+    def test_existing_database_keeps_auto_vacuum_until_switched(self) -> None:
+        path = os.path.join(self.tmp.name, "legacy.sqlite3")
+        plain = sqlite3.connect(path)
+        plain.execute("CREATE TABLE legacy (id INTEGER PRIMARY KEY)")
+        plain.commit()
+        plain.close()
+        legacy = connect_sqlite(path)
+        try:
+            init_db(legacy)
+            TransactionArchiver(legacy, after_days=30).run_once()
+            # 服务端不做全库 VACUUM，切换模式只能离线执行
+            self.assertEqual(legacy.execute("PRAGMA auto_vacuum").fetchone()[0], 0)
+            self.assertTrue(enable_incremental_vacuum(legacy))
+            self.assertEqual(legacy.execute("PRAGMA auto_vacuum").fetchone()[0], 2)
+            self.assertFalse(enable_incremental_vacuum(legacy))
+        finally:
+            legacy.close()
+
+    def test_without_archive_lookup_misses(self) -> None:
+        db = open_database(os.path.join(self.tmp.name, "plain.sqlite3"))
+        try:
+            init_db(db)
+            self.assertIsNone(models.get_transaction_by_id(db, transaction_id="missing"))
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+
+from eth_account import Account
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from contextswap.platform.api.routes.sellers import router as sellers_router
+from contextswap.platform.db.engine import connect_sqlite, init_db
+from contextswap.platform.services.catalog_cache import CatalogCache, etag_matches
+
+
+class CatalogCacheTest(unittest.TestCase):
+    def test_hit_and_bump(self) -> None:
+        cache = CatalogCache()
+        calls = []
+        build = lambda: calls.append(1) or {"items": [1]}  # noqa: E731
+        first = cache.get_or_build(("list",), build)
+        self.assertEqual(cache.get_or_build(("list",), build), first)
+        self.assertEqual(len(calls), 1)
+        cache.bump()
+        cache.get_or_build(("list",), build)
+        self.assertEqual(len(calls), 2)
+
+    def test_write_during_build_is_not_cached(self) -> None:
+        cache = CatalogCache()
+
+        def build() -> dict:
+            cache.bump()
+            return {"items": []}
+
+        cache.get_or_build(("list",), build)
+        self.assertEqual(cache.get_or_build(("list",), lambda: {"items": [1]}).body, b'{"items":[1]}')
+
+    def test_lru_eviction(self) -> None:
+        cache = CatalogCache(max_entries=2)
+        for key in ("a", "b", "a", "c"):
+            cache.get_or_build(key, lambda: {})
+        self.assertEqual(cache.misses, 3)
+        cache.get_or_build("a", lambda: {})
+        self.assertEqual(cache.misses, 3)
+        cache.get_or_build("b", lambda: {})
+        self.assertEqual(cache.misses, 4)
+
+    def test_etag_matches(self) -> None:
+        self.assertTrue(etag_matches('"x", "abc"', '"abc"'))
+        self.assertTrue(etag_matches('W/"abc"', '"abc"'))
+        self.assertTrue(etag_matches("*", '"abc"'))
+        self.assertFalse(etag_matches(None, '"abc"'))
+        self.assertFalse(etag_matches('"abd"', '"abc"'))
+
+
+class CatalogRoutesTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn = connect_sqlite(":memory:")
+        init_db(self.conn)
+        app = FastAPI()
+        app.include_router(sellers_router)
+        app.state.db = self.conn
+        app.state.catalog_cache = CatalogCache()
+        self.cache = app.state.catalog_cache
+        self.client = TestClient(app)
+
+    def tearDown(self) -> None:
+        self.client.close()
+        self.conn.close()
+
+    def _register(self, keywords: list[str]) -> dict:
+        resp = self.client.post(
+            "/v1/sellers/register",
+            json={"evm_address": Account.create().address, "price_wei": 1, "description": "d", "keywords": keywords},
+        )
+        self.assertEqual(resp.status_code, 200, resp.text)
+        return resp.json()
+
+    def test_etag_and_not_modified(self) -> None:
+        seller = self._register(["weather"])
+        first = self.client.get("/v1/sellers")
+        self.assertEqual(first.status_code, 200)
+        etag = first.headers["etag"]
+        self.assertEqual(first.json()["items"][0]["seller_id"], seller["seller_id"])
+
+        again = self.client.get("/v1/sellers", headers={"If-None-Match": etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.headers["etag"], etag)
+        self.assertEqual(again.content, b"")
+
+        one = self.client.get(f"/v1/sellers/{seller['seller_id']}")
+        self.assertEqual(one.json()["seller_id"], seller["seller_id"])
+        self.assertEqual(self.client.get("/v1/sellers/missing").status_code, 404)
+
+    def test_writes_invalidate(self) -> None:
+        seller = self._register(["weather"])
+        etag = self.client.get("/v1/sellers").headers["etag"]
+
+        self._register(["sports"])
+        listed = self.client.get("/v1/sellers", headers={"If-None-Match": etag})
+        self.assertEqual(listed.status_code, 200)
+        self.assertEqual(len(listed.json()["items"]), 2)
+
+        one_etag = self.client.get(f"/v1/sellers/{seller['seller_id']}").headers["etag"]
+        self.client.patch(f"/v1/sellers/{seller['seller_id']}", json={"description": "new"})
+        one = self.client.get(f"/v1/sellers/{seller['seller_id']}", headers={"If-None-Match": one_etag})
+        self.assertEqual(one.status_code, 200)
+        self.assertEqual(one.json()["description"], "new")
+
+        self.client.post("/v1/sellers/unregister", json={"seller_id": seller["seller_id"]})
+        self.assertEqual(self.client.get("/v1/sellers/search", params={"keyword": "weather"}).json()["items"], [])
+
+    def test_search_key_is_normalized(self) -> None:
+        self._register(["weather"])
+        self.client.get("/v1/sellers/search", params={"keyword": "Weather"})
+        misses = self.cache.misses
+        resp = self.client.get("/v1/sellers/search", params={"keyword": "  weather "})
+        self.assertEqual(len(resp.json()["items"]), 1)
+        self.assertEqual(self.cache.misses, misses)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import json
+import unittest
+
+import httpx
+from contextswap.jsonrpc import JsonRpcClient, JsonRpcError
+from contextswap.platform.db import models
+from contextswap.platform.db.engine import connect_sqlite, init_db
+from contextswap.platform.services.confirmation_tracker import ConfirmationTracker
+from contextswap.x402 import make_requirements
+from contextswap.x402_tron import make_requirements as make_tron_requirements
+
+SELLER = "0x1111111111111111111111111111111111111111"
+
+
+class FakeConfluxRpc:
+    def __init__(self, receipts: dict) -> None:
+        self.receipts = receipts
+        self.batches: list[list] = []
+
+    def batch(self, calls):
+        self.batches.append(list(calls))
+        return [self.receipts.get(params[0]) for _, params in calls]
+
+
+class FakeTronClient:
+    def __init__(self, infos: dict) -> None:
+        self.infos = infos
+        self.calls: list[str] = []
+
+    def post(self, path: str, payload: dict) -> dict:
+        self.calls.append(payload["value"])
+        return self.infos.get(payload["value"], {})
+
+
+class FakeNode:
+    def __init__(self) -> None:
+        self.bodies: list = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        self.bodies.append(body)
+        # 故意乱序返回，并让第二个调用出错
+        return httpx.Response(
+            200,
+            json=[
+                {"jsonrpc": "2.0", "id": body[1]["id"], "error": {"code": -32000, "message": "bad hash"}},
+                {"jsonrpc": "2.0", "id": body[0]["id"], "result": {"status": "0x1"}},
+            ],
+        )
+
+
+class ConfirmationTrackerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn = connect_sqlite(":memory:")
+        init_db(self.conn)
+        models.create_seller(
+            self.conn,
+            seller_id="seller-1",
+            evm_address=SELLER,
+            price_wei=1000,
+            price_conflux_wei=1000,
+            price_tron_sun=1000,
+            description="seller",
+            keywords="k1",
+            status="active",
+        )
+
+    def tearDown(self) -> None:
+        self.conn.close()
+
+    def _tx(self, transaction_id: str, tx_hash: str | None, *, tron: bool = False, created_at: str | None = None) -> None:
+        requirements = make_tron_requirements(SELLER, 1000) if tron else make_requirements(SELLER, 1000)
+        models.create_transaction(
+            self.conn,
+            transaction_id=transaction_id,
+            seller_id="seller-1",
+            buyer_address=SELLER,
+            price_wei=1000,
+            status="paid",
+            payment_payload_json="{}",
+            requirements_json=json.dumps(requirements),
+            tx_hash=tx_hash,
+            chat_id=None,
+            message_thread_id=None,
+            metadata_json="{}",
+        )
+        if created_at:
+            self.conn.execute(
+                "UPDATE transactions SET created_at = ? WHERE transaction_id = ?", (created_at, transaction_id)
+            )
+            self.conn.commit()
+
+    def _status(self, transaction_id: str) -> tuple:
+        tx = models.get_transaction_by_id(self.conn, transaction_id=transaction_id)
+        return tx.confirmation_status, tx.confirmation_block  # type: ignore[union-attr]
+
+    def test_single_pass_resolves_both_chains(self) -> None:
+        self._tx("c-ok", "aa" * 32)
+        self._tx("c-reverted", "0x" + "bb" * 32)
+        self._tx("c-pending", "cc" * 32)
+        self._tx("c-dropped", "dd" * 32, created_at="2020-01-01T00:00:00+00:00")
+        self._tx("c-unsettled", None)
+        self._tx("t-ok", "ee" * 32, tron=True)
+        self._tx("t-failed", "ff" * 32, tron=True)
+        conflux = FakeConfluxRpc(
+            {
+                "0x" + "aa" * 32: {"status": "0x1", "blockNumber": "0x10"},
+                "0x" + "bb" * 32: {"status": "0x0", "blockNumber": "0x11"},
+            }
+        )
+        tron = FakeTronClient(
+            {
+                "ee" * 32: {"blockNumber": 7, "receipt": {"net_usage": 268}},
+                "ff" * 32: {"blockNumber": 8, "result": "FAILED"},
+            }
+        )
+        tracker = ConfirmationTracker(self.conn, conflux_rpc=conflux, tron_client=tron, batch_size=3)
+
+        self.assertEqual(tracker.run_once(), 5)
+        self.assertEqual([len(b) for b in conflux.batches], [3, 1])
+        self.assertEqual(self._status("c-ok"), ("confirmed", 16))
+        self.assertEqual(self._status("c-reverted"), ("failed", 17))
+        self.assertEqual(self._status("c-pending"), (None, None))
+        self.assertEqual(self._status("c-dropped"), ("failed", None))
+        self.assertEqual(self._status("c-unsettled"), (None, None))
+        self.assertEqual(self._status("t-ok"), ("confirmed", 7))
+        self.assertEqual(self._status("t-failed"), ("failed", 8))
+
+        conflux.batches.clear()
+        tracker.run_once()
+        self.assertEqual(conflux.batches, [[("eth_getTransactionReceipt", ["0x" + "cc" * 32])]])
+
+    def test_unconfigured_network_does_not_starve_pass(self) -> None:
+        self._tx("t-1", "ee" * 32, tron=True)
+        self._tx("t-2", "ff" * 32, tron=True)
+        self._tx("c-ok", "aa" * 32)
+        conflux = FakeConfluxRpc({"0x" + "aa" * 32: {"status": "0x1", "blockNumber": "0x10"}})
+        tracker = ConfirmationTracker(self.conn, conflux_rpc=conflux, tron_client=None, max_per_pass=2)
+
+        self.assertEqual(tracker.run_once(), 1)
+        self.assertEqual(self._status("c-ok"), ("confirmed", 16))
+        self.assertEqual(self._status("t-1"), (None, None))
+
+    def test_rpc_outage_does_not_expire_transactions(self) -> None:
+        self._tx("c-old", "aa" * 32, created_at="2020-01-01T00:00:00+00:00")
+
+        class DownRpc:
+            def batch(self, calls):
+                raise RuntimeError("connection refused")
+
+        tracker = ConfirmationTracker(self.conn, conflux_rpc=DownRpc(), tron_client=None)  # type: ignore[arg-type]
+        self.assertEqual(tracker.run_once(), 0)
+        self.assertEqual(self._status("c-old"), (None, None))
+
+
+class JsonRpcBatchTest(unittest.TestCase):
+    def test_batch_matches_ids_and_isolates_errors(self) -> None:
+        node = FakeNode()
+        client = JsonRpcClient("http://rpc.test", client=httpx.Client(transport=httpx.MockTransport(node)))
+        results = client.batch([("eth_getTransactionReceipt", ["0x1"]), ("eth_getTransactionReceipt", ["0x2"])])
+        self.assertEqual(results[0], {"status": "0x1"})
+        self.assertIsInstance(results[1], JsonRpcError)
+        self.assertEqual(len(node.bodies), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,229 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from contextswap.platform.db import models
+from contextswap.platform.db.engine import init_db, open_database
+from contextswap.platform.db.pool import MaterializedCursor, is_read_statement
+from contextswap.platform.services import seller_service
+
+
+class ReadStatementTest(unittest.TestCase):
+    def test_classification(self) -> None:
+        self.assertTrue(is_read_statement("  SELECT * FROM sellers"))
+        self.assertTrue(is_read_statement("-- c\nWITH x AS (SELECT 1) SELECT * FROM x"))
+        self.assertTrue(is_read_statement("PRAGMA table_info(sellers)"))
+        self.assertFalse(is_read_statement("WITH x AS (SELECT 1) DELETE FROM sellers"))
+        self.assertFalse(is_read_statement("PRAGMA journal_mode = WAL"))
+        self.assertFalse(is_read_statement("UPDATE sellers SET status = 'x'"))
+
+
+class ConnectionManagerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = open_database(os.path.join(self.tmp.name, "platform.sqlite3"), read_pool_size=2)
+        init_db(self.db)
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.tmp.cleanup()
+
+    def _register(self, index: int) -> None:
+        seller_service.register_seller(
+            self.db,
+            evm_address=f"0x{index:040x}",
+            price_wei=1000,
+            description=f"seller {index}",
+            keywords=["k1"],
+            seller_id=None,
+        )
+
+    def test_reads_use_pool_and_are_materialized(self) -> None:
+        self._register(1)
+        cur = self.db.execute("SELECT * FROM sellers")
+        self.assertIsInstance(cur, MaterializedCursor)
+        self.assertEqual(len(cur.fetchall()), 1)
+
+        errors: list[BaseException] = []
+
+        def reader() -> None:
+            try:
+                for _ in range(50):
+                    self.assertEqual(len(models.list_sellers(self.db, status="active")), 1)
+            except BaseException as exc:  # noqa: BLE001
+                errors.append(exc)
+
+        threads = [threading.Thread(target=reader) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(self.db._all_readers), 2)
+
+    def test_concurrent_writers_are_serialized(self) -> None:
+        threads = [threading.Thread(target=self._register, args=(i,)) for i in range(1, 21)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(models.list_sellers(self.db, limit=100)), 20)
+
+    def test_writer_lock_held_until_commit(self) -> None:
+        self._register(1)
+        self.db.execute("UPDATE sellers SET description = 'pending'")
+        self.assertTrue(self.db.in_transaction)
+        # 持有写锁的线程读到自己未提交的修改；其它线程的读不受影响
+        self.assertEqual(self.db.execute("SELECT description FROM sellers").fetchone()[0], "pending")
+        seen: list[str] = []
+        t = threading.Thread(target=lambda: seen.append(self.db.execute("SELECT description FROM sellers").fetchone()[0]))
+        t.start()
+        t.join()
+        self.assertEqual(seen, ["seller 1"])
+
+        acquired = threading.Event()
+        t = threading.Thread(target=lambda: (self._register(2), acquired.set()))
+        t.start()
+        self.assertFalse(acquired.wait(0.2))
+        self.db.commit()
+        self.assertTrue(acquired.wait(5))
+        t.join()
+
+    def test_failed_or_noop_writes_release_lock(self) -> None:
+        self._register(1)
+        with self.assertRaises(models.AlreadyExistsError):
+            seller = models.list_sellers(self.db)[0]
+            models.create_seller(
+                self.db,
+                seller_id=seller.seller_id,
+                evm_address=seller.evm_address,
+                price_wei=1,
+                price_conflux_wei=1,
+                price_tron_sun=None,
+                description="dup",
+                keywords="",
+                status="active",
+            )
+        with self.assertRaises(models.DbError):
+            models.update_seller_fields(self.db, seller_id="missing", fields={"description": "x"})
+
+        done = threading.Event()
+        t = threading.Thread(target=lambda: (self._register(2), done.set()))
+        t.start()
+        self.assertTrue(done.wait(5))
+        t.join()
+
+    def test_operation_failing_after_first_write_releases_lock(self) -> None:
+        self._register(1)
+
+        def insert_twice(conn) -> None:
+            conn.execute("UPDATE sellers SET description = 'partial'")
+            conn.execute("INSERT INTO sellers SELECT * FROM sellers")
+            conn.commit()
+
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.db.run_write(insert_twice, self.db)
+        self.assertFalse(self.db.in_transaction)
+        self.assertEqual(self.db.execute("SELECT description FROM sellers").fetchone()[0], "seller 1")
+
+        done = threading.Event()
+        t = threading.Thread(target=lambda: (self._register(2), done.set()))
+        t.start()
+        self.assertTrue(done.wait(5))
+        t.join()
+
+    def test_memory_database_shares_single_connection(self) -> None:
+        db = open_database(":memory:")
+        try:
+            init_db(db)
+            self.assertEqual(db.read_pool_size, 0)
+            db.execute(
+                "INSERT INTO sellers (seller_id, evm_address, price_wei, description, keywords, status, created_at, updated_at)"
+                " VALUES ('s1', '0x1', 1, '', '', 'active', '', '')"
+            )
+            db.commit()
+            self.assertEqual(db.execute("SELECT COUNT(*) FROM sellers").fetchone()[0], 1)
+        finally:
+            db.close()
+
+
+class GroupCommitTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = open_database(
+            os.path.join(self.tmp.name, "platform.sqlite3"),
+            read_pool_size=2,
+            group_commit=True,
+            group_commit_window=0.05,
+        )
+        init_db(self.db)
+
+    def tearDown(self) -> None:
+        self.db.close()
+        self.tmp.cleanup()
+
+    def _create(self, index: int) -> models.Seller:
+        return models.create_seller(
+            self.db,
+            seller_id=f"s{index}",
+            evm_address=f"0x{index:040x}",
+            price_wei=1,
+            price_conflux_wei=1,
+            price_tron_sun=None,
+            description=f"seller {index}",
+            keywords="k",
+            status="active",
+        )
+
+    def test_concurrent_writes_share_commits(self) -> None:
+        results: dict[int, object] = {}
+
+        def worker(index: int) -> None:
+            try:
+                results[index] = self._create(index % 10)
+            except BaseException as exc:  # noqa: BLE001
+                results[index] = exc
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        created = [r for r in results.values() if isinstance(r, models.Seller)]
+        duplicates = [r for r in results.values() if isinstance(r, models.AlreadyExistsError)]
+        self.assertEqual(len(created), 10)
+        self.assertEqual(len(duplicates), 10)
+        self.assertLess(self.db.group_commits, 20)
+        self.assertEqual(self.db.execute("SELECT COUNT(*) FROM sellers").fetchone()[0], 10)
+        self.assertEqual(self.db.execute("SELECT COUNT(*) FROM seller_keywords").fetchone()[0], 10)
+
+    def test_failed_operation_is_rolled_back_alone(self) -> None:
+        self._create(1)
+        with self.assertRaises(models.DbError):
+            models.update_seller_fields(self.db, seller_id="missing", fields={"description": "x"})
+
+        def half_write() -> None:
+            self.db.execute("UPDATE sellers SET description = 'partial'")
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            self.db.run_write(half_write)
+        updated = models.update_seller_fields(self.db, seller_id="s1", fields={"description": "ok"})
+        self.assertEqual(updated.description, "ok")
+        self.assertFalse(self.db.in_transaction)
+
+    def test_disabled_runs_inline(self) -> None:
+        db = open_database(os.path.join(self.tmp.name, "inline.sqlite3"))
+        try:
+            init_db(db)
+            self.assertEqual(db.run_write(lambda: threading.current_thread()), threading.current_thread())
+            self.assertIsNone(db._committer)
+        finally:
+            db.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
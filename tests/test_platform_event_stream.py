@@ -0,0 +1,121 @@
+import asyncio
+import json
+import threading
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from contextswap.platform.api.routes.events import event_stream, router as events_router
+from contextswap.platform.services.event_bus import EventBus
+
+
+def _frame(raw: bytes) -> dict:
+    fields = {}
+    for line in raw.decode("utf-8").strip().splitlines():
+        key, _, value = line.partition(": ")
+        fields[key] = value
+    return fields
+
+
+class EventBusTest(unittest.TestCase):
+    def test_since_and_ring_eviction(self) -> None:
+        bus = EventBus(max_events=3)
+        for i in range(5):
+            bus.publish("transaction", {"transaction_id": f"tx-{i}"})
+        self.assertEqual(bus.last_id, 5)
+        events, gap = bus.since(3)
+        self.assertFalse(gap)
+        self.assertEqual([e.id for e in events], [4, 5])
+        self.assertEqual([e.id for e in bus.since(2)[0]], [3, 4, 5])
+        self.assertEqual(bus.since(1), ([], True))
+        # 进程重启后旧客户端带来更大的 id
+        self.assertEqual(bus.since(9), ([], True))
+        self.assertEqual(EventBus().since(0), ([], False))
+
+    def test_subscriber_woken_by_publish_from_thread(self) -> None:
+        bus = EventBus()
+        bus.publish("transaction", {"transaction_id": "old"})
+
+        async def run() -> list:
+            stream = bus.subscribe(None, keepalive=5)
+            first = asyncio.ensure_future(stream.__anext__())
+            await asyncio.sleep(0.05)
+            threading.Thread(target=bus.publish, args=("session", {"transaction_id": "new"})).start()
+            got = await asyncio.wait_for(first, timeout=2)
+            await stream.aclose()
+            return [got]
+
+        (event,) = asyncio.run(run())
+        self.assertEqual((event.id, event.type, event.data), (2, "session", {"transaction_id": "new"}))
+        self.assertEqual(bus._waiters, set())
+
+    def test_resume_and_reset(self) -> None:
+        bus = EventBus(max_events=2)
+        for i in range(4):
+            bus.publish("transaction", {"transaction_id": f"tx-{i}"})
+
+        async def take(last_id: int, count: int) -> list:
+            stream = bus.subscribe(last_id, keepalive=0.01)
+            items = [await stream.__anext__() for _ in range(count)]
+            await stream.aclose()
+            return items
+
+        resumed = asyncio.run(take(3, 2))
+        self.assertEqual(resumed[0].id, 4)
+        self.assertIsNone(resumed[1])
+        reset, keepalive = asyncio.run(take(1, 2))
+        self.assertEqual((reset.id, reset.type, reset.data), (4, "reset", {"last_event_id": 4}))
+        self.assertIsNone(keepalive)
+
+
+class EventStreamTest(unittest.TestCase):
+    def test_stream_frames_filter_and_keepalive(self) -> None:
+        bus = EventBus()
+        bus.publish("transaction", {"transaction_id": "tx-a", "status": "paid"})
+        bus.publish("transaction", {"transaction_id": "tx-b", "status": "paid"})
+        bus.publish("session", {"transaction_id": "tx-a", "status": "ended"})
+
+        async def run() -> list[bytes]:
+            stream = event_stream(bus, last_event_id=0, transaction_id="tx-a", keepalive=0.01)
+            frames = [await stream.__anext__() for _ in range(4)]
+            await stream.aclose()
+            return frames
+
+        retry, first, second, keepalive = asyncio.run(run())
+        self.assertEqual(retry, b"retry: 3000\n\n")
+        self.assertEqual((_frame(first)["id"], _frame(first)["event"]), ("1", "transaction"))
+        self.assertEqual(json.loads(_frame(first)["data"]), {"transaction_id": "tx-a", "status": "paid"})
+        self.assertEqual(json.loads(_frame(second)["data"]), {"transaction_id": "tx-a", "status": "ended"})
+        self.assertEqual(_frame(second)["id"], "3")
+        self.assertEqual(keepalive, b": keepalive\n\n")
+
+    def test_reset_frame_carries_new_resume_id(self) -> None:
+        bus = EventBus(max_events=1)
+        bus.publish("transaction", {"transaction_id": "tx-a"})
+        bus.publish("transaction", {"transaction_id": "tx-b"})
+
+        async def run() -> bytes:
+            stream = event_stream(bus, last_event_id=0, transaction_id="tx-a", keepalive=0.01)
+            await stream.__anext__()
+            frame = await stream.__anext__()
+            await stream.aclose()
+            return frame
+
+        frame = _frame(asyncio.run(run()))
+        self.assertEqual((frame["id"], frame["event"]), ("2", "reset"))
+        self.assertEqual(json.loads(frame["data"]), {"last_event_id": 2})
+
+    def test_route_rejects_disabled_bus_and_bad_id(self) -> None:
+        app = FastAPI()
+        app.include_router(events_router)
+        app.state.event_bus = None
+        client = TestClient(app)
+        self.assertEqual(client.get("/v1/events/stream").status_code, 503)
+        app.state.event_bus = EventBus()
+        resp = client.get("/v1/events/stream", headers={"Last-Event-ID": "abc"})
+        self.assertEqual(resp.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from contextswap.platform.db.engine import MIGRATIONS, connect_sqlite, init_db
+from contextswap.platform.db.migrations import Migration, migrate, schema_version
+
+
+class MigrationsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.conn = connect_sqlite(os.path.join(self.tmp.name, "platform.sqlite3"))
+
+    def tearDown(self) -> None:
+        self.conn.close()
+        self.tmp.cleanup()
+
+    def test_fresh_database_records_every_version(self) -> None:
+        init_db(self.conn)
+        versions = [row["version"] for row in self.conn.execute("SELECT version FROM schema_version ORDER BY version")]
+        self.assertEqual(versions, [m.version for m in MIGRATIONS])
+
+    def test_restart_only_reads_schema_version(self) -> None:
+        init_db(self.conn)
+        statements: list[str] = []
+        self.conn.set_trace_callback(statements.append)
+        init_db(self.conn)
+        self.conn.set_trace_callback(None)
+        self.assertTrue(statements)
+        self.assertEqual(len(statements), 3, statements)
+        self.assertFalse(any(sql.lstrip().upper().startswith(("CREATE", "UPDATE", "BEGIN")) for sql in statements))
+        self.assertFalse(any("table_info" in sql for sql in statements), statements)
+
+    def test_pre_versioning_database_is_adopted(self) -> None:
+        init_db(self.conn)
+        self.conn.execute(
+            "INSERT INTO sellers (seller_id, evm_address, price_wei, price_conflux_wei, description, keywords, status,"
+            " created_at, updated_at) VALUES ('s1', '0x1', 7, NULL, '', '', 'active', 'a', 'a')"
+        )
+        self.conn.execute("DROP TABLE schema_version")
+        self.conn.commit()
+
+        init_db(self.conn)
+        row = self.conn.execute("SELECT price_conflux_wei FROM sellers WHERE seller_id = 's1'").fetchone()
+        self.assertEqual(row[0], 7)
+        self.assertEqual(schema_version(self.conn), MIGRATIONS[-1].version)
+
+    def test_failed_migration_is_not_recorded(self) -> None:
+        def broken(conn: sqlite3.Connection) -> None:
+            conn.execute("CREATE TABLE half_done (id INTEGER)")
+            raise RuntimeError("boom")
+
+        init_db(self.conn)
+        steps = (*MIGRATIONS, Migration(MIGRATIONS[-1].version + 1, "broken", broken))
+        with self.assertRaises(RuntimeError):
+            migrate(self.conn, steps)
+        self.assertEqual(schema_version(self.conn), MIGRATIONS[-1].version)
+        exists = self.conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'half_done'").fetchone()
+        self.assertIsNone(exists)
+
+        applied = migrate(self.conn, (*MIGRATIONS, Migration(steps[-1].version, "fixed", lambda conn: "ok")))
+        self.assertEqual(applied, {steps[-1].version: "ok"})
+
+    def test_versions_must_ascend(self) -> None:
+        noop = lambda conn: None  # noqa: E731
+        with self.assertRaises(ValueError):
+            migrate(self.conn, (Migration(2, "b", noop), Migration(1, "a", noop)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import unittest
+
+from contextswap.platform.db import models
+from contextswap.platform.db.engine import connect_sqlite, init_db
+
+
+class KeysetPaginationTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn = connect_sqlite(":memory:")
+        init_db(self.conn)
+        for i in range(5):
+            models.create_seller(
+                self.conn,
+                seller_id=f"seller-{i}",
+                evm_address=f"0x{i:040x}",
+                price_wei=1,
+                price_conflux_wei=1,
+                price_tron_sun=None,
+                description="",
+                keywords="",
+                status="active",
+            )
+        # 相同 created_at 的行依赖 id 打破平局
+        for i in range(7):
+            models.create_transaction(
+                self.conn,
+                transaction_id=f"tx-{i}",
+                seller_id=f"seller-{i % 2}",
+                buyer_address="0xbuyer",
+                price_wei=1,
+                status="paid" if i % 3 else "session_created",
+                payment_payload_json="{}",
+                requirements_json=json.dumps({}),
+                tx_hash=None,
+                chat_id=None,
+                message_thread_id=None,
+                metadata_json="{}",
+            )
+
+    def tearDown(self) -> None:
+        self.conn.close()
+
+    def _walk(self, fetch, cursor_of, limit: int) -> list:
+        seen, cursor = [], None
+        while True:
+            page = fetch(limit=limit, cursor=cursor)
+            seen.extend(page)
+            if len(page) < limit:
+                return seen
+            cursor = cursor_of(page[-1])
+
+    def test_cursor_pages_match_offset_order(self) -> None:
+        walked = self._walk(
+            lambda **kw: models.list_transactions(self.conn, **kw),
+            models.transaction_cursor,
+            limit=3,
+        )
+        by_offset = models.list_transactions(self.conn, limit=50)
+        self.assertEqual([t.transaction_id for t in walked], [t.transaction_id for t in by_offset])
+        self.assertEqual(walked[0].transaction_id, "tx-6")
+
+        filtered = self._walk(
+            lambda **kw: models.list_transactions(self.conn, seller_id="seller-1", **kw),
+            models.transaction_cursor,
+            limit=2,
+        )
+        self.assertEqual([t.transaction_id for t in filtered], ["tx-5", "tx-3", "tx-1"])
+
+        sellers = self._walk(
+            lambda **kw: models.list_sellers(self.conn, status="active", **kw),
+            models.seller_cursor,
+            limit=2,
+        )
+        self.assertEqual([s.seller_id for s in sellers], [f"seller-{i}" for i in range(4, -1, -1)])
+
+    def test_invalid_cursor(self) -> None:
+        with self.assertRaises(ValueError):
+            models.list_transactions(self.conn, cursor="not-a-cursor")
+
+    def test_filtered_listing_uses_composite_index(self) -> None:
+        cursor = models.encode_cursor("9999", 1 << 40)
+        for sql, params in (
+            (
+                "SELECT * FROM transactions WHERE status = ? AND (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC LIMIT 10",
+                ("paid", *models.decode_cursor(cursor)),
+            ),
+            (
+                "SELECT * FROM transactions WHERE seller_id = ? ORDER BY created_at DESC, id DESC LIMIT 10",
+                ("seller-1",),
+            ),
+        ):
+            plan = " ".join(row[3] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall())
+            self.assertIn("USING INDEX idx_transactions_", plan)
+            self.assertNotIn("TEMP B-TREE", plan)
+
+
+if __name__ == "__main__":
+    unittest.main()
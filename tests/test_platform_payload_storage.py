@@ -0,0 +1,146 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from contextswap.platform.db import models
+from contextswap.platform.db.engine import connect_sqlite, init_db
+from contextswap.platform.services import transaction_service
+
+LEGACY_SCHEMA = """
+CREATE TABLE sellers (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  seller_id TEXT NOT NULL UNIQUE,
+  evm_address TEXT NOT NULL,
+  price_wei INTEGER NOT NULL,
+  description TEXT NOT NULL,
+  keywords TEXT NOT NULL,
+  status TEXT NOT NULL,
+  created_at TEXT NOT NULL,
+  updated_at TEXT NOT NULL
+);
+CREATE TABLE transactions (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  transaction_id TEXT NOT NULL UNIQUE,
+  seller_id TEXT NOT NULL,
+  buyer_address TEXT NOT NULL,
+  price_wei INTEGER NOT NULL,
+  status TEXT NOT NULL,
+  payment_payload_json TEXT NOT NULL,
+  requirements_json TEXT NOT NULL,
+  tx_hash TEXT,
+  chat_id TEXT,
+  message_thread_id INTEGER,
+  metadata_json TEXT NOT NULL,
+  error_reason TEXT,
+  created_at TEXT NOT NULL,
+  updated_at TEXT NOT NULL,
+  FOREIGN KEY (seller_id) REFERENCES sellers(seller_id)
+);
+"""
+
+
+def _requirements(seller: int) -> str:
+    return json.dumps({"x402Version": 2, "accepts": [{"network": "eip155:71", "payTo": f"0x{seller:040x}"}]})
+
+
+def _payload(index: int) -> str:
+    return json.dumps({"payload": {"rawTransaction": "0x" + "f8" * 300 + f"{index:04x}"}})
+
+
+class PayloadStorageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "platform.sqlite3")
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+
+    def test_new_rows_share_requirements(self) -> None:
+        conn = connect_sqlite(self.path)
+        try:
+            init_db(conn)
+            models.create_seller(
+                conn,
+                seller_id="s1",
+                evm_address="0x1",
+                price_wei=1,
+                price_conflux_wei=1,
+                price_tron_sun=None,
+                description="",
+                keywords="",
+                status="active",
+            )
+            for i in range(3):
+                tx = models.create_transaction(
+                    conn,
+                    transaction_id=f"tx-{i}",
+                    seller_id="s1",
+                    buyer_address="0xbuyer",
+                    price_wei=1,
+                    status="paid",
+                    payment_payload_json=_payload(i),
+                    requirements_json=_requirements(1),
+                    tx_hash=None,
+                    chat_id=None,
+                    message_thread_id=None,
+                    metadata_json="{}",
+                )
+                self.assertEqual(tx.payment_payload_json, _payload(i))
+                self.assertEqual(tx.requirements_json, _requirements(1))
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM requirements").fetchone()[0], 1)
+            updated = models.update_transaction_fields(conn, transaction_id="tx-0", fields={"status": "failed"})
+            self.assertEqual(updated.requirements_json, _requirements(1))
+            listed = models.list_transactions(conn, limit=10)
+            self.assertEqual({t.payment_payload_json for t in listed}, {_payload(i) for i in range(3)})
+        finally:
+            conn.close()
+
+    def test_legacy_database_is_compacted(self) -> None:
+        legacy = sqlite3.connect(self.path)
+        legacy.executescript(LEGACY_SCHEMA)
+        legacy.execute(
+            "INSERT INTO sellers (seller_id, evm_address, price_wei, description, keywords, status, created_at, updated_at)"
+            " VALUES ('s1', '0x1', 1, '', '', 'active', '2024-01-01', '2024-01-01')"
+        )
+        legacy.executemany(
+            "INSERT INTO transactions (transaction_id, seller_id, buyer_address, price_wei, status, payment_payload_json,"
+            " requirements_json, metadata_json, created_at, updated_at)"
+            " VALUES (?, 's1', '0xbuyer', 1, 'paid', ?, ?, '{}', '2024-01-01T00:00:00+00:00', '2024-01-01T00:00:00+00:00')",
+            [(f"tx-{i}", _payload(i), _requirements(i % 2)) for i in range(200)],
+        )
+        legacy.commit()
+        legacy.close()
+
+        conn = connect_sqlite(self.path)
+        try:
+            report = init_db(conn)
+            self.assertEqual(report.rows, 200)
+            self.assertEqual(report.requirements, 2)
+            self.assertGreater(report.bytes_reclaimed, 0)
+            self.assertEqual(init_db(conn).rows, 0)
+
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(transactions)").fetchall()}
+            self.assertNotIn("requirements_json", columns)
+            tx = models.get_transaction_by_id(conn, transaction_id="tx-7")
+            assert tx is not None
+            self.assertEqual(tx.payment_payload_json, _payload(7))
+            self.assertEqual(tx.requirements_json, _requirements(1))
+            self.assertEqual(transaction_service.transaction_to_dict(tx)["payment_network"], "conflux")
+
+            # 索引与统计触发器随表重建
+            indexes = {row["name"] for row in conn.execute("PRAGMA index_list(transactions)").fetchall()}
+            self.assertIn("idx_transactions_status_created", indexes)
+            models.update_transaction_fields(conn, transaction_id="tx-7", fields={"status": "failed"})
+            failed = conn.execute(
+                "SELECT count FROM market_stats WHERE kind = 'transaction_status' AND key = 'failed'"
+            ).fetchone()
+            self.assertEqual(failed[0], 1)
+            self.assertEqual(conn.execute("PRAGMA foreign_keys").fetchone()[0], 1)
+        finally:
+            conn.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+from contextswap.platform.api.deps import get_read_db
+from contextswap.platform.db import models
+from contextswap.platform.db.engine import init_db, open_database, utc_now_iso
+from contextswap.platform.services.replica import ReadReplica
+
+
+class ReadReplicaTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "platform.sqlite3")
+        self.db = open_database(self.path, read_pool_size=2)
+        init_db(self.db)
+        self.replica = ReadReplica(self.path, os.path.join(self.tmp.name, "platform.replica.sqlite3"), pages=8)
+
+    def tearDown(self) -> None:
+        self.replica.close()
+        self.db.close()
+        self.tmp.cleanup()
+
+    def _create_seller(self, seller_id: str, keywords: str = "alpha") -> None:
+        models.create_seller(
+            self.db,
+            seller_id=seller_id,
+            evm_address=f"0x{seller_id}",
+            price_wei=1,
+            price_conflux_wei=1,
+            price_tron_sun=None,
+            description="replicated seller",
+            keywords=keywords,
+            status="active",
+        )
+
+    def test_replica_serves_snapshot_until_next_refresh(self) -> None:
+        self._create_seller("s1")
+        self.assertIsNone(self.replica.db)
+        self.assertGreater(self.replica.refresh(), 0)
+        assert self.replica.db is not None
+        self.assertEqual([s.seller_id for s in models.list_sellers(self.replica.db, limit=10)], ["s1"])
+
+        self._create_seller("s2", keywords="beta")
+        self.assertEqual(len(models.list_sellers(self.replica.db, limit=10)), 1)
+        self.replica.refresh()
+        self.assertEqual(len(models.list_sellers(self.replica.db, limit=10)), 2)
+        self.assertEqual(
+            [s.seller_id for s in models.find_sellers_by_keywords(self.replica.db, all_keywords=["beta"], any_keywords=[])],
+            ["s2"],
+        )
+
+    def test_refresh_does_not_wait_for_open_write(self) -> None:
+        self._create_seller("s1")
+        now = utc_now_iso()
+        self.db.execute(
+            "INSERT INTO sellers (seller_id, evm_address, price_wei, description, keywords, status, created_at, updated_at)"
+            " VALUES ('pending', '0x2', 1, '', '', 'active', ?, ?)",
+            (now, now),
+        )
+        try:
+            self.replica.refresh()
+        finally:
+            self.db.commit()
+        assert self.replica.db is not None
+        self.assertEqual([s.seller_id for s in models.list_sellers(self.replica.db, limit=10)], ["s1"])
+
+    def test_read_dependency_falls_back_to_primary(self) -> None:
+        state = SimpleNamespace(db=self.db, replica=self.replica)
+        request = SimpleNamespace(app=SimpleNamespace(state=state))
+        self.assertIs(get_read_db(request), self.db)
+        self.replica.refresh()
+        self.assertIs(get_read_db(request), self.replica.db)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,8 @@ import unittest
 
 from eth_account import Account
 
-from contextswap.platform.db.engine import connect_sqlite, init_db
+from contextswap.platform.db import engine, models
+from contextswap.platform.db.engine import SQLITE_SUPPORTS_RETURNING, connect_sqlite, init_db
 from contextswap.platform.services import seller_service
 
 
@@ -49,6 +50,131 @@ class SellerServiceTest(unittest.TestCase):
         results = seller_service.search_sellers(self.conn, keyword="gamma")
         self.assertEqual(results, [])
 
+    def _register(self, description: str, keywords: str):
+        return seller_service.register_seller(
+            self.conn,
+            evm_address=Account.create().address,
+            price_wei=100,
+            description=description,
+            keywords=keywords,
+            seller_id=None,
+        )
+
+    def test_full_text_search_prefix_and_ranking(self) -> None:
+        in_description = self._register("weather reports for travellers", "travel")
+        in_keywords = self._register("daily data feed", "weather,forecast")
+        self._register("sports scores", "sports")
+
+        results = seller_service.search_sellers(self.conn, keyword="weath")
+        self.assertEqual([s.seller_id for s in results], [in_keywords.seller_id, in_description.seller_id])
+        self.assertEqual(seller_service.search_sellers(self.conn, keyword="weather forecast")[0].seller_id, in_keywords.seller_id)
+        self.assertEqual(seller_service.search_sellers(self.conn, keyword="\"*"), [])
+
+        page = seller_service.search_sellers(self.conn, keyword="weather", limit=1, offset=1)
+        self.assertEqual([s.seller_id for s in page], [in_description.seller_id])
+
+    def test_infix_and_cjk_search(self) -> None:
+        cjk = self._register("提供每日天气预报数据", "天气")
+        english = self._register("hourly weather forecast", "weather")
+
+        self.assertEqual([s.seller_id for s in seller_service.search_sellers(self.conn, keyword="预报")], [cjk.seller_id])
+        self.assertEqual([s.seller_id for s in seller_service.search_sellers(self.conn, keyword="天气预报")], [cjk.seller_id])
+        self.assertEqual([s.seller_id for s in seller_service.search_sellers(self.conn, keyword="ecast")], [english.seller_id])
+        self.assertEqual(seller_service.search_sellers(self.conn, keyword="预测"), [])
+
+    def test_unicode61_index_is_rebuilt_as_trigram(self) -> None:
+        seller = self._register("hourly weather forecast", "weather")
+        self.conn.executescript(
+            """
+            DROP TRIGGER sellers_fts_ai;
+            DROP TRIGGER sellers_fts_ad;
+            DROP TRIGGER sellers_fts_au;
+            DROP TABLE sellers_fts;
+            DELETE FROM schema_version WHERE version >= 6;
+            """
+        )
+        engine._ensure_seller_fts(self.conn)
+        self.conn.commit()
+        init_db(self.conn)
+        sql = self.conn.execute("SELECT sql FROM sqlite_master WHERE name = 'sellers_fts'").fetchone()[0]
+        self.assertIn("trigram", sql)
+        match = models.fts_match_expression(models.search_terms("ecast"))
+        rows = self.conn.execute("SELECT rowid FROM sellers_fts WHERE sellers_fts MATCH ?", (match,)).fetchall()
+        self.assertEqual([r[0] for r in rows], [models.get_seller_by_id(self.conn, seller_id=seller.seller_id).id])
+
+    def test_index_follows_updates(self) -> None:
+        seller = self._register("old text", "legacy")
+        models.update_seller_fields(self.conn, seller_id=seller.seller_id, fields={"keywords": "modern"})
+        self.assertEqual(seller_service.search_sellers(self.conn, keyword="legacy"), [])
+        self.assertEqual(len(seller_service.search_sellers(self.conn, keyword="modern")), 1)
+
+    def test_existing_rows_are_indexed_on_upgrade(self) -> None:
+        self._register("pre-existing seller", "archive")
+        self.conn.executescript(
+            """
+            DROP TRIGGER sellers_fts_ai;
+            DROP TRIGGER sellers_fts_ad;
+            DROP TRIGGER sellers_fts_au;
+            DROP TABLE sellers_fts;
+            """
+        )
+        init_db(self.conn)
+        self.assertEqual(len(models.search_sellers(self.conn, keyword="archive")), 1)
+
+    def test_find_by_keywords_all_and_any(self) -> None:
+        both = self._register("a", "weather,forecast,asia")
+        weather_only = self._register("b", "weather,europe")
+        self._register("c", "sports,asia")
+
+        def ids(**kwargs):
+            return {s.seller_id for s in seller_service.find_sellers_by_keywords(self.conn, **kwargs)}
+
+        self.assertEqual(ids(all_keywords="weather,forecast"), {both.seller_id})
+        self.assertEqual(ids(any_keywords="forecast europe"), {both.seller_id, weather_only.seller_id})
+        self.assertEqual(ids(all_keywords=["Weather"], any_keywords="asia,europe"), {both.seller_id, weather_only.seller_id})
+        self.assertEqual(ids(all_keywords="weather", any_keywords="sports"), set())
+        with self.assertRaises(ValueError):
+            seller_service.find_sellers_by_keywords(self.conn, all_keywords=" , ")
+
+    def test_keyword_index_follows_updates_and_status(self) -> None:
+        seller = self._register("d", "legacy")
+        models.update_seller_fields(self.conn, seller_id=seller.seller_id, fields={"keywords": "modern,fresh"})
+        self.assertEqual(seller_service.find_sellers_by_keywords(self.conn, all_keywords="legacy"), [])
+        self.assertEqual(len(seller_service.find_sellers_by_keywords(self.conn, all_keywords="modern,fresh")), 1)
+
+        seller_service.unregister_seller(self.conn, seller_id=seller.seller_id)
+        self.assertEqual(seller_service.find_sellers_by_keywords(self.conn, any_keywords="modern"), [])
+
+    def test_keyword_index_backfilled_on_upgrade(self) -> None:
+        self._register("pre-existing seller", "archive,cold")
+        self.conn.executescript("DROP TABLE seller_keywords; DELETE FROM schema_version WHERE version >= 3;")
+        init_db(self.conn)
+        self.assertEqual(len(models.find_sellers_by_keywords(self.conn, all_keywords=["archive", "cold"], any_keywords=[])), 1)
+
+    @unittest.skipUnless(SQLITE_SUPPORTS_RETURNING, "SQLite < 3.35 falls back to SELECT after write")
+    def test_writes_read_back_via_returning(self) -> None:
+        statements: list[str] = []
+        self.conn.set_trace_callback(statements.append)
+        seller = models.create_seller(
+            self.conn,
+            seller_id="s1",
+            evm_address="0x1",
+            price_wei=1,
+            price_conflux_wei=1,
+            price_tron_sun=None,
+            description="d",
+            keywords="k",
+            status="active",
+        )
+        updated = models.update_seller_fields(self.conn, seller_id="s1", fields={"description": "new"})
+        self.conn.set_trace_callback(None)
+
+        self.assertEqual(updated.id, seller.id)
+        self.assertEqual(updated.description, "new")
+        self.assertFalse([s for s in statements if s.lstrip().upper().startswith("SELECT")])
+        with self.assertRaises(models.DbError):
+            models.update_seller_fields(self.conn, seller_id="missing", fields={"description": "x"})
+
 
 if __name__ == "__main__":
     unittest.main()
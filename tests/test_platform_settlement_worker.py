@@ -0,0 +1,269 @@
+import time
+import unittest
+
+from eth_account import Account
+from fastapi.testclient import TestClient
+
+from contextswap.facilitator.base import BaseFacilitator
+from contextswap.facilitator.client import DirectFacilitatorClient
+from contextswap.platform.api.app import create_app
+from contextswap.platform.config import Settings
+from contextswap.platform.db import models
+from contextswap.platform.db.engine import connect_sqlite, init_db
+from contextswap.platform.services import seller_service, transaction_service
+from contextswap.platform.services.settlement_worker import SettlementWorker
+from contextswap.x402 import CHAIN_ID, NETWORK_ID, b64decode_json, b64encode_json, make_requirements
+
+
+class TestFacilitator(BaseFacilitator):
+    def __init__(self, failures: int = 0) -> None:
+        super().__init__(CHAIN_ID, NETWORK_ID)
+        self.failures = failures
+        self.sent: list[str] = []
+
+    def send_raw_transaction(self, raw_hex: str) -> str:
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("rpc unavailable")
+        self.sent.append(raw_hex)
+        return transaction_service.compute_tx_hash(raw_hex)
+
+
+class FakeTgManagerClient:
+    def __init__(self) -> None:
+        self.calls: list[dict] = []
+
+    def create_session(self, **kwargs):
+        self.calls.append(kwargs)
+        return {"status": "running", "chat_id": "-100123", "message_thread_id": 456}
+
+    def close(self) -> None:
+        return None
+
+
+def _settings(**overrides) -> Settings:
+    values = dict(
+        sqlite_path=":memory:",
+        rpc_url="http://localhost:8545",
+        tron_rpc_url=None,
+        tron_api_key=None,
+        facilitator_base_url=None,
+        tg_manager_mode="http",
+        tg_manager_base_url=None,
+        tg_manager_auth_token=None,
+        tg_manager_sqlite_path=":memory:",
+        tg_manager_market_chat_id=None,
+        telethon_api_id=None,
+        telethon_api_hash=None,
+        telethon_session=None,
+        delegation_market_slug="will-donald-trump-win-the-2028-us-presidential-election",
+        delegation_question_dir="~/.openclaw/question",
+        delegation_wait_seconds=120,
+        mock_bots_enabled=False,
+        mock_bots_json=None,
+        mock_seller_auto_end=True,
+    )
+    values.update(overrides)
+    return Settings(**values)
+
+
+def _payment(requirements: dict, buyer_key: bytes, *, nonce: int = 0) -> dict:
+    accepts = requirements["accepts"][0]
+    signed = Account.sign_transaction(
+        {
+            "to": accepts["payTo"],
+            "value": int(accepts["amountWei"]),
+            "gas": 21000,
+            "gasPrice": 1,
+            "nonce": nonce,
+            "chainId": CHAIN_ID,
+        },
+        buyer_key,
+    )
+    return {
+        "x402Version": requirements["x402Version"],
+        "scheme": accepts.get("scheme", "exact"),
+        "network": accepts.get("network", NETWORK_ID),
+        "from": Account.from_key(buyer_key).address,
+        "to": accepts["payTo"],
+        "amountWei": str(accepts["amountWei"]),
+        "rawTransaction": signed.raw_transaction.hex(),
+    }
+
+
+class AsyncSettlementApiTest(unittest.TestCase):
+    def test_create_returns_202_and_worker_completes_session(self) -> None:
+        facilitator = TestFacilitator()
+        tg_manager = FakeTgManagerClient()
+        app = create_app(
+            _settings(settlement_mode="async", settlement_poll_interval=0.05),
+            facilitator_client=DirectFacilitatorClient(facilitator),
+            tg_manager_client=tg_manager,
+        )
+        seller_account = Account.create()
+        buyer_account = Account.create()
+
+        with TestClient(app) as client:
+            seller = seller_service.register_seller(
+                app.state.db,
+                evm_address=seller_account.address,
+                price_wei=1000,
+                description="seller one",
+                keywords=["k1"],
+                seller_id=None,
+            )
+            body = {
+                "seller_id": seller.seller_id,
+                "buyer_address": buyer_account.address,
+                "buyer_bot_username": "buyer_bot",
+                "seller_bot_username": "seller_bot",
+                "initial_prompt": "test prompt",
+            }
+            first = client.post("/v1/transactions/create", json=body)
+            self.assertEqual(first.status_code, 402)
+            requirements = b64decode_json(first.headers["PAYMENT-REQUIRED"])
+            payment = _payment(requirements, buyer_account.key)
+
+            resp = client.post(
+                "/v1/transactions/create",
+                json=body,
+                headers={"PAYMENT-SIGNATURE": b64encode_json(payment)},
+            )
+            self.assertEqual(resp.status_code, 202)
+            accepted = resp.json()
+            expected_id = transaction_service.compute_tx_hash(payment["rawTransaction"])
+            self.assertEqual(accepted["transaction_id"], expected_id)
+            self.assertEqual(accepted["status"], "settling")
+            self.assertEqual(resp.headers["Location"], accepted["status_url"])
+
+            deadline = time.monotonic() + 5
+            status = accepted["status"]
+            while status != "session_created" and time.monotonic() < deadline:
+                time.sleep(0.05)
+                status = client.get(accepted["status_url"]).json()["status"]
+
+            self.assertEqual(status, "session_created")
+            stored = client.get(accepted["status_url"]).json()
+            self.assertEqual(stored["tx_hash"], expected_id)
+            self.assertEqual(len(facilitator.sent), 1)
+            self.assertEqual(tg_manager.calls[0]["transaction_id"], expected_id)
+            events, _ = app.state.event_bus.since(0)
+            self.assertEqual(
+                [(e.type, e.data["transaction_id"], e.data["status"]) for e in events],
+                [
+                    ("transaction", expected_id, "settling"),
+                    ("transaction", expected_id, "paid"),
+                    ("transaction", expected_id, "session_created"),
+                ],
+            )
+
+
+class SettlementWorkerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn = connect_sqlite(":memory:")
+        init_db(self.conn)
+        seller_account = Account.create()
+        self.buyer = Account.create()
+        self.seller = seller_service.register_seller(
+            self.conn,
+            evm_address=seller_account.address,
+            price_wei=1000,
+            description="seller one",
+            keywords=["k1"],
+            seller_id=None,
+        )
+        requirements = make_requirements(seller_account.address, 1000)
+        self.payment = _payment(requirements, self.buyer.key)
+        self.transaction_id = transaction_service.compute_tx_hash(self.payment["rawTransaction"])
+        transaction_service.create_transaction(
+            self.conn,
+            transaction_id=self.transaction_id,
+            seller=self.seller,
+            buyer_address=self.buyer.address,
+            price_wei=1000,
+            payment_payload=self.payment,
+            requirements=requirements,
+            tx_hash=None,
+            metadata={
+                "buyer_bot_username": "buyer_bot",
+                "seller_bot_username": "seller_bot",
+                "initial_prompt": "test prompt",
+                "wait_seconds": 120,
+            },
+            status="settling",
+        )
+
+    def tearDown(self) -> None:
+        self.conn.close()
+
+    def _make_due(self) -> None:
+        self.conn.execute("UPDATE settlement_jobs SET next_attempt_at = '1970-01-01T00:00:00+00:00'")
+        self.conn.commit()
+
+    def test_recover_enqueues_orphan_settling_transaction(self) -> None:
+        worker = SettlementWorker(
+            self.conn,
+            facilitators={"conflux": DirectFacilitatorClient(TestFacilitator())},
+            tg_manager=None,
+        )
+        self.assertEqual(worker.recover(), 1)
+        self.assertEqual(worker.run_once(), 1)
+        stored = models.get_transaction_by_id(self.conn, transaction_id=self.transaction_id)
+        self.assertEqual(stored.status, "paid")  # type: ignore[union-attr]
+        self.assertEqual(
+            models.get_settlement_job(self.conn, transaction_id=self.transaction_id).status,  # type: ignore[union-attr]
+            "done",
+        )
+
+    def test_retries_then_marks_settle_failed(self) -> None:
+        facilitator = TestFacilitator(failures=10)
+        worker = SettlementWorker(
+            self.conn,
+            facilitators={"conflux": DirectFacilitatorClient(facilitator)},
+            tg_manager=FakeTgManagerClient(),
+            max_attempts=2,
+        )
+        transaction_service.enqueue_settlement(self.conn, transaction_id=self.transaction_id, payment_network="conflux")
+
+        self.assertEqual(worker.run_once(), 1)
+        job = models.get_settlement_job(self.conn, transaction_id=self.transaction_id)
+        self.assertEqual((job.status, job.attempts, job.last_error), ("pending", 1, "rpc unavailable"))  # type: ignore[union-attr]
+        self.assertEqual(worker.run_once(), 0)
+
+        self._make_due()
+        self.assertEqual(worker.run_once(), 1)
+        job = models.get_settlement_job(self.conn, transaction_id=self.transaction_id)
+        self.assertEqual((job.status, job.attempts), ("failed", 2))  # type: ignore[union-attr]
+        stored = models.get_transaction_by_id(self.conn, transaction_id=self.transaction_id)
+        self.assertEqual(stored.status, "settle_failed")  # type: ignore[union-attr]
+        self.assertEqual(stored.error_reason, "rpc unavailable")  # type: ignore[union-attr]
+
+    def test_retry_of_already_broadcast_payment_is_settled(self) -> None:
+        class TimedOutFacilitator(TestFacilitator):
+            # 第一次广播已被节点接收但客户端超时；重试时节点返回 already known
+            def send_raw_transaction(self, raw_hex: str) -> str:
+                self.sent.append(raw_hex)
+                if len(self.sent) == 1:
+                    raise TimeoutError("read timed out")
+                raise ValueError("{'code': -32000, 'message': 'already known'}")
+
+        facilitator = TimedOutFacilitator()
+        worker = SettlementWorker(
+            self.conn,
+            facilitators={"conflux": DirectFacilitatorClient(facilitator)},
+            tg_manager=None,
+            max_attempts=2,
+        )
+        transaction_service.enqueue_settlement(self.conn, transaction_id=self.transaction_id, payment_network="conflux")
+
+        self.assertEqual(worker.run_once(), 1)
+        self._make_due()
+        self.assertEqual(worker.run_once(), 1)
+        job = models.get_settlement_job(self.conn, transaction_id=self.transaction_id)
+        self.assertEqual((job.status, job.attempts, job.last_error), ("done", 2, None))  # type: ignore[union-attr]
+        stored = models.get_transaction_by_id(self.conn, transaction_id=self.transaction_id)
+        self.assertEqual((stored.status, stored.tx_hash), ("paid", self.transaction_id))  # type: ignore[union-attr]
+
+
+if __name__ == "__main__":
+    unittest.main()
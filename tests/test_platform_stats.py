@@ -0,0 +1,106 @@
+import json
+import unittest
+
+from contextswap.platform.db import models
+from contextswap.platform.db.engine import connect_sqlite, init_db
+from contextswap.platform.services import stats_service
+
+
+class MarketStatsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn = connect_sqlite(":memory:")
+        init_db(self.conn)
+        for i in range(3):
+            models.create_seller(
+                self.conn,
+                seller_id=f"seller-{i}",
+                evm_address=f"0x{i:040x}",
+                price_wei=1,
+                price_conflux_wei=1,
+                price_tron_sun=None,
+                description="",
+                keywords="",
+                status="active",
+            )
+
+    def tearDown(self) -> None:
+        self.conn.close()
+
+    def _create_tx(self, index: int, *, seller_id: str, price_wei: int, status: str) -> None:
+        models.create_transaction(
+            self.conn,
+            transaction_id=f"tx-{index}",
+            seller_id=seller_id,
+            buyer_address="0xbuyer",
+            price_wei=price_wei,
+            status=status,
+            payment_payload_json="{}",
+            requirements_json=json.dumps({}),
+            tx_hash=None,
+            chat_id=None,
+            message_thread_id=None,
+            metadata_json="{}",
+        )
+
+    def _expected(self) -> dict:
+        """Recompute the counters the slow way to compare with the trigger-maintained ones."""
+        by_status = {
+            row["status"]: {"count": row["n"], "volume_wei": row["v"]}
+            for row in self.conn.execute(
+                "SELECT status, COUNT(*) AS n, SUM(price_wei) AS v FROM transactions GROUP BY status"
+            ).fetchall()
+        }
+        return by_status
+
+    def test_counters_follow_inserts_and_status_changes(self) -> None:
+        self._create_tx(1, seller_id="seller-0", price_wei=100, status="paid")
+        self._create_tx(2, seller_id="seller-0", price_wei=300, status="settling")
+        self._create_tx(3, seller_id="seller-1", price_wei=50, status="paid")
+        models.update_transaction_fields(self.conn, transaction_id="tx-2", fields={"status": "session_created"})
+        models.update_transaction_fields(self.conn, transaction_id="tx-3", fields={"error_reason": "noop"})
+        models.update_seller_fields(self.conn, seller_id="seller-2", fields={"status": "inactive"})
+
+        stats = stats_service.market_stats(self.conn)
+        self.assertEqual(stats["sellers"], {"total": 3, "active": 2, "by_status": {"active": 2, "inactive": 1}})
+        self.assertEqual(stats["transactions"]["by_status"], self._expected())
+        self.assertEqual(stats["transactions"]["total"], 3)
+        self.assertEqual(stats["transactions"]["volume_wei"], 450)
+        self.assertEqual(stats["transactions"]["avg_price_wei"], 150)
+        self.assertEqual(len(stats["daily"]), 1)
+        self.assertEqual(stats["daily"][0]["volume_wei"], 450)
+
+        seller = stats_service.seller_stats(self.conn, seller_id="seller-0")
+        self.assertEqual(seller["transactions"]["by_status"], {
+            "paid": {"count": 1, "volume_wei": 100},
+            "session_created": {"count": 1, "volume_wei": 300},
+        })
+        self.assertIsNotNone(seller["last_transaction_at"])
+        empty = stats_service.seller_stats(self.conn, seller_id="seller-2")
+        self.assertEqual(empty["transactions"]["total"], 0)
+        self.assertIsNone(empty["last_transaction_at"])
+
+    def test_existing_rows_are_counted_on_upgrade(self) -> None:
+        self._create_tx(1, seller_id="seller-0", price_wei=10, status="paid")
+        self._create_tx(2, seller_id="seller-1", price_wei=20, status="failed")
+        self.conn.executescript(
+            """
+            DROP TRIGGER stats_sellers_ai;
+            DROP TRIGGER stats_sellers_au;
+            DROP TRIGGER stats_transactions_ai;
+            DROP TRIGGER stats_transactions_au;
+            DROP TABLE market_stats;
+            DROP TABLE seller_stats;
+            DELETE FROM schema_version WHERE version >= 4;
+            """
+        )
+        init_db(self.conn)
+
+        stats = stats_service.market_stats(self.conn)
+        self.assertEqual(stats["sellers"]["active"], 3)
+        self.assertEqual(stats["transactions"]["by_status"], self._expected())
+        self._create_tx(3, seller_id="seller-0", price_wei=5, status="paid")
+        self.assertEqual(stats_service.market_stats(self.conn)["transactions"]["by_status"], self._expected())
+
+
+if __name__ == "__main__":
+    unittest.main()
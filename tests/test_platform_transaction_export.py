@@ -0,0 +1,111 @@
+import csv
+import io
+import json
+import unittest
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from contextswap.platform.api.routes.transactions import router as transactions_router
+from contextswap.platform.db import models
+from contextswap.platform.db.engine import connect_sqlite, init_db
+from contextswap.platform.services import transaction_export
+from contextswap.x402 import make_requirements
+
+
+class TransactionExportTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.conn = connect_sqlite(":memory:")
+        init_db(self.conn)
+        models.create_seller(
+            self.conn,
+            seller_id="seller-1",
+            evm_address=f"0x{1:040x}",
+            price_wei=1,
+            price_conflux_wei=1,
+            price_tron_sun=None,
+            description="",
+            keywords="",
+            status="active",
+        )
+        requirements = json.dumps(make_requirements(pay_to=f"0x{1:040x}", amount_wei=1, description="d"))
+        for i in range(5):
+            models.create_transaction(
+                self.conn,
+                transaction_id=f"tx-{i}",
+                seller_id="seller-1",
+                buyer_address="0xbuyer",
+                price_wei=i,
+                status="paid" if i % 2 else "session_created",
+                payment_payload_json="{}",
+                requirements_json=requirements,
+                tx_hash=None,
+                chat_id=None,
+                message_thread_id=None,
+                metadata_json=json.dumps({"initial_prompt": f"hi, {i}"}),
+            )
+            self.conn.execute(
+                "UPDATE transactions SET created_at = ? WHERE transaction_id = ?",
+                (f"2026-01-0{i + 1}T00:00:00+00:00", f"tx-{i}"),
+            )
+        self.conn.commit()
+        app = FastAPI()
+        app.include_router(transactions_router)
+        app.state.db = self.conn
+        self.client = TestClient(app)
+
+    def tearDown(self) -> None:
+        self.conn.close()
+
+    def test_ndjson_streams_in_keyset_batches(self) -> None:
+        calls = []
+
+        def connect():
+            calls.append(1)
+            return self.conn
+
+        body = b"".join(transaction_export.iter_export(connect, fmt="ndjson", batch_size=2))
+        rows = [json.loads(line) for line in body.decode("utf-8").splitlines()]
+        self.assertEqual([r["transaction_id"] for r in rows], [f"tx-{i}" for i in range(5)])
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(rows[0]["payment_network"], "conflux")
+        self.assertEqual(rows[0]["metadata"], {"initial_prompt": "hi, 0"})
+
+    def test_ndjson_route_filters(self) -> None:
+        resp = self.client.get(
+            "/v1/transactions/export",
+            params={"since": "2026-01-02", "until": "2026-01-05T00:00:00+00:00", "status": "paid"},
+        )
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.headers["content-type"].startswith("application/x-ndjson"))
+        ids = [json.loads(line)["transaction_id"] for line in resp.text.splitlines()]
+        self.assertEqual(ids, ["tx-1", "tx-3"])
+
+    def test_csv_route(self) -> None:
+        resp = self.client.get("/v1/transactions/export", params={"format": "csv", "until": "2026-01-03"})
+        self.assertEqual(resp.status_code, 200)
+        self.assertTrue(resp.headers["content-type"].startswith("text/csv"))
+        rows = list(csv.DictReader(io.StringIO(resp.text)))
+        self.assertEqual(list(rows[0].keys()), list(transaction_export.CSV_COLUMNS))
+        self.assertEqual([r["transaction_id"] for r in rows], ["tx-0", "tx-1"])
+        self.assertEqual(json.loads(rows[1]["metadata"]), {"initial_prompt": "hi, 1"})
+        self.assertEqual(rows[1]["tx_hash"], "")
+
+    def test_csv_without_rows_has_header(self) -> None:
+        resp = self.client.get("/v1/transactions/export", params={"format": "csv", "status": "refunded"})
+        self.assertEqual(resp.text.strip(), ",".join(transaction_export.CSV_COLUMNS))
+
+    def test_invalid_params(self) -> None:
+        self.assertEqual(self.client.get("/v1/transactions/export", params={"format": "xml"}).status_code, 400)
+        self.assertEqual(self.client.get("/v1/transactions/export", params={"since": "yesterday"}).status_code, 400)
+
+    def test_parse_timestamp(self) -> None:
+        self.assertEqual(transaction_export.parse_timestamp("2026-01-02"), "2026-01-02T00:00:00+00:00")
+        self.assertEqual(
+            transaction_export.parse_timestamp("2026-01-02T08:00:00+08:00"), "2026-01-02T00:00:00+00:00"
+        )
+        self.assertIsNone(transaction_export.parse_timestamp(" "))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 
 from eth_account import Account
@@ -39,6 +40,19 @@ class FakeTgManagerClient:
         return None
 
 
+class FakeAsyncTgManagerClient(FakeTgManagerClient):
+    def __init__(self) -> None:
+        super().__init__()
+        self.async_calls = 0
+
+    def create_session(self, **kwargs):
+        raise AssertionError("async route must use acreate_session")
+
+    async def acreate_session(self, **kwargs):
+        self.async_calls += 1
+        return FakeTgManagerClient.create_session(self, **kwargs)
+
+
 def build_payment_payload(requirements: dict, buyer_private_key: bytes) -> dict:
     accepts = requirements["accepts"][0]
     tx = {
@@ -126,13 +140,15 @@ class TransactionFlowTest(unittest.TestCase):
         )
 
         response = Response()
-        create_resp = create_transaction(
-            payload,
-            request=self._make_request(None),
-            response=response,
-            conn=self.conn,
-            facilitator=self.facilitator,
-            tg_manager=self.tg_manager,
+        create_resp = asyncio.run(
+            create_transaction(
+                payload,
+                request=self._make_request(None),
+                response=response,
+                conn=self.conn,
+                facilitator=self.facilitator,
+                tg_manager=self.tg_manager,
+            )
         )
         self.assertEqual(response.status_code, 402)
         requirements_b64 = response.headers.get("PAYMENT-REQUIRED")
@@ -142,13 +158,15 @@ class TransactionFlowTest(unittest.TestCase):
         payment = build_payment_payload(requirements, buyer_account.key)
 
         response = Response()
-        body = create_transaction(
-            payload,
-            request=self._make_request(b64encode_json(payment)),
-            response=response,
-            conn=self.conn,
-            facilitator=self.facilitator,
-            tg_manager=self.tg_manager,
+        body = asyncio.run(
+            create_transaction(
+                payload,
+                request=self._make_request(b64encode_json(payment)),
+                response=response,
+                conn=self.conn,
+                facilitator=self.facilitator,
+                tg_manager=self.tg_manager,
+            )
         )
         self.assertEqual(response.status_code, 200)
         expected_tx_hash = transaction_service.compute_tx_hash(payment["rawTransaction"])
@@ -170,6 +188,43 @@ class TransactionFlowTest(unittest.TestCase):
         stored = transaction_service.transaction_to_dict(stored_tx)  # type: ignore[arg-type]
         self.assertEqual(stored["status"], "session_created")
 
+    def test_async_session_client_is_awaited(self) -> None:
+        tg_manager = FakeAsyncTgManagerClient()
+        seller = seller_service.register_seller(
+            self.conn,
+            evm_address=Account.create().address,
+            price_wei=1000,
+            description="seller two",
+            keywords=["k2"],
+            seller_id=None,
+        )
+        buyer_account = Account.create()
+        payload = TransactionCreateRequest(
+            seller_id=seller.seller_id,
+            buyer_address=buyer_account.address,
+            buyer_bot_username="buyer_bot",
+            seller_bot_username="seller_bot",
+            initial_prompt="test prompt",
+        )
+        requirements = transaction_service.build_requirements(seller)
+        payment = build_payment_payload(requirements, buyer_account.key)
+
+        response = Response()
+        body = asyncio.run(
+            create_transaction(
+                payload,
+                request=self._make_request(b64encode_json(payment)),
+                response=response,
+                conn=self.conn,
+                facilitator=self.facilitator,
+                tg_manager=tg_manager,
+            )
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body["status"], "session_created")
+        self.assertEqual(body["session"]["message_thread_id"], 456)
+        self.assertEqual(tg_manager.async_calls, 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,125 @@
+import json
+import unittest
+
+import httpx
+
+from contextswap.facilitator.tron import TronFacilitator
+from contextswap.tron_client import TokenBucket, TronGridClient
+
+
+class FakeTransport:
+    """Scripted TronGrid: each item is an ``httpx.Response`` or an exception to raise."""
+
+    def __init__(self, responses: list) -> None:
+        self.responses = list(responses)
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        outcome = self.responses.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    @property
+    def calls(self) -> list[tuple[str, dict]]:
+        return [(str(r.url), json.loads(r.content)) for r in self.requests]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _client(transport: FakeTransport, **kwargs) -> TronGridClient:
+    clock = FakeClock()
+    return TronGridClient(
+        "http://tron.test/",
+        "key-1",
+        client=httpx.Client(transport=httpx.MockTransport(transport)),
+        bucket=TokenBucket(1000, clock=clock, sleep=clock.sleep),
+        sleep=lambda _: None,
+        **kwargs,
+    )
+
+
+class TokenBucketTest(unittest.TestCase):
+    def test_waits_when_budget_exhausted(self) -> None:
+        clock = FakeClock()
+        bucket = TokenBucket(2, capacity=2, clock=clock, sleep=clock.sleep)
+        for _ in range(4):
+            bucket.acquire()
+        self.assertAlmostEqual(sum(clock.sleeps), 1.0)
+
+
+class TronGridClientTest(unittest.TestCase):
+    def test_retries_429_and_5xx_then_succeeds(self) -> None:
+        transport = FakeTransport(
+            [
+                httpx.Response(429, headers={"Retry-After": "1"}),
+                httpx.Response(503),
+                httpx.Response(200, json={"result": True, "txid": "abc"}),
+            ]
+        )
+        client = _client(transport)
+        self.assertEqual(client.post("/wallet/broadcasttransaction", {"txID": "abc"})["txid"], "abc")
+        self.assertEqual(len(transport.calls), 3)
+        self.assertEqual(transport.calls[0][0], "http://tron.test/wallet/broadcasttransaction")
+        self.assertEqual(transport.requests[0].headers["TRON-PRO-API-KEY"], "key-1")
+
+        stats = client.metrics()["/wallet/broadcasttransaction"]
+        self.assertEqual((stats["requests"], stats["retries"], stats["errors"]), (1, 2, 0))
+
+    def test_gives_up_after_max_retries(self) -> None:
+        transport = FakeTransport([httpx.Response(500, json={"error": "boom"}) for _ in range(3)])
+        client = _client(transport, max_retries=2)
+        with self.assertRaises(RuntimeError):
+            client.post("/wallet/createtransaction", {})
+        self.assertEqual(len(transport.calls), 3)
+        self.assertEqual(client.metrics()["/wallet/createtransaction"]["errors"], 1)
+
+    def test_connection_errors_are_retried(self) -> None:
+        transport = FakeTransport([httpx.ConnectError("reset"), httpx.Response(200, json={"txID": "x"})])
+        self.assertEqual(_client(transport).post("/wallet/createtransaction", {}), {"txID": "x"})
+
+    def test_client_errors_are_not_retried(self) -> None:
+        transport = FakeTransport([httpx.Response(400, json={"Error": "bad"})])
+        with self.assertRaises(RuntimeError):
+            _client(transport).post("/wallet/createtransaction", {})
+        self.assertEqual(len(transport.calls), 1)
+
+    def test_facilitator_broadcasts_through_client(self) -> None:
+        transport = FakeTransport([httpx.Response(200, json={"result": True, "txid": "feed"})])
+        facilitator = TronFacilitator("http://tron.test", client=_client(transport))
+        tx = {"txID": "feed", "raw_data": {}}
+        self.assertEqual(facilitator.settle_payment({"transaction": tx}, {}), "feed")
+        self.assertEqual(transport.calls[0][1], tx)
+
+    def test_retried_broadcast_that_already_landed_is_success(self) -> None:
+        transport = FakeTransport(
+            [
+                httpx.ReadTimeout("timed out"),
+                httpx.Response(200, json={"code": "DUP_TRANSACTION_ERROR", "txid": "feed", "message": "dup"}),
+            ]
+        )
+        facilitator = TronFacilitator("http://tron.test", client=_client(transport))
+        self.assertEqual(facilitator.settle_payment({"transaction": {"txID": "feed", "raw_data": {}}}, {}), "feed")
+        self.assertEqual(len(transport.calls), 2)
+
+    def test_broadcast_error_without_result_raises(self) -> None:
+        transport = FakeTransport([httpx.Response(200, json={"code": "SIGERROR", "message": "bad sig"})])
+        facilitator = TronFacilitator("http://tron.test", client=_client(transport))
+        with self.assertRaises(RuntimeError):
+            facilitator.settle_payment({"transaction": {"txID": "feed", "raw_data": {}}}, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,8 +2,8 @@ import os
 import tempfile
 import unittest
 
-from tg_manager.db.engine import connect_sqlite, init_db
-from tg_manager.db.models import AlreadyExistsError, create_session, get_session_by_transaction_id, update_session_fields
+from tg_manager.db.engine import MIGRATIONS, SQLITE_SUPPORTS_RETURNING, connect_sqlite, init_db
+from tg_manager.db.models import AlreadyExistsError, DbError, create_session, get_session_by_transaction_id, update_session_fields
 
 
 class TestSqliteModels(unittest.TestCase):
@@ -20,6 +20,22 @@ class TestSqliteModels(unittest.TestCase):
             finally:
                 conn.close()
 
+    def test_init_db_applies_migrations_once(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            db_path = os.path.join(td, "test.sqlite3")
+            conn = connect_sqlite(db_path)
+            try:
+                init_db(conn)
+                statements: list[str] = []
+                conn.set_trace_callback(statements.append)
+                init_db(conn)
+                conn.set_trace_callback(None)
+                versions = [row[0] for row in conn.execute("SELECT version FROM schema_version").fetchall()]
+                self.assertEqual(versions, [m.version for m in MIGRATIONS])
+                self.assertFalse(any("CREATE" in sql.upper() for sql in statements), statements)
+            finally:
+                conn.close()
+
     def test_create_and_get_session(self) -> None:
         with tempfile.TemporaryDirectory() as td:
             db_path = os.path.join(td, "test.sqlite3")
@@ -67,6 +83,23 @@ class TestSqliteModels(unittest.TestCase):
             finally:
                 conn.close()
 
+    @unittest.skipUnless(SQLITE_SUPPORTS_RETURNING, "SQLite < 3.35 falls back to SELECT after write")
+    def test_writes_read_back_via_returning(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            conn = connect_sqlite(os.path.join(td, "test.sqlite3"))
+            try:
+                init_db(conn)
+                statements: list[str] = []
+                conn.set_trace_callback(statements.append)
+                create_session(conn, transaction_id="tx_1")
+                update_session_fields(conn, transaction_id="tx_1", fields={"status": "running"})
+                conn.set_trace_callback(None)
+                self.assertFalse([s for s in statements if s.lstrip().upper().startswith("SELECT")])
+                with self.assertRaises(DbError):
+                    update_session_fields(conn, transaction_id="missing", fields={"status": "ended"})
+            finally:
+                conn.close()
+
 
 if __name__ == "__main__":
     unittest.main()
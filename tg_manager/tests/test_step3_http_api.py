@@ -9,6 +9,7 @@ from fastapi.testclient import TestClient
 
 from tg_manager.api.app import create_app
 from tg_manager.core.config import load_settings
+from tg_manager.services.session_service import add_session_listener, remove_session_listener
 
 
 class _FakeTelegram:
@@ -237,6 +238,30 @@ class TestHttpApiStep3(unittest.TestCase):
             self.assertNotIn("@buyer_bot", sent_text)
             self.assertIn("@seller_bot", sent_text)
 
+    def test_session_listener_sees_running_and_ended(self) -> None:
+        changes: list[tuple[str, str]] = []
+
+        def listener(session) -> None:
+            changes.append((session.transaction_id, session.status))
+
+        add_session_listener(listener)
+        try:
+            with _test_client() as (client, token, _tg):
+                headers = {"Authorization": f"Bearer {token}"}
+                body = {
+                    "transaction_id": "tx_listen",
+                    "buyer_bot_username": "buyer_bot",
+                    "seller_bot_username": "seller_bot",
+                }
+                client.post("/v1/session/create", headers=headers, json=body)
+                # 幂等重复创建 / 重复结束不应再次通知
+                client.post("/v1/session/create", headers=headers, json=body)
+                client.post("/v1/session/end", headers=headers, json={"transaction_id": "tx_listen"})
+                client.post("/v1/session/end", headers=headers, json={"transaction_id": "tx_listen"})
+        finally:
+            remove_session_listener(listener)
+        self.assertEqual(changes, [("tx_listen", "running"), ("tx_listen", "ended")])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,7 +3,7 @@ SQLite 数据库引擎与初始化。
 
 约定：
 - 使用单文件 SQLite。
-- 不实现迁移：当需要改表结构时，通过删除旧数据库文件来重建（MVP 快速迭代策略）。
+- 表结构变更以编号迁移追加到 `MIGRATIONS`（见 `tg_manager.db.migrations`），已部署的数据库只执行新增的迁移。
 """
 
 from __future__ import annotations
@@ -12,6 +12,12 @@ import os
 import sqlite3
 from datetime import datetime, timezone
 
+from tg_manager.db.migrations import Migration, migrate
+
+
+# INSERT/UPDATE ... RETURNING 需要 SQLite 3.35+；更旧的库回退为写后再 SELECT 一次
+SQLITE_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
 
 def utc_now_iso() -> str:
     """返回 UTC ISO8601 时间字符串（秒级）。"""
@@ -38,10 +44,10 @@ def connect_sqlite(sqlite_path: str) -> sqlite3.Connection:
     return conn
 
 
-def init_db(conn: sqlite3.Connection) -> None:
-    """初始化数据库表（如果不存在则创建）。"""
+def _migrate_baseline(conn: sqlite3.Connection) -> None:
+    """初始表结构（对引入版本管理之前创建的数据库同样适用）。"""
 
-    conn.executescript(
+    conn.execute(
         """
         CREATE TABLE IF NOT EXISTS sessions (
           id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -62,10 +68,17 @@ def init_db(conn: sqlite3.Connection) -> None:
 
           created_at TEXT NOT NULL,
           updated_at TEXT NOT NULL
-        );
-
-        CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions(status);
+        )
         """
     )
-    conn.commit()
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_status ON sessions(status)")
+
+
+# 只追加、不修改已发布的迁移
+MIGRATIONS = (Migration(1, "baseline", _migrate_baseline),)
+
+
+def init_db(conn: sqlite3.Connection) -> None:
+    """执行尚未应用的迁移；已是最新版本时只查询一次 schema_version。"""
 
+    migrate(conn, MIGRATIONS)
@@ -0,0 +1,80 @@
+"""
+按编号执行的 schema 迁移。
+
+说明：
+- `schema_version` 表记录已执行的迁移编号，每个迁移对同一个数据库只执行一次。
+- 已是最新版本的数据库启动时只查一次版本号，不再逐条执行建表语句。
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Sequence
+
+
+@dataclass(frozen=True)
+class Migration:
+    """一次编号的结构变更；apply 与写入版本号在同一事务内，失败时两者都不落库。"""
+
+    version: int
+    name: str
+    apply: Callable[[sqlite3.Connection], Any]
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    """已执行的最高迁移编号（引入版本管理之前的数据库为 0）。"""
+
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    if exists is None:
+        return 0
+    row = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()
+    return int(row[0] or 0)
+
+
+def migrate(conn: sqlite3.Connection, migrations: Sequence[Migration]) -> list[int]:
+    """执行所有比当前 schema_version 新的迁移，返回本次执行的编号。"""
+
+    versions = [m.version for m in migrations]
+    if versions != sorted(set(versions)):
+        raise ValueError("迁移编号必须唯一且递增")
+    if not migrations or schema_version(conn) >= versions[-1]:
+        return []
+
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_version (
+          version INTEGER PRIMARY KEY,
+          name TEXT NOT NULL,
+          applied_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.commit()
+
+    applied: list[int] = []
+    for migration in migrations:
+        # IMMEDIATE 先拿写锁再复查版本：多个进程同时启动时只有一个会执行
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if schema_version(conn) >= migration.version:
+                conn.rollback()
+                continue
+            migration.apply(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+                (
+                    migration.version,
+                    migration.name,
+                    datetime.now(timezone.utc).replace(microsecond=0).isoformat(),
+                ),
+            )
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        applied.append(migration.version)
+    return applied
@@ -12,7 +12,7 @@ import sqlite3
 from dataclasses import dataclass
 from typing import Any
 
-from tg_manager.db.engine import utc_now_iso
+from tg_manager.db.engine import SQLITE_SUPPORTS_RETURNING, utc_now_iso
 
 
 class DbError(RuntimeError):
@@ -58,6 +58,35 @@ def _row_to_session(row: sqlite3.Row) -> Session:
     )
 
 
+def _returning(sql: str) -> str:
+    """SQLite 支持时追加 RETURNING *，写入与读回合并为一条语句。"""
+
+    return f"{sql.rstrip()} RETURNING *" if SQLITE_SUPPORTS_RETURNING else sql
+
+
+def _returned_row(cur: sqlite3.Cursor) -> sqlite3.Row | None:
+    """取 RETURNING 返回的那一行；未命中或不支持 RETURNING 时为 None。"""
+
+    if not SQLITE_SUPPORTS_RETURNING:
+        return None
+    rows = cur.fetchall()
+    return rows[0] if rows else None
+
+
+# 语句文本固定，sqlite3 的语句缓存可以复用预编译结果
+_INSERT_SESSION_SQL = _returning(
+    """
+    INSERT INTO sessions (
+      transaction_id, chat_id, message_thread_id,
+      status, session_start_at,
+      metadata_json,
+      created_at, updated_at
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+)
+
+
 def create_session(
     conn: sqlite3.Connection,
     *,
@@ -75,15 +104,7 @@ def create_session(
 
     try:
         cur = conn.execute(
-            """
-            INSERT INTO sessions (
-              transaction_id, chat_id, message_thread_id,
-              status, session_start_at,
-              metadata_json,
-              created_at, updated_at
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+            _INSERT_SESSION_SQL,
             (
                 transaction_id,
                 chat_id,
@@ -98,7 +119,10 @@ def create_session(
     except sqlite3.IntegrityError as exc:
         raise AlreadyExistsError(f"会话已存在：transaction_id={transaction_id}") from exc
 
+    row = _returned_row(cur)
     conn.commit()
+    if row is not None:
+        return _row_to_session(row)
     session_id = int(cur.lastrowid)
     got = get_session_by_id(conn, session_id)
     if got is None:
@@ -162,12 +186,16 @@ def update_session_fields(
     values.append(transaction_id)
 
     cur = conn.execute(
-        f"UPDATE sessions SET {columns} WHERE transaction_id = ?",
+        _returning(f"UPDATE sessions SET {columns} WHERE transaction_id = ?"),
         values,
     )
-    if cur.rowcount != 1:
+    row = _returned_row(cur)
+    updated = row is not None if SQLITE_SUPPORTS_RETURNING else cur.rowcount == 1
+    if not updated:
         raise DbError(f"会话不存在或更新失败：transaction_id={transaction_id}")
     conn.commit()
+    if row is not None:
+        return _row_to_session(row)
 
     got = get_session_by_transaction_id(conn, transaction_id)
     if got is None:
@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import json
 import sqlite3
+from typing import Callable
 
 from tg_manager.db.engine import utc_now_iso
 from tg_manager.db.models import (
@@ -33,6 +34,32 @@ SESSION_END_MARKER = "[END_OF_REPORT]"
 RELAY_FLUSH_MARKER = "[READY_TO_FORWARD]"
 
 
+SessionListener = Callable[[Session], None]
+_session_listeners: list[SessionListener] = []
+
+
+def add_session_listener(listener: SessionListener) -> None:
+    """注册会话状态变更回调（进程内全局）：会话进入 running 或 ended 后以最新记录调用。"""
+
+    if listener not in _session_listeners:
+        _session_listeners.append(listener)
+
+
+def remove_session_listener(listener: SessionListener) -> None:
+    if listener in _session_listeners:
+        _session_listeners.remove(listener)
+
+
+def _notify_session_changed(session: Session) -> Session:
+    for listener in list(_session_listeners):
+        try:
+            listener(session)
+        except Exception:  # noqa: BLE001
+            # 回调失败不影响会话本身的状态变更
+            pass
+    return session
+
+
 def create_session_idempotent(
     conn: sqlite3.Connection,
     *,
@@ -66,7 +93,7 @@ def end_session_idempotent(conn: sqlite3.Connection, *, transaction_id: str, rea
     if got.status == "ended":
         return got
 
-    return update_session_fields(
+    ended = update_session_fields(
         conn,
         transaction_id=transaction_id,
         fields={
@@ -75,6 +102,7 @@ def end_session_idempotent(conn: sqlite3.Connection, *, transaction_id: str, rea
             "end_reason": reason,
         },
     )
+    return _notify_session_changed(ended)
 
 
 def _safe_load_metadata(metadata_json: str) -> dict:
@@ -201,11 +229,12 @@ async def create_or_resume_session_with_telegram(
         thread_id = await telegram.create_topic(chat_id=chat_id, title=title)
         await telegram.send_message(chat_id=chat_id, message_thread_id=thread_id, text=system_message)
 
-    return update_session_fields(
+    running = update_session_fields(
         conn,
         transaction_id=tx,
         fields={"chat_id": chat_id, "message_thread_id": int(thread_id), "status": "running"},
     )
+    return _notify_session_changed(running)
 
 
 async def end_session_with_telegram_cleanup(
@@ -231,7 +260,7 @@ async def end_session_with_telegram_cleanup(
         # 先清理 Topic；失败则不落库，便于重试
         await telegram.close_topic(chat_id=str(got.chat_id), message_thread_id=int(got.message_thread_id))
 
-    return update_session_fields(
+    ended = update_session_fields(
         conn,
         transaction_id=tx,
         fields={
@@ -240,3 +269,4 @@ async def end_session_with_telegram_cleanup(
             "end_reason": reason,
         },
     )
+    return _notify_session_changed(ended)